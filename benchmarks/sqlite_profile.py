@@ -0,0 +1,141 @@
+"""
+Compare les profils SQLite "default" et "production" sur un jeu de données
+réaliste : écritures validées ligne par ligne (comme les actions du CRM)
+puis lectures paginées et filtrées.
+
+Usage : python benchmarks/sqlite_profile.py [--clients 2000] [--reads 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+import src.models  # noqa: F401 (enregistre les modèles)
+from src.database.config import Base, create_db_engine
+from src.models.user import User, Role
+from src.models.client import Client
+from src.models.contract import Contract
+from src.models.event import Event
+
+
+def run_writes(Session, users, count):
+    """Crée clients, contrats et événements avec un commit par objet."""
+    commercials, supports = users
+    start = datetime(2030, 1, 1)
+    session = Session()
+    for i in range(count):
+        commercial = random.choice(commercials)
+        client = Client(
+            full_name=f"Client {i}",
+            email=f"client{i}@example.com",
+            phone="+33600000000",
+            company_name=f"Société {i % 500}",
+            commercial_contact_id=commercial
+        )
+        session.add(client)
+        session.commit()
+
+        contract = Contract(
+            client_id=client.id,
+            commercial_contact_id=commercial,
+            total_amount=random.randint(1000, 50000),
+            remaining_amount=random.choice([0, 500, 1000]),
+            is_signed=random.random() < 0.7
+        )
+        session.add(contract)
+        session.commit()
+
+        if contract.is_signed:
+            day = start + timedelta(hours=random.randint(0, 24 * 365))
+            session.add(Event(
+                contract_id=contract.id,
+                client_id=client.id,
+                support_contact_id=random.choice(supports + [None]),
+                event_date_start=day,
+                event_date_end=day + timedelta(hours=6),
+                location=f"Salle {i % 50}",
+                attendees=random.randint(10, 500)
+            ))
+            session.commit()
+    session.close()
+
+
+def run_reads(Session, users, count):
+    """Alterne pages de listes et requêtes filtrées, une session par action."""
+    commercials, supports = users
+    for i in range(count):
+        session = Session()
+        after = random.randint(0, 1000)
+        if i % 3 == 0:
+            session.query(Client).filter(
+                Client.commercial_contact_id == random.choice(commercials),
+                Client.id > after
+            ).order_by(Client.id).limit(20).all()
+        elif i % 3 == 1:
+            session.query(Contract).filter(
+                Contract.remaining_amount > 0, Contract.id > after
+            ).order_by(Contract.id).limit(20).all()
+        else:
+            session.query(Event).filter(
+                Event.support_contact_id == random.choice(supports)
+            ).order_by(Event.event_date_start).limit(20).all()
+        session.close()
+
+
+def bench(profile, directory, clients, reads):
+    path = os.path.join(directory, f"{profile}.db")
+    engine = create_db_engine(f"sqlite:///{path}", profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    session = Session()
+    staff = []
+    for i, role in enumerate([Role.COMMERCIAL] * 5 + [Role.SUPPORT] * 5):
+        user = User(full_name=f"User {i}", email=f"user{i}@example.com",
+                    password_hash="x", role=role)
+        session.add(user)
+        staff.append(user)
+    session.commit()
+    users = (
+        [u.id for u in staff if u.role == Role.COMMERCIAL],
+        [u.id for u in staff if u.role == Role.SUPPORT],
+    )
+    session.close()
+
+    random.seed(42)
+    started = time.perf_counter()
+    run_writes(Session, users, clients)
+    write_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    run_reads(Session, users, reads)
+    read_time = time.perf_counter() - started
+
+    engine.dispose()
+    return write_time, read_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'Profil':<12} | {'Clients créés/s':>16} | {'Lectures/s':>12}")
+    print("-" * 46)
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in ("default", "production"):
+            write_time, read_time = bench(profile, directory, args.clients, args.reads)
+            print(f"{profile:<12} | {args.clients / write_time:>16.0f} | "
+                  f"{args.reads / read_time:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Mesure le coût des imports au démarrage de chaque commande avec
+`python -X importtime` et le compare au budget fixé.
+
+Usage : python benchmarks/startup.py [--runs 5] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules lourds qu'aucune commande ci-dessous ne doit charger
+HEAVY_MODULES = (
+    "sentry_sdk",
+    "bcrypt",
+    "jwt",
+    "email_validator",
+    "sqlalchemy.dialects.postgresql",
+)
+
+# Commande -> (imports réalisés par la commande, budget en ms)
+COMMANDS = {
+    "main": ("import src.main", 150),
+    "cli": ("import src.cli", 300),
+    "init": ("import src.cli, src.database.config, src.models", 1500),
+    "clients list": (
+        "import src.cli, src.controllers.client_controller, src.views.client_view",
+        1500,
+    ),
+}
+
+# Facteur appliqué aux budgets (machines lentes, CI)
+BUDGET_SCALE = float(os.getenv("STARTUP_BUDGET_SCALE", "1"))
+
+
+def measure_imports(statement):
+    """
+    Exécute `statement` dans un nouvel interpréteur avec -X importtime.
+    Retourne (temps total en ms, {module: temps cumulé en ms}).
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+    modules = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative_ms = int(cumulative) / 1000
+        modules[name.strip()] = cumulative_ms
+        # Seuls les imports de premier niveau s'additionnent
+        if not name.startswith("  "):
+            total += cumulative_ms
+    return total, modules
+
+
+def best_of(statement, runs):
+    """Retourne la meilleure mesure sur `runs` exécutions."""
+    return min((measure_imports(statement) for _ in range(runs)), key=lambda m: m[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, (statement, budget) in COMMANDS.items():
+        total, modules = best_of(statement, args.runs)
+        budget *= BUDGET_SCALE
+        status = "OK" if total <= budget else "DÉPASSÉ"
+        print(f"\n{label} : {total:.0f} ms (budget {budget:.0f} ms) {status}")
+
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+        if heavy:
+            print("  modules lourds chargés :", ", ".join(heavy))
+
+        slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)
+        for name, cumulative in slowest[:args.top]:
+            print(f"  {cumulative:8.1f} ms  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
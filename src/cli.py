@@ -0,0 +1,1014 @@
+"""Commandes non interactives (scripts, tâches planifiées)."""
+import functools
+import json
+import os
+import shlex
+from datetime import datetime, timedelta
+
+import click
+
+# Les contrôleurs, vues et la base sont importés dans chaque commande :
+# une commande ne paie que les imports dont elle a besoin
+from src.views.base_view import BaseView
+from src.utils.auth import TOKEN_FILE
+from src.utils.pagination import DEFAULT_PAGE_SIZE
+from src.utils.validators import (
+    validate_email_format,
+    validate_phone,
+    validate_password_strength,
+    validate_amount,
+    validate_attendees
+)
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+# Nouvelles tentatives d'une mise à jour en conflit (verrouillage optimiste)
+CONFLICT_RETRIES = 3
+
+# Commandes qui n'ont pas de sens à l'intérieur d'un script
+NOT_SCRIPTABLE = {"init", "create-admin", "calibrate-bcrypt", "login", "logout", "run-script", "reminders"}
+
+
+class CliContext:
+    """État partagé par les commandes : session et utilisateur connecté."""
+
+    def __init__(self, bind=None):
+        self.bind = bind
+        self.db = None
+        self.current_user = None
+
+    def get_bind(self):
+        if self.bind is None:
+            from src.database.config import engine
+            self.bind = engine
+        return self.bind
+
+    def get_db(self):
+        if self.db is None:
+            from sqlalchemy.orm import sessionmaker
+            self.db = sessionmaker(bind=self.get_bind(), autoflush=False)()
+        return self.db
+
+    def get_user(self):
+        """Retourne l'utilisateur authentifié par le token enregistré."""
+        if self.current_user is None:
+            token = os.getenv("EPIC_EVENTS_TOKEN") or read_token()
+            if not token:
+                raise click.ClickException("Vous devez être connecté (commande login).")
+            from src.controllers.auth_controller import AuthController
+            self.current_user = AuthController(self.get_db()).verify_token(token)
+        return self.current_user
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+def read_token():
+    if os.path.exists(TOKEN_FILE):
+        with open(TOKEN_FILE, "r") as f:
+            return f.read().strip()
+    return None
+
+
+def handle_errors(func):
+    """Convertit les erreurs métier en erreurs click (code de sortie 1)."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except (PermissionError, ValueError) as e:
+            raise click.ClickException(str(e))
+
+    return wrapper
+
+
+def retry_on_conflict(db, action, expected_version=None, retries=CONFLICT_RETRIES):
+    """
+    Exécute une mise à jour. Sans version attendue, un conflit est rejoué sur
+    la version la plus récente : seuls les champs passés en option sont
+    réappliqués (fusion). Avec --expected-version, ou dans un script, le
+    conflit est signalé tel quel.
+    """
+    from src.database.config import BatchSession
+    from src.exceptions import ConcurrentModificationError
+    for attempt in range(retries + 1):
+        try:
+            return action()
+        except ConcurrentModificationError:
+            if expected_version is not None or isinstance(db, BatchSession) or attempt == retries:
+                raise
+            db.expire_all()
+
+
+def iter_pages(fetch_page, page_size):
+    """Parcourt toutes les pages d'une liste paginée."""
+    after = None
+    while True:
+        page = fetch_page(after, page_size)
+        yield page.items
+        if not page.has_next:
+            return
+        after = page.next_cursor
+
+
+def output_list(pages, fmt, display_list, title):
+    """Affiche une liste page par page, en tableau ou en JSON Lines."""
+    for number, items in enumerate(pages, 1):
+        if fmt == "jsonl":
+            for item in items:
+                click.echo(json.dumps(item.to_dict(), default=str, ensure_ascii=False))
+        else:
+            display_list(items, f"{title} - page {number}")
+
+
+format_option = click.option(
+    "--format", "fmt", type=click.Choice(["table", "jsonl"]), default="table",
+    help="Format de sortie."
+)
+page_size_option = click.option(
+    "--page-size", type=click.IntRange(min=1), default=DEFAULT_PAGE_SIZE,
+    help="Nombre de lignes lues par requête."
+)
+date_type = click.DateTime([DATE_FORMAT])
+
+
+@click.group()
+@click.pass_context
+def cli(ctx):
+    """Epic Events CRM - commandes non interactives."""
+    if ctx.obj is None:
+        ctx.obj = CliContext()
+        ctx.call_on_close(ctx.obj.close)
+
+
+# ========== BASE ET AUTHENTIFICATION ==========
+
+@cli.command()
+def init():
+    """Initialise la base de données."""
+    from src.database.config import init_db
+    import src.models  # noqa: F401 (enregistre les tables)
+    init_db()
+
+
+@cli.command("create-admin")
+def create_admin():
+    """Crée le premier administrateur (interactif)."""
+    from src.app import EpicEventsCRM
+    EpicEventsCRM().create_first_admin()
+
+
+@cli.command("calibrate-bcrypt")
+@click.option("--target-ms", type=click.FloatRange(min=1), default=250,
+              help="Durée visée pour un hachage (ms).")
+@click.option("--min-rounds", type=click.IntRange(4, 31), default=10)
+@click.option("--max-rounds", type=click.IntRange(4, 31), default=16)
+@click.option("--env-file", type=click.Path(dir_okay=False), default=".env",
+              help="Fichier où enregistrer BCRYPT_ROUNDS.")
+@click.option("--dry-run", is_flag=True, help="Afficher le coût sans l'enregistrer.")
+def calibrate_bcrypt(target_ms, min_rounds, max_rounds, env_file, dry_run):
+    """
+    Mesure bcrypt sur cette machine et enregistre le coût (BCRYPT_ROUNDS)
+    le plus élevé qui respecte la durée visée. Les mots de passe existants
+    sont re-hachés à la connexion suivante.
+    """
+    from src.utils.auth import calibrate_rounds
+    if min_rounds > max_rounds:
+        raise click.BadParameter("--min-rounds doit être <= --max-rounds")
+
+    rounds, elapsed_ms = calibrate_rounds(target_ms, min_rounds, max_rounds)
+    BaseView.display_info(f"BCRYPT_ROUNDS={rounds} ({elapsed_ms:.0f} ms par hachage)")
+    if elapsed_ms > target_ms:
+        BaseView.display_info(f"Attention : plus lent que la cible même à {min_rounds} rounds")
+    if not dry_run:
+        from dotenv import set_key
+        if not os.path.exists(env_file):
+            open(env_file, "a").close()
+        set_key(env_file, "BCRYPT_ROUNDS", str(rounds), quote_mode="never")
+        BaseView.display_success(f"BCRYPT_ROUNDS enregistré dans {env_file}")
+
+
+@cli.command()
+@click.option("--email", prompt="Email")
+@click.option("--password", prompt="Mot de passe", hide_input=True)
+@click.pass_obj
+@handle_errors
+def login(obj, email, password):
+    """Se connecte et enregistre le token de session."""
+    from src.controllers.auth_controller import AuthController
+    result = AuthController(obj.get_db()).login(email, password)
+    with open(TOKEN_FILE, "w") as f:
+        f.write(result["token"])
+    BaseView.display_success(f"Connecté : {result['user'].full_name}")
+
+
+@cli.command()
+def logout():
+    """Supprime le token de session."""
+    if os.path.exists(TOKEN_FILE):
+        os.remove(TOKEN_FILE)
+    BaseView.display_success("Déconnexion réussie")
+
+
+@cli.command()
+@click.pass_obj
+@handle_errors
+def whoami(obj):
+    """Affiche l'utilisateur connecté."""
+    user = obj.get_user()
+    click.echo(f"{user.id} | {user.full_name} | {user.email} | {user.role.value.upper()}")
+
+
+# ========== UTILISATEURS ==========
+
+@cli.group()
+def users():
+    """Gestion des utilisateurs."""
+
+
+@users.command("list")
+@format_option
+@click.pass_obj
+@handle_errors
+def users_list(obj, fmt):
+    """Liste les utilisateurs (GESTION)."""
+    from src.controllers.user_controller import UserController
+    from src.views.user_view import UserView
+    rows = UserController(obj.get_db(), obj.get_user()).get_all_users()
+    output_list([rows], fmt, lambda items, title: UserView().display_users_list(items), "")
+
+
+@users.command("create")
+@click.option("--full-name", required=True)
+@click.option("--email", required=True)
+@click.option("--role", type=click.Choice(["commercial", "support", "gestion"]), required=True)
+@click.option("--password", prompt="Mot de passe", hide_input=True)
+@click.pass_obj
+@handle_errors
+def users_create(obj, full_name, email, role, password):
+    """Crée un utilisateur (GESTION)."""
+    from src.controllers.user_controller import UserController
+    from src.views.user_view import UserView
+    if not validate_email_format(email):
+        raise ValueError("Email invalide")
+    is_valid, error_msg = validate_password_strength(password)
+    if not is_valid:
+        raise ValueError(error_msg)
+
+    user = UserController(obj.get_db(), obj.get_user()).create_user(full_name, email, password, role)
+    UserView().display_user_created(user)
+
+
+@users.command("import")
+@click.argument("csv_file", type=click.File("r", encoding="utf-8"))
+@click.option("--workers", type=click.IntRange(min=1),
+              help="Processus de hachage (par défaut : un par cœur).")
+@click.option("--batch-size", type=click.IntRange(min=1), default=500,
+              help="Utilisateurs insérés par requête.")
+@click.pass_obj
+@handle_errors
+def users_import(obj, csv_file, workers, batch_size):
+    """
+    Crée des utilisateurs depuis un CSV (colonnes full_name, email, role,
+    password) en une seule transaction (GESTION).
+    """
+    import csv
+    from src.controllers.user_controller import UserController
+    reader = csv.DictReader(csv_file)
+    missing = {"full_name", "email", "role", "password"} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"Colonnes manquantes : {', '.join(sorted(missing))}")
+    rows = list(reader)
+    for number, row in enumerate(rows, 2):
+        if not validate_email_format(row.get("email") or ""):
+            raise ValueError(f"Ligne {number} : email invalide")
+        is_valid, error_msg = validate_password_strength(row.get("password") or "")
+        if not is_valid:
+            raise ValueError(f"Ligne {number} : {error_msg}")
+
+    result = UserController(obj.get_db(), obj.get_user()).bulk_create_users(
+        rows, workers=workers, batch_size=batch_size
+    )
+    count = len(result["user_ids"])
+    rate = count / result["hash_seconds"] if result["hash_seconds"] else 0
+    BaseView.display_success(
+        f"{count} utilisateur(s) créé(s) - hachage : {result['hash_seconds']:.2f} s "
+        f"({rate:.1f} mots de passe/s), insertion : {result['insert_seconds']:.2f} s"
+    )
+
+
+# ========== CLIENTS ==========
+
+@cli.group()
+def clients():
+    """Gestion des clients."""
+
+
+@clients.command("list")
+@click.option("--mine", is_flag=True, help="Uniquement mes clients (COMMERCIAL).")
+@format_option
+@page_size_option
+@click.pass_obj
+@handle_errors
+def clients_list(obj, mine, fmt, page_size):
+    """Liste les clients."""
+    from src.controllers.client_controller import ClientController
+    from src.views.client_view import ClientView
+    controller = ClientController(obj.get_db(), obj.get_user())
+    pages = iter_pages(
+        lambda after, size: controller.get_clients_page(after, size, mine=mine),
+        page_size
+    )
+    output_list(pages, fmt, ClientView().display_clients_list,
+                "MES CLIENTS" if mine else "Liste des clients")
+
+
+@clients.command("create")
+@click.option("--full-name", required=True)
+@click.option("--email", required=True)
+@click.option("--phone", required=True)
+@click.option("--company")
+@click.option("--force", is_flag=True, help="Créer même si des clients proches existent.")
+@click.pass_obj
+@handle_errors
+def clients_create(obj, full_name, email, phone, company, force):
+    """Crée un client (COMMERCIAL) ; refusé en cas de doublon possible, sauf --force."""
+    from src.controllers.client_controller import ClientController
+    from src.exceptions import DuplicateClientError
+    from src.views.client_view import ClientView
+    if not validate_email_format(email):
+        raise ValueError("Email invalide")
+    if not validate_phone(phone):
+        raise ValueError("Numéro de téléphone invalide")
+
+    try:
+        client = ClientController(obj.get_db(), obj.get_user()).create_client(
+            full_name, email, phone, company, force=force
+        )
+    except DuplicateClientError as e:
+        ClientView().display_duplicates(e.candidates)
+        raise click.ClickException("Doublon possible - relancez avec --force pour créer le client")
+    ClientView().display_client_created(client)
+
+
+@clients.command("duplicates")
+@click.option("--threshold", type=click.FloatRange(0, 1),
+              help="Score minimal d'une paire (défaut : 0.6).")
+@click.pass_obj
+@handle_errors
+def clients_duplicates(obj, threshold):
+    """Rapport des clients probablement en double (GESTION)."""
+    from src.controllers.client_controller import ClientController, DUPLICATE_THRESHOLD
+    from src.views.client_view import ClientView
+    report = ClientController(obj.get_db(), obj.get_user()).get_duplicates_report(
+        DUPLICATE_THRESHOLD if threshold is None else threshold
+    )
+    ClientView().display_duplicates_report(report)
+
+
+@clients.command("reindex")
+@click.pass_obj
+@handle_errors
+def clients_reindex(obj):
+    """Reconstruit l'index des doublons depuis la table des clients (GESTION)."""
+    from src.controllers.client_controller import ClientController
+    count = ClientController(obj.get_db(), obj.get_user()).rebuild_duplicate_index()
+    BaseView.display_success(f"{count} client(s) indexé(s)")
+
+
+@clients.command("import")
+@click.argument("csv_file", type=click.File("r", encoding="utf-8"))
+@click.option("--chunk-size", type=click.IntRange(min=1), default=1000,
+              help="Lignes validées, insérées et validées en base ensemble.")
+@click.option("--rejects", type=click.Path(dir_okay=False),
+              help="Fichier des lignes rejetées (par défaut : <fichier>.rejects.csv).")
+@click.pass_obj
+@handle_errors
+def clients_import(obj, csv_file, chunk_size, rejects):
+    """
+    Importe des clients depuis un CSV (colonnes full_name, email, phone,
+    company_name et, pour la GESTION, commercial_contact_id).
+
+    Le fichier est lu en flux et chaque paquet est enregistré séparément :
+    relancer l'import après une erreur rejette les emails déjà importés.
+    """
+    import csv
+    from src.controllers.client_controller import ClientController
+    reader = csv.DictReader(csv_file)
+    if rejects is None:
+        base = csv_file.name[:-4] if csv_file.name.endswith(".csv") else csv_file.name
+        rejects = f"{base}.rejects.csv"
+
+    with open(rejects, "w", newline="", encoding="utf-8") as reject_file:
+        # Un fichier de rejets corrigé peut être réimporté tel quel
+        columns = [name for name in reader.fieldnames or [] if name != "reason"]
+        writer = csv.DictWriter(reject_file, fieldnames=columns + ["reason"],
+                                extrasaction="ignore")
+        writer.writeheader()
+        stats = ClientController(obj.get_db(), obj.get_user()).import_clients(
+            reader, chunk_size=chunk_size,
+            on_reject=lambda row, reason: writer.writerow(dict(row, reason=reason))
+        )
+
+    BaseView.display_success(f"{stats['imported']} client(s) importé(s) en {stats['chunks']} paquet(s)")
+    if stats["rejected"]:
+        BaseView.display_info(f"{stats['rejected']} ligne(s) rejetée(s) : voir {rejects}")
+    else:
+        os.remove(rejects)
+
+
+@clients.command("update")
+@click.argument("client_id", type=int)
+@click.option("--full-name")
+@click.option("--email")
+@click.option("--phone")
+@click.option("--company")
+@click.option("--expected-version", type=int,
+              help="Version lue (version_id) : refuser si le client a changé depuis.")
+@click.pass_obj
+@handle_errors
+def clients_update(obj, client_id, full_name, email, phone, company, expected_version):
+    """Met à jour un client (seuls les champs indiqués sont modifiés)."""
+    from src.controllers.client_controller import ClientController
+    from src.views.client_view import ClientView
+    if email and not validate_email_format(email):
+        raise ValueError("Email invalide")
+    if phone and not validate_phone(phone):
+        raise ValueError("Numéro de téléphone invalide")
+
+    controller = ClientController(obj.get_db(), obj.get_user())
+    retry_on_conflict(obj.get_db(), lambda: controller.update_client(
+        client_id, full_name, email, phone, company, expected_version
+    ), expected_version)
+    ClientView().display_client_updated()
+
+
+# ========== CONTRATS ==========
+
+@cli.group()
+def contracts():
+    """Gestion des contrats."""
+
+
+@contracts.command("list")
+@click.option("--status", type=click.Choice(["unsigned", "unpaid"]))
+@format_option
+@page_size_option
+@click.pass_obj
+@handle_errors
+def contracts_list(obj, status, fmt, page_size):
+    """Liste les contrats, éventuellement filtrés par statut."""
+    from src.controllers.contract_controller import ContractController
+    from src.views.contract_view import ContractView
+    controller = ContractController(obj.get_db(), obj.get_user())
+    pages = iter_pages(
+        lambda after, size: controller.get_contracts_page(after, size, status=status),
+        page_size
+    )
+    output_list(pages, fmt, ContractView().display_contracts_list, "Liste des contrats")
+
+
+@contracts.command("create")
+@click.argument("client_id", type=int)
+@click.argument("total_amount", type=float)
+@click.option("--remaining", type=float, help="Montant restant (par défaut : le total).")
+@click.pass_obj
+@handle_errors
+def contracts_create(obj, client_id, total_amount, remaining):
+    """Crée un contrat pour un client (GESTION)."""
+    from src.controllers.contract_controller import ContractController
+    from src.views.contract_view import ContractView
+    if not validate_amount(total_amount):
+        raise ValueError("Le montant total doit être > 0")
+
+    contract = ContractController(obj.get_db(), obj.get_user()).create_contract(
+        client_id, total_amount, remaining
+    )
+    ContractView().display_contract_created(contract)
+
+
+@contracts.command("sign")
+@click.argument("contract_ids", type=int, nargs=-1, required=True)
+@click.pass_obj
+@handle_errors
+def contracts_sign(obj, contract_ids):
+    """Signe un ou plusieurs contrats."""
+    from src.controllers.contract_controller import ContractController
+    from src.views.contract_view import ContractView
+    controller = ContractController(obj.get_db(), obj.get_user())
+    view = ContractView()
+    for contract_id in contract_ids:
+        view.display_contract_signed(controller.sign_contract(contract_id))
+
+
+@contracts.command("pay")
+@click.argument("contract_id", type=int)
+@click.argument("amount", type=float)
+@click.pass_obj
+@handle_errors
+def contracts_pay(obj, contract_id, amount):
+    """Enregistre un paiement sur un contrat signé."""
+    from src.controllers.contract_controller import ContractController
+    from src.views.contract_view import ContractView
+    if not validate_amount(amount):
+        raise ValueError("Le montant doit être > 0")
+
+    payment = ContractController(obj.get_db(), obj.get_user()).record_payment(contract_id, amount)
+    ContractView().display_payment_recorded(payment)
+
+
+# ========== ÉVÉNEMENTS ==========
+
+@cli.group()
+def events():
+    """Gestion des événements."""
+
+
+@events.command("list")
+@click.option("--scope", type=click.Choice(["mine", "unassigned"]))
+@format_option
+@page_size_option
+@click.pass_obj
+@handle_errors
+def events_list(obj, scope, fmt, page_size):
+    """Liste les événements (tous, les miens ou non assignés)."""
+    from src.controllers.event_controller import EventController
+    from src.views.event_view import EventView
+    controller = EventController(obj.get_db(), obj.get_user())
+    pages = iter_pages(
+        lambda after, size: controller.get_events_page(after, size, scope=scope),
+        page_size
+    )
+    output_list(pages, fmt, EventView().display_events_list, "Liste des événements")
+
+
+@events.command("agenda")
+@click.option("--view", type=click.Choice(["week", "month"]), default="week",
+              help="Semaine (lundi-dimanche) ou mois contenant --date.")
+@click.option("--date", "day", type=click.DateTime(["%Y-%m-%d"]), help="AAAA-MM-JJ (défaut : aujourd'hui)")
+@click.option("--days", type=click.IntRange(min=1),
+              help="Les N prochains jours à partir de maintenant, au lieu de --view/--date.")
+@click.option("--scope", type=click.Choice(["mine", "unassigned"]))
+@click.option("--support", "support_id", type=int, help="ID du membre du SUPPORT.")
+@click.option("--client", "client_id", type=int, help="ID du client.")
+@click.option("--location", help="Partie du lieu.")
+@format_option
+@click.pass_obj
+@handle_errors
+def events_agenda(obj, view, day, days, scope, support_id, client_id, location, fmt):
+    """Agenda des événements d'une semaine, d'un mois ou des prochains jours."""
+    from src.controllers.event_controller import EventController, agenda_period
+    from src.views.event_view import EventView
+    if days:
+        start = datetime.now()
+        end, view = start + timedelta(days=days), "week"
+    else:
+        start, end = agenda_period(view, day or datetime.now())
+    events = EventController(obj.get_db(), obj.get_user()).get_events_between(
+        start, end, scope=scope, support_id=support_id, client_id=client_id, location=location
+    )
+    if fmt == "jsonl":
+        for event in events:
+            click.echo(json.dumps(event.to_dict(), default=str, ensure_ascii=False))
+    else:
+        EventView().display_agenda(events, start, end, view)
+
+
+@events.command("create")
+@click.argument("contract_id", type=int)
+@click.option("--start", type=date_type, required=True, help="AAAA-MM-JJ HH:MM")
+@click.option("--end", type=date_type, required=True, help="AAAA-MM-JJ HH:MM")
+@click.option("--location", required=True)
+@click.option("--attendees", type=int, required=True)
+@click.option("--notes")
+@click.pass_obj
+@handle_errors
+def events_create(obj, contract_id, start, end, location, attendees, notes):
+    """Crée l'événement d'un contrat signé (COMMERCIAL)."""
+    from src.controllers.event_controller import EventController
+    from src.views.event_view import EventView
+    if not validate_attendees(attendees):
+        raise ValueError("Le nombre de participants doit être > 0")
+
+    event = EventController(obj.get_db(), obj.get_user()).create_event(
+        contract_id, start, end, location, attendees, notes
+    )
+    EventView().display_event_created(event)
+
+
+@events.command("assign")
+@click.argument("event_id", type=int)
+@click.argument("support_id", type=int)
+@click.option("--force", is_flag=True, help="Assigner même en cas de chevauchement.")
+@click.pass_obj
+@handle_errors
+def events_assign(obj, event_id, support_id, force):
+    """Assigne un événement à un membre du SUPPORT (GESTION)."""
+    from src.controllers.event_controller import EventController
+    from src.exceptions import EventConflictError
+    from src.views.event_view import EventView
+    controller = EventController(obj.get_db(), obj.get_user())
+    try:
+        event = retry_on_conflict(
+            obj.get_db(), lambda: controller.assign_event(event_id, support_id, force=force)
+        )
+    except EventConflictError as e:
+        EventView().display_overlapping_events(e.support_user, e.conflicts)
+        raise click.ClickException("Chevauchement - relancez avec --force pour assigner quand même")
+    EventView().display_event_assigned(event, event.support_contact)
+
+
+@events.command("auto-assign")
+@click.option("--since", type=date_type, help="Uniquement les événements commençant après cette date.")
+@click.option("--dry-run", is_flag=True, help="Afficher le plan sans l'appliquer.")
+@click.option("--yes", is_flag=True, help="Appliquer sans confirmation.")
+@click.pass_obj
+@handle_errors
+def events_auto_assign(obj, since, dry_run, yes):
+    """Assigne les événements non assignés au SUPPORT, sans chevauchement (GESTION)."""
+    from src.controllers.event_controller import EventController
+    from src.views.event_view import EventView
+    controller = EventController(obj.get_db(), obj.get_user())
+    plan = controller.plan_auto_assignment(since)
+    EventView().display_assignment_plan(plan)
+    if dry_run or not plan.assignments:
+        return
+    if not yes and not click.confirm("Appliquer ce plan ?"):
+        return
+    count = controller.apply_auto_assignment(plan)
+    BaseView.display_success(f"{count} événement(s) assigné(s)")
+
+
+@events.command("conflicts")
+@click.option("--since", type=date_type, help="Uniquement les événements finissant après cette date.")
+@click.pass_obj
+@handle_errors
+def events_conflicts(obj, since):
+    """Liste les chevauchements de planning des membres du SUPPORT (GESTION)."""
+    from src.controllers.event_controller import EventController
+    from src.views.event_view import EventView
+    conflicts = EventController(obj.get_db(), obj.get_user()).get_conflicts_report(since)
+    EventView().display_conflicts(conflicts)
+
+
+@events.command("update")
+@click.argument("event_id", type=int)
+@click.option("--location")
+@click.option("--attendees", type=int)
+@click.option("--notes")
+@click.option("--expected-version", type=int,
+              help="Version lue (version_id) : refuser si l'événement a changé depuis.")
+@click.pass_obj
+@handle_errors
+def events_update(obj, event_id, location, attendees, notes, expected_version):
+    """Met à jour un événement (seuls les champs indiqués sont modifiés)."""
+    from src.controllers.event_controller import EventController
+    from src.views.event_view import EventView
+    controller = EventController(obj.get_db(), obj.get_user())
+    retry_on_conflict(obj.get_db(), lambda: controller.update_event(
+        event_id, location, attendees, notes, expected_version
+    ), expected_version)
+    EventView().display_event_updated()
+
+
+# ========== RAPPORTS ==========
+
+@cli.group()
+def reports():
+    """Rapports de gestion, agrégés par la base (GESTION)."""
+
+
+def output_report(rows, fmt, display):
+    if fmt == "jsonl":
+        from src.utils.export import format_value
+        for row in rows:
+            record = {name: format_value(value) for name, value in row._mapping.items()}
+            click.echo(json.dumps(record, ensure_ascii=False))
+    else:
+        display(rows)
+
+
+@reports.command("pipeline")
+@format_option
+@click.pass_obj
+@handle_errors
+def reports_pipeline(obj, fmt):
+    """Contrats signés et non signés par commercial."""
+    from src.controllers.report_controller import ReportController
+    from src.views.report_view import ReportView
+    rows = ReportController(obj.get_db(), obj.get_user()).get_pipeline_by_commercial()
+    output_report(rows, fmt, ReportView().display_pipeline)
+
+
+@reports.command("receivables")
+@format_option
+@click.pass_obj
+@handle_errors
+def reports_receivables(obj, fmt):
+    """Montants restant dus par client."""
+    from src.controllers.report_controller import ReportController
+    from src.views.report_view import ReportView
+    rows = ReportController(obj.get_db(), obj.get_user()).get_receivables_by_client()
+    output_report(rows, fmt, ReportView().display_receivables)
+
+
+@reports.command("monthly")
+@click.option("--since", type=click.DateTime(["%Y-%m-%d"]), help="AAAA-MM-JJ (inclus)")
+@click.option("--until", type=click.DateTime(["%Y-%m-%d"]), help="AAAA-MM-JJ (exclu)")
+@format_option
+@click.pass_obj
+@handle_errors
+def reports_monthly(obj, since, until, fmt):
+    """Contrats créés par mois."""
+    from src.controllers.report_controller import ReportController
+    from src.views.report_view import ReportView
+    rows = ReportController(obj.get_db(), obj.get_user()).get_monthly_bookings(since, until)
+    output_report(rows, fmt, ReportView().display_monthly_bookings)
+
+
+@cli.group()
+def summaries():
+    """Totaux des contrats par client et par commercial."""
+
+
+@summaries.command("show")
+@click.option("--client", "client_id", type=int)
+@click.option("--commercial", "commercial_id", type=int)
+@click.pass_obj
+@handle_errors
+def summaries_show(obj, client_id, commercial_id):
+    """Affiche les totaux d'un client ou d'un commercial (lecture directe)."""
+    from src.controllers.summary_controller import SummaryController
+    if (client_id is None) == (commercial_id is None):
+        raise click.UsageError("Indiquez --client ou --commercial")
+    controller = SummaryController(obj.get_db(), obj.get_user())
+    if client_id is not None:
+        summary, title = controller.get_client_summary(client_id), f"Client {client_id}"
+    else:
+        summary, title = controller.get_commercial_summary(commercial_id), f"Commercial {commercial_id}"
+    BaseView.display_stats(title, summary.to_dict() if summary else {"contract_count": 0})
+
+
+@summaries.command("rebuild")
+@click.pass_obj
+@handle_errors
+def summaries_rebuild(obj):
+    """Recalcule tous les totaux depuis les contrats (GESTION)."""
+    from src.controllers.summary_controller import SummaryController
+    counts = SummaryController(obj.get_db(), obj.get_user()).rebuild()
+    for table, count in counts.items():
+        BaseView.display_success(f"{table} : {count} ligne(s)")
+
+
+@summaries.command("check")
+@click.pass_obj
+@handle_errors
+def summaries_check(obj):
+    """Vérifie les totaux ; code de sortie 1 en cas d'écart (GESTION)."""
+    from src.controllers.summary_controller import SummaryController
+    mismatches = SummaryController(obj.get_db(), obj.get_user()).check()
+    for table, key, expected, stored in mismatches:
+        BaseView.display_error(f"{table} {key} : attendu {expected}, enregistré {stored}")
+    if mismatches:
+        raise click.ClickException(f"{len(mismatches)} écart(s) - lancez 'summaries rebuild'")
+    BaseView.display_success("Totaux cohérents")
+
+
+# ========== RECHERCHE ==========
+
+@cli.group()
+def search():
+    """Recherche plein texte (clients, événements)."""
+
+
+def output_search(page, fmt, display_list, title):
+    output_list([page.items], fmt, display_list, title)
+    if page.has_next and fmt == "table":
+        BaseView.display_info(f"Résultats suivants : --offset {page.next_cursor}")
+
+
+@search.command("clients")
+@click.argument("text")
+@click.option("--offset", type=click.IntRange(min=0), default=0)
+@format_option
+@page_size_option
+@click.pass_obj
+@handle_errors
+def search_clients(obj, text, offset, fmt, page_size):
+    """Recherche dans le nom, l'email et la société des clients."""
+    from src.controllers.search_controller import SearchController
+    from src.views.client_view import ClientView
+    page = SearchController(obj.get_db(), obj.get_user()).search_clients(text, offset, page_size)
+    output_search(page, fmt, ClientView().display_clients_list, f"Recherche « {text} »")
+
+
+@search.command("events")
+@click.argument("text")
+@click.option("--offset", type=click.IntRange(min=0), default=0)
+@format_option
+@page_size_option
+@click.pass_obj
+@handle_errors
+def search_events(obj, text, offset, fmt, page_size):
+    """Recherche dans le lieu et les notes des événements."""
+    from src.controllers.search_controller import SearchController
+    from src.views.event_view import EventView
+    page = SearchController(obj.get_db(), obj.get_user()).search_events(text, offset, page_size)
+    output_search(page, fmt, EventView().display_events_list, f"Recherche « {text} »")
+
+
+@search.command("rebuild")
+@click.pass_obj
+@handle_errors
+def search_rebuild(obj):
+    """Crée et reconstruit les index de recherche (GESTION)."""
+    from src.controllers.search_controller import SearchController
+    SearchController(obj.get_db(), obj.get_user()).rebuild_index()
+    BaseView.display_success("Index de recherche reconstruits")
+
+
+# ========== EXPORTS ==========
+
+@cli.group()
+def export():
+    """Exports en flux (CSV, JSON Lines, gzip)."""
+
+
+def export_options(func):
+    func = click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default="csv",
+                        help="Format de sortie.")(func)
+    func = click.option("--output", "-o", default="-",
+                        help="Fichier de sortie (- : sortie standard, .gz : compressé).")(func)
+    func = click.option("--gzip", "compress", is_flag=True, help="Compresser en gzip.")(func)
+    return func
+
+
+def run_export(query, output, fmt, compress):
+    from src.utils.export import open_output, write_rows
+    with open_output(output, compress) as stream:
+        count = write_rows(query, stream, fmt)
+    if output != "-":
+        BaseView.display_success(f"{count} ligne(s) exportée(s) dans {output}")
+
+
+@export.command("clients")
+@click.option("--mine", is_flag=True, help="Uniquement mes clients (COMMERCIAL).")
+@export_options
+@click.pass_obj
+@handle_errors
+def export_clients(obj, mine, fmt, output, compress):
+    """Exporte les clients."""
+    from src.controllers.client_controller import ClientController
+    query = ClientController(obj.get_db(), obj.get_user()).export_query(mine=mine)
+    run_export(query, output, fmt, compress)
+
+
+@export.command("contracts")
+@click.option("--status", type=click.Choice(["unsigned", "unpaid"]))
+@export_options
+@click.pass_obj
+@handle_errors
+def export_contracts(obj, status, fmt, output, compress):
+    """Exporte les contrats."""
+    from src.controllers.contract_controller import ContractController
+    query = ContractController(obj.get_db(), obj.get_user()).export_query(status=status)
+    run_export(query, output, fmt, compress)
+
+
+@export.command("events")
+@click.option("--scope", type=click.Choice(["mine", "unassigned"]))
+@export_options
+@click.pass_obj
+@handle_errors
+def export_events(obj, scope, fmt, output, compress):
+    """Exporte les événements."""
+    from src.controllers.event_controller import EventController
+    query = EventController(obj.get_db(), obj.get_user()).export_query(scope=scope)
+    run_export(query, output, fmt, compress)
+
+
+# ========== AUDIT ==========
+
+@cli.group()
+def audit():
+    """Journal d'audit local."""
+
+
+@audit.command("query")
+@click.option("--since", type=date_type, help="AAAA-MM-JJ HH:MM")
+@click.option("--until", type=date_type, help="AAAA-MM-JJ HH:MM")
+@click.option("--event", "event_name", help="Nom de l'événement, ex. contract_signed.")
+@click.option("--user", "user_id", type=int, help="Id de l'auteur de l'action.")
+@format_option
+@click.pass_obj
+@handle_errors
+def audit_query(obj, since, until, event_name, user_id, fmt):
+    """Recherche dans le journal d'audit (GESTION)."""
+    from datetime import datetime
+    from src.permissions.decorators import check_is_gestion
+    from src.utils.audit import get_journal
+    check_is_gestion(obj.get_user())
+    journal = get_journal()
+    if journal is None:
+        raise click.ClickException("Journal d'audit désactivé (AUDIT_DIR vide).")
+
+    count = 0
+    for record in journal.query(since, until, event_name, user_id):
+        count += 1
+        if fmt == "jsonl":
+            click.echo(json.dumps(record, default=str, ensure_ascii=False))
+        else:
+            when = datetime.fromtimestamp(record["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+            user = record["user_id"] if record["user_id"] is not None else "-"
+            click.echo(f"{when} | {record['event']} | {user} | "
+                       f"{json.dumps(record['data'], ensure_ascii=False)}")
+    if fmt == "table":
+        BaseView.display_info(f"{count} événement(s)")
+
+
+# ========== RAPPELS ==========
+
+@cli.group()
+def reminders():
+    """Rappels des événements à venir aux membres du SUPPORT."""
+
+
+@reminders.command("run")
+@click.option("--sink", envvar="REMINDER_SINK", default="stdout", show_default=True,
+              help="stdout, file:CHEMIN ou smtp://HÔTE:PORT.")
+@click.option("--sender", envvar="REMINDER_SMTP_FROM", help="Expéditeur des emails (smtp).")
+@click.option("--lead-hours", envvar="REMINDER_LEAD_HOURS", type=click.FloatRange(min=0),
+              default=24, show_default=True, help="Délai entre le rappel et le début.")
+@click.option("--resync-seconds", envvar="REMINDER_RESYNC_SECONDS", type=click.IntRange(min=1),
+              default=60, show_default=True, help="Intervalle de relecture des modifications.")
+@click.option("--catch-up-minutes", type=click.IntRange(min=0), default=0,
+              help="Envoie aussi les rappels échus depuis N minutes (reprise après un arrêt).")
+@click.option("--once", is_flag=True,
+              help="Envoie les rappels échus puis s'arrête (cron, avec --catch-up-minutes).")
+@click.pass_obj
+@handle_errors
+def reminders_run(obj, sink, sender, lead_hours, resync_seconds, catch_up_minutes, once):
+    """Envoie les rappels au fil de l'eau, jusqu'à Ctrl+C (GESTION)."""
+    from src.controllers.reminder_controller import ReminderController
+    from src.utils.reminder_sinks import make_sink
+    controller = ReminderController(
+        obj.get_db(), obj.get_user(), make_sink(sink, sender),
+        lead=timedelta(hours=lead_hours), resync_interval=timedelta(seconds=resync_seconds),
+        catch_up=timedelta(minutes=catch_up_minutes)
+    )
+    try:
+        if once:
+            controller.send_due()
+        else:
+            BaseView.display_info(f"Rappels {lead_hours:g} h avant chaque événement - Ctrl+C pour arrêter")
+            controller.run()
+    except KeyboardInterrupt:
+        pass
+    BaseView.display_stats("Rappels", controller.stats)
+
+
+# ========== SCRIPTS ==========
+
+@cli.command("run-script")
+@click.argument("script", type=click.File("r"))
+@click.pass_obj
+def run_script(obj, script):
+    """
+    Exécute un fichier de commandes (une par ligne, # pour les commentaires)
+    dans un seul processus, une seule session et une seule transaction.
+    """
+    from sqlalchemy.orm import sessionmaker
+    from src.database.config import BatchSession
+
+    # Authentification une seule fois pour tout le script
+    obj.get_user()
+    obj.close()
+    obj.db = sessionmaker(bind=obj.get_bind(), class_=BatchSession, autoflush=False)()
+
+    try:
+        count = 0
+        for number, line in enumerate(script, 1):
+            args = shlex.split(line, comments=True)
+            if not args:
+                continue
+            if args[0] in NOT_SCRIPTABLE:
+                raise click.ClickException(
+                    f"Ligne {number} : la commande {args[0]} n'est pas autorisée dans un script"
+                )
+            try:
+                cli.main(args=args, prog_name="epic-events", standalone_mode=False, obj=obj)
+            except click.ClickException as e:
+                raise click.ClickException(
+                    f"Ligne {number} ({line.strip()}) : {e.format_message()} "
+                    "- script annulé, aucune modification enregistrée"
+                )
+            count += 1
+
+        obj.db.commit_batch()
+        BaseView.display_success(f"{count} commande(s) exécutée(s)")
+    except Exception:
+        obj.db.rollback()
+        raise
@@ -1,6 +1,23 @@
+from sqlalchemy import event
+
 from src.models.user import User
-from src.utils.auth import verify_password, create_access_token, decode_access_token
+from src.utils.auth import (
+    verify_password,
+    hash_password,
+    needs_rehash,
+    create_access_token,
+    decode_access_token
+)
 from src.utils.logger import log_event, log_error
+from src.utils.token_cache import token_cache, snapshot_user
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_tokens(mapper, connection, target):
+    """Un utilisateur modifié (rôle, email...) ne doit plus être servi par le cache."""
+    token_cache.invalidate_user(target.id)
+
 
 class AuthController:
     """Gère l'authentification des utilisateurs."""
@@ -24,6 +41,11 @@ class AuthController:
                 log_event("login_failed", {"email": email, "reason": "wrong_password"})
                 raise ValueError("Email ou mot de passe incorrect")
 
+            # Mettre le hash au coût configuré (BCRYPT_ROUNDS) tant que
+            # le mot de passe en clair est disponible
+            if needs_rehash(user.password_hash):
+                self._rehash_password(user, password)
+
             # Créer le token
             token = create_access_token(user.id, user.role.value)
         
@@ -42,17 +64,41 @@ class AuthController:
             log_error(e, {"email": email})
             raise
         
+    def _rehash_password(self, user, password):
+        """
+        Re-hache le mot de passe au coût configuré, sans bloquer la connexion :
+        en cas d'échec (base verrouillée ou en lecture seule...), l'ancien hash
+        reste valide et sera remplacé à une prochaine connexion.
+        """
+        user_id = user.id
+        try:
+            user.password_hash = hash_password(password)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            log_error(e, {"user_id": user_id, "action": "password_rehash"})
+        else:
+            log_event("password_rehashed", {"user_id": user_id})
+
     def verify_token(self, token):
-        """Vérifie un token et retourne l'utilisateur."""
+        """
+        Vérifie un token et retourne l'utilisateur (UserSnapshot).
+        Un token déjà vérifié est servi par le cache, sans requête.
+        """
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
 
         payload = decode_access_token(token)
 
-        user = self.db.query(User).filter(User.id == payload["user_id"]).first()
+        user = self.db.get(User, payload["user_id"])
 
         if user is None:
             raise ValueError("Utilisateur non trouvé")
 
-        return user
+        snapshot = snapshot_user(user)
+        token_cache.put(token, snapshot, payload.get("exp"))
+        return snapshot
 
     def set_current_user(self, token):
         """Définit l'utilisateur connecté."""
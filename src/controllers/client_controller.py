@@ -1,11 +1,50 @@
-from src.models.user import Role
+from collections import Counter, defaultdict
+from itertools import combinations, groupby, islice
+from operator import itemgetter
+
+from sqlalchemy import insert, select, delete, func, bindparam
+
+from src.database.config import check_version, commit_or_conflict
+from src.exceptions import DuplicateClientError
+from src.models.user import User, Role
 from src.models.client import Client
+from src.models.client_trigram import (
+    ClientTrigram,
+    client_grams,
+    profile,
+    similarity,
+    index_clients
+)
 from src.permissions.decorators import (
     check_is_authenticated,
     check_is_commercial,
+    check_is_gestion,
     check_is_owner_or_gestion
 )
 from src.utils.logger import log_event, log_error
+from src.utils.pagination import paginate, DEFAULT_PAGE_SIZE
+from src.utils.validators import validate_email_format, validate_phone
+
+IMPORT_CHUNK_SIZE = 1000
+
+# Détection des doublons. Les trigrammes partagés par plus de
+# DUPLICATE_MAX_POSTINGS clients ne servent pas à chercher les candidats
+# (sauf s'il en reste moins de DUPLICATE_MIN_GRAMS : les plus rares sont gardés)
+DUPLICATE_THRESHOLD = 0.6
+DUPLICATE_CANDIDATES = 50
+DUPLICATE_MAX_POSTINGS = 2000
+DUPLICATE_MIN_GRAMS = 6
+# Rapport sur toute la table (voir get_duplicates_report)
+DEDUP_RAREST = 4
+DEDUP_MAX_BLOCK = 50
+DEDUP_MIN_BLOCKS = 3
+
+POSTINGS_QUERY = select(func.count()).select_from(
+    select(ClientTrigram.gram)
+    .where(ClientTrigram.gram == bindparam("gram"))
+    .limit(DUPLICATE_MAX_POSTINGS + 1)
+    .subquery()
+)
 
 class ClientController:
     """Gère les opérations sur les clients."""
@@ -14,23 +53,100 @@ class ClientController:
         self.db = db
         self.current_user = current_user
 
+    def _scoped_query(self, mine=False, query=None):
+        """
+        Requête des clients visibles, restreinte au commercial si `mine`.
+        `query` remplace la requête de base (ex. sélection de colonnes).
+        """
+        query = self.db.query(Client) if query is None else query
+        if not mine:
+            check_is_authenticated(self.current_user)
+            return query
+
+        check_is_commercial(self.current_user)
+        return query.filter(
+            Client.commercial_contact_id == self.current_user.id
+        )
+
     def get_all_clients(self):
         """Retourne tous les clients."""
-        check_is_authenticated(self.current_user)
-        return self.db.query(Client).all()
+        return self._scoped_query().all()
 
     def get_my_clients(self):
         """Retourne les clients du commercial connecté."""
-        check_is_commercial(self.current_user)
+        return self._scoped_query(mine=True).all()
 
-        return self.db.query(Client).filter(
-            Client.commercial_contact_id == self.current_user.id
-        ).all()
+    def get_clients_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE, mine=False):
+        """Retourne une page de clients triés par ID, après le curseur `after_id`."""
+        return paginate(self._scoped_query(mine), Client.id, after_id, page_size)
+
+    def export_query(self, mine=False):
+        """Colonnes des clients visibles, pour un export en flux."""
+        columns = self.db.query(
+            Client.id, Client.full_name, Client.email, Client.phone,
+            Client.company_name, Client.commercial_contact_id,
+            Client.created_at, Client.updated_at
+        )
+        return self._scoped_query(mine, columns).order_by(Client.id)
+
+    def _selective_grams(self, grams):
+        """
+        Trigrammes les plus discriminants de `grams`. Le nombre de clients de
+        chaque trigramme est compté jusqu'à DUPLICATE_MAX_POSTINGS + 1 seulement
+        (lecture bornée de l'index), avec une requête compilée une seule fois.
+        """
+        postings = sorted(
+            (self.db.execute(POSTINGS_QUERY, {"gram": gram}).scalar(), gram)
+            for gram in grams
+        )
+        selective = [gram for count, gram in postings if 0 < count <= DUPLICATE_MAX_POSTINGS]
+        if len(selective) < DUPLICATE_MIN_GRAMS:
+            selective = [gram for count, gram in postings if count][:DUPLICATE_MIN_GRAMS]
+        return selective
+
+    def find_possible_duplicates(self, full_name, email, company_name=None,
+                                 threshold=DUPLICATE_THRESHOLD, limit=10):
+        """
+        Clients proches de ceux décrits, sous forme de (score, client) triés
+        par score décroissant. Les candidats sont les clients qui partagent le
+        plus de trigrammes (index client_trigrams), puis ils sont notés un à un.
+        """
+        check_is_authenticated(self.current_user)
+        grams = self._selective_grams(client_grams(full_name, email, company_name))
+        if not grams:
+            return []
 
-    def create_client(self, full_name, email, phone, company_name=None):
-        """Crée un client (COMMERCIAL uniquement)."""
+        candidate_ids = set(self.db.scalars(
+            select(ClientTrigram.client_id)
+            .where(ClientTrigram.gram.in_(grams))
+            .group_by(ClientTrigram.client_id)
+            .order_by(func.count().desc())
+            .limit(DUPLICATE_CANDIDATES)
+        ))
+        if not candidate_ids:
+            return []
+
+        target = profile(full_name, email, company_name)
+        scored = []
+        for client in self.db.scalars(select(Client).where(Client.id.in_(candidate_ids))):
+            score = similarity(target, profile(client.full_name, client.email, client.company_name))
+            if score >= threshold:
+                scored.append((score, client))
+        scored.sort(key=lambda item: (-item[0], item[1].id))
+        return scored[:limit]
+
+    def create_client(self, full_name, email, phone, company_name=None, force=False):
+        """
+        Crée un client (COMMERCIAL uniquement).
+        DuplicateClientError si des clients proches existent, sauf si `force`.
+        """
         check_is_commercial(self.current_user)
 
+        if not force:
+            duplicates = self.find_possible_duplicates(full_name, email, company_name)
+            if duplicates:
+                raise DuplicateClientError(duplicates)
+
         try:
             new_client = Client(
                 full_name=full_name,
@@ -56,10 +172,121 @@ class ClientController:
             raise
 
 
+    def _check_import_row(self, row, commercial_ids):
+        """Retourne la raison du rejet d'une ligne d'import, ou None."""
+        if not (row.get("full_name") or "").strip():
+            return "nom manquant"
+        if not validate_email_format(row.get("email") or ""):
+            return "email invalide"
+        if not validate_phone(row.get("phone") or ""):
+            return "téléphone invalide"
+        if commercial_ids is not None:
+            try:
+                if int(row.get("commercial_contact_id") or "") in commercial_ids:
+                    return None
+            except ValueError:
+                pass
+            return "commercial_contact_id inconnu"
+        return None
+
+    def import_clients(self, rows, chunk_size=IMPORT_CHUNK_SIZE, on_reject=None):
+        """
+        Importe des clients depuis un itérable de dictionnaires (ex. csv.DictReader),
+        par paquets de `chunk_size` : validation, dédoublonnage par email,
+        insertion groupée puis un commit par paquet. La mémoire utilisée ne
+        dépend que de `chunk_size`.
+
+        Un COMMERCIAL importe ses propres clients ; la GESTION indique le
+        commercial de chaque ligne (colonne commercial_contact_id).
+        `on_reject(row, raison)` est appelé pour chaque ligne écartée.
+        """
+        check_is_authenticated(self.current_user)
+        if self.current_user.role not in (Role.COMMERCIAL, Role.GESTION):
+            raise PermissionError("Import réservé aux rôles COMMERCIAL et GESTION.")
+
+        commercial_ids = None
+        if self.current_user.role == Role.GESTION:
+            commercial_ids = set(self.db.scalars(
+                select(User.id).where(User.role == Role.COMMERCIAL)
+            ))
+
+        reject = on_reject or (lambda row, reason: None)
+        stats = {"imported": 0, "rejected": 0, "chunks": 0}
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            valid = {}
+            for row in chunk:
+                reason = self._check_import_row(row, commercial_ids)
+                email = (row.get("email") or "").strip()
+                if reason is None and email in valid:
+                    reason = "email en double dans le fichier"
+                if reason:
+                    reject(row, reason)
+                    stats["rejected"] += 1
+                else:
+                    valid[email] = row
+
+            # Dédoublonnage contre la base : une requête par paquet (index sur email)
+            existing = set(self.db.scalars(
+                select(Client.email).where(Client.email.in_(list(valid)))
+            )) if valid else set()
+            batch = []
+            for email, row in valid.items():
+                if email in existing:
+                    reject(row, "email déjà présent")
+                    stats["rejected"] += 1
+                    continue
+                batch.append({
+                    "full_name": row["full_name"].strip(),
+                    "email": email,
+                    "phone": row["phone"].strip(),
+                    "company_name": (row.get("company_name") or "").strip() or None,
+                    "commercial_contact_id": (
+                        int(row["commercial_contact_id"]) if commercial_ids is not None
+                        else self.current_user.id
+                    ),
+                })
+
+            try:
+                if batch:
+                    self.db.execute(insert(Client), batch)
+                    # Les INSERT groupés ne passent pas par le flush : indexer ici.
+                    # Les emails du paquet sont uniques et absents avant l'insertion.
+                    ids = dict(self.db.execute(
+                        select(Client.email, Client.id).where(Client.email.in_(list(valid)))
+                    ).all())
+                    index_clients(self.db.connection(), [
+                        (ids[row["email"]], row["full_name"], row["email"], row["company_name"])
+                        for row in batch
+                    ])
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                log_error(e, {"action": "import_clients", "chunk": stats["chunks"] + 1})
+                raise
+            stats["imported"] += len(batch)
+            stats["chunks"] += 1
+
+        # Un seul événement pour tout l'import
+        log_event("clients_imported", {
+            "imported": stats["imported"],
+            "rejected": stats["rejected"],
+            "created_by": self.current_user.id
+        })
+        return stats
+
     def update_client(self, client_id, full_name=None, email=None,
-                      phone=None, company_name=None):
+                      phone=None, company_name=None, expected_version=None):
+        """
+        Met à jour un client. `expected_version` : version lue par l'appelant ;
+        ConcurrentModificationError si le client a changé depuis.
+        """
 
-        client = self.db.query(Client).filter(Client.id == client_id).first()
+        client = self.db.get(Client, client_id)
 
         if client is None:
             raise ValueError("Client non trouvé")
@@ -75,6 +302,8 @@ class ClientController:
             "commercial_contact_id"
         )
 
+        check_version(client, expected_version, "Le client")
+
         if full_name:
             client.full_name = full_name
         if email:
@@ -84,7 +313,7 @@ class ClientController:
         if company_name is not None:
             client.company_name = company_name
 
-        self.db.commit()
+        commit_or_conflict(self.db, "Le client", client_id)
         
         # Logger
         log_event("client_updated", {
@@ -93,5 +322,88 @@ class ClientController:
         })
         return client
 
+    def get_duplicates_report(self, threshold=DUPLICATE_THRESHOLD):
+        """
+        Paires de clients probablement en double, sur toute la table (GESTION
+        uniquement), sous forme de (score, client_a, client_b).
+
+        Comparer toutes les paires est quadratique. Chaque client est rangé
+        dans des blocs, un par paire de ses DEDUP_RAREST trigrammes les plus
+        rares : deux quasi-doublons partagent leurs trigrammes rares, donc
+        plusieurs blocs. Seules les paires qui partagent au moins
+        DEDUP_MIN_BLOCKS blocs sont notées ; les blocs de plus de
+        DEDUP_MAX_BLOCK clients (trigrammes trop courants) sont ignorés.
+        """
+        check_is_gestion(self.current_user)
+        grams = ClientTrigram.__table__
+        postings = dict(self.db.execute(
+            select(grams.c.gram, func.count()).group_by(grams.c.gram)
+        ).all())
+
+        blocks = defaultdict(list)
+        rows = self.db.execute(
+            select(grams.c.client_id, grams.c.gram)
+            .order_by(grams.c.client_id)
+            .execution_options(yield_per=IMPORT_CHUNK_SIZE)
+        )
+        for client_id, client_rows in groupby(rows, key=itemgetter(0)):
+            rarest = sorted((postings[gram], gram) for _, gram in client_rows)[:DEDUP_RAREST]
+            for (_, first), (_, second) in combinations(rarest, 2):
+                blocks[first + second].append(client_id)
+
+        shared = Counter()
+        for ids in blocks.values():
+            if 1 < len(ids) <= DEDUP_MAX_BLOCK:
+                shared.update(combinations(ids, 2))
+        del blocks
+        pairs = sorted(pair for pair, count in shared.items() if count >= DEDUP_MIN_BLOCKS)
+        del shared
+
+        report = []
+        for start in range(0, len(pairs), IMPORT_CHUNK_SIZE):
+            chunk = pairs[start:start + IMPORT_CHUNK_SIZE]
+            ids = {client_id for pair in chunk for client_id in pair}
+            profiles = {
+                client_id: profile(full_name, email, company_name)
+                for client_id, full_name, email, company_name in self.db.execute(
+                    select(Client.id, Client.full_name, Client.email, Client.company_name)
+                    .where(Client.id.in_(ids))
+                )
+            }
+            for first_id, second_id in chunk:
+                score = similarity(profiles[first_id], profiles[second_id])
+                if score >= threshold:
+                    report.append((score, first_id, second_id))
+
+        # Seuls les clients du rapport sont chargés en objets
+        ids = {client_id for _, first_id, second_id in report for client_id in (first_id, second_id)}
+        clients = {}
+        ids = sorted(ids)
+        for start in range(0, len(ids), IMPORT_CHUNK_SIZE):
+            for client in self.db.scalars(
+                select(Client).where(Client.id.in_(ids[start:start + IMPORT_CHUNK_SIZE]))
+            ):
+                clients[client.id] = client
+        report.sort(key=lambda item: (-item[0], item[1], item[2]))
+        return [(score, clients[first_id], clients[second_id]) for score, first_id, second_id in report]
+
+    def rebuild_duplicate_index(self):
+        """Reconstruit l'index des trigrammes depuis la table des clients (GESTION)."""
+        check_is_gestion(self.current_user)
+        connection = self.db.connection()
+        connection.execute(delete(ClientTrigram.__table__))
+        count = 0
+        rows = self.db.execute(
+            select(Client.id, Client.full_name, Client.email, Client.company_name)
+            .execution_options(yield_per=IMPORT_CHUNK_SIZE)
+        )
+        for chunk in rows.partitions():
+            index_clients(connection, chunk)
+            count += len(chunk)
+        self.db.commit()
+
+        log_event("client_trigrams_rebuilt", {"clients": count, "rebuilt_by": self.current_user.id})
+        return count
+
     def get_client_by_id(self, client_id):
-        return self.db.query(Client).filter(Client.id == client_id).first()
+        return self.db.get(Client, client_id)
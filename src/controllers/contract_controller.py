@@ -1,12 +1,21 @@
+from decimal import Decimal
+
+from sqlalchemy import update, func
+from sqlalchemy.orm import joinedload
+
+from src.database.config import commit_or_conflict
 from src.models.user import Role
 from src.models.contract import Contract
 from src.models.client import Client
+from src.models.payment import Payment
+from src.models.summary import new_deltas, add_payment, apply_deltas
 from src.permissions.decorators import (
     check_is_authenticated,
     check_is_gestion,
     check_is_owner_or_gestion
 )
 from src.utils.logger import log_event, log_error
+from src.utils.pagination import paginate, DEFAULT_PAGE_SIZE
 
 class ContractController:
     """Gère les opérations sur les contrats."""
@@ -15,22 +24,52 @@ class ContractController:
         self.db = db
         self.current_user = current_user
 
-    def get_all_contracts(self):
+    def _list_query(self):
+        """Requête de liste chargeant le client affiché par la vue."""
+        return self.db.query(Contract).options(joinedload(Contract.client))
+
+    def _scoped_query(self, status=None, query=None):
+        """
+        Requête de liste filtrée par statut : None, "unsigned" ou "unpaid".
+        `query` remplace la requête de base (ex. sélection de colonnes).
+        """
         check_is_authenticated(self.current_user)
-        return self.db.query(Contract).all()
+        query = self._list_query() if query is None else query
+
+        if status == "unsigned":
+            return query.filter(Contract.is_signed == False)
+        if status == "unpaid":
+            return query.filter(Contract.remaining_amount > 0)
+        if status is not None:
+            raise ValueError(f"Statut de contrat inconnu : {status}")
+        return query
+
+    def get_all_contracts(self):
+        return self._scoped_query().all()
 
     def get_unsigned_contracts(self):
-        check_is_authenticated(self.current_user)
-        return self.db.query(Contract).filter(Contract.is_signed == False).all()
+        return self._scoped_query("unsigned").all()
 
     def get_unpaid_contracts(self):
-        check_is_authenticated(self.current_user)
-        return self.db.query(Contract).filter(Contract.remaining_amount > 0).all()
+        return self._scoped_query("unpaid").all()
+
+    def get_contracts_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE, status=None):
+        """Retourne une page de contrats triés par ID, après le curseur `after_id`."""
+        return paginate(self._scoped_query(status), Contract.id, after_id, page_size)
+
+    def export_query(self, status=None):
+        """Colonnes des contrats (et nom du client), pour un export en flux."""
+        columns = self.db.query(
+            Contract.id, Contract.client_id, Client.full_name.label("client_name"),
+            Contract.commercial_contact_id, Contract.total_amount,
+            Contract.remaining_amount, Contract.is_signed, Contract.created_at
+        ).join(Client, Contract.client_id == Client.id)
+        return self._scoped_query(status, columns).order_by(Contract.id)
 
     def create_contract(self, client_id, total_amount, remaining_amount=None):
         check_is_gestion(self.current_user)
 
-        client = self.db.query(Client).filter(Client.id == client_id).first()
+        client = self.db.get(Client, client_id)
         if client is None:
             raise ValueError("Client non trouvé")
 
@@ -58,7 +97,7 @@ class ContractController:
 
     def sign_contract(self, contract_id):
 
-        contract = self.db.query(Contract).filter(Contract.id == contract_id).first()
+        contract = self.db.get(Contract, contract_id)
         if contract is None:
             raise ValueError("Contrat non trouvé")
 
@@ -76,7 +115,7 @@ class ContractController:
             raise ValueError("Ce contrat est déjà signé")
 
         contract.is_signed = True
-        self.db.commit()
+        commit_or_conflict(self.db, "Le contrat", contract_id)
 
         log_event("contract_signed", {
             "contract_id": contract.id,
@@ -84,5 +123,72 @@ class ContractController:
         })
         return contract
 
+    def record_payment(self, contract_id, amount):
+        """
+        Enregistre un paiement sur un contrat signé.
+
+        Le restant dû est décrémenté par un seul UPDATE conditionnel : deux
+        paiements simultanés ne peuvent ni s'écraser ni dépasser le restant dû.
+        """
+        amount = Decimal(str(amount))
+        if amount <= 0:
+            raise ValueError("Le montant du paiement doit être > 0")
+
+        contract = self.db.get(Contract, contract_id)
+        if contract is None:
+            raise ValueError("Contrat non trouvé")
+
+        check_is_owner_or_gestion(
+            self.current_user,
+            contract,
+            "commercial_contact_id"
+        )
+
+        if not contract.is_signed:
+            raise ValueError("Le contrat doit être signé")
+
+        try:
+            result = self.db.execute(
+                update(Contract)
+                .where(Contract.id == contract_id, Contract.remaining_amount >= amount)
+                .values(
+                    remaining_amount=func.round(Contract.remaining_amount - amount, 2),
+                    # Une édition concurrente du contrat doit voir le paiement
+                    version_id=Contract.version_id + 1
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                raise ValueError("Le paiement dépasse le montant restant dû")
+
+            payment = Payment(
+                contract_id=contract_id,
+                amount=amount,
+                recorded_by_id=self.current_user.id
+            )
+            self.db.add(payment)
+
+            # L'UPDATE ne passe pas par le flush : mettre les totaux à jour ici
+            deltas = new_deltas()
+            add_payment(deltas, contract.client_id, contract.commercial_contact_id, amount)
+            apply_deltas(self.db.connection(), deltas)
+
+            self.db.commit()
+            # L'UPDATE a contourné la session : recharger le restant dû et la
+            # version (session longue du mode "run", sans expiration au commit)
+            self.db.expire(contract)
+        except Exception as e:
+            self.db.rollback()
+            log_error(e, {"action": "record_payment", "contract_id": contract_id})
+            raise
+
+        log_event("payment_recorded", {
+            "contract_id": contract_id,
+            "payment_id": payment.id,
+            "amount": str(amount),
+            "recorded_by": self.current_user.id
+        })
+        return payment
+
     def get_contract_by_id(self, contract_id):
-        return self.db.query(Contract).filter(Contract.id == contract_id).first()
+        return self.db.get(Contract, contract_id)
@@ -1,12 +1,53 @@
+import heapq
+from bisect import bisect_left
+from collections import namedtuple, defaultdict
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.util import identity_key
+
+from src.database.config import check_version, commit_or_conflict
+from src.exceptions import EventConflictError
 from src.models.user import User, Role
 from src.models.event import Event
 from src.models.contract import Contract
+from src.models.client import Client
 from src.permissions.decorators import (
     check_is_authenticated,
     check_is_commercial,
     check_is_gestion,
     check_is_owner_or_gestion
 )
+from src.utils.logger import log_event
+from src.utils.pagination import paginate, DEFAULT_PAGE_SIZE
+
+# Deux événements d'un même support qui se chevauchent, et la période commune
+Conflict = namedtuple("Conflict", ["support_contact_id", "first_event_id", "second_event_id",
+                                   "overlap_start", "overlap_end"])
+
+# Plan d'assignation automatique : assignations proposées, événements sans
+# support disponible, et charge (durée réservée) de chaque support
+Assignment = namedtuple("Assignment", ["event_id", "support_contact_id",
+                                       "event_date_start", "event_date_end"])
+AssignmentPlan = namedtuple("AssignmentPlan", ["assignments", "unassigned", "supports", "loads"])
+
+
+# Ancienneté maximale d'un événement encore en cours affiché dans l'agenda :
+# borne la plage d'index lue avant le début de la période
+AGENDA_LOOKBACK = timedelta(days=31)
+
+
+def agenda_period(view, day):
+    """Bornes [début, fin) de la semaine (lundi-dimanche) ou du mois contenant `day`."""
+    start = datetime.combine(day, time.min)
+    if view == "week":
+        start -= timedelta(days=start.weekday())
+        return start, start + timedelta(days=7)
+    if view == "month":
+        start = start.replace(day=1)
+        return start, (start + timedelta(days=32)).replace(day=1)
+    raise ValueError(f"Vue inconnue : {view}")
 
 
 class EventController:
@@ -15,35 +56,98 @@ class EventController:
         self.db = db
         self.current_user = current_user
 
-    def get_all_events(self):
-        check_is_authenticated(self.current_user)
-        return self.db.query(Event).all()
+    def _list_query(self):
+        """Requête de liste chargeant le client et le support affichés par la vue."""
+        return self.db.query(Event).options(
+            joinedload(Event.client),
+            joinedload(Event.support_contact)
+        )
 
-    def get_my_events(self):
+    def _scoped_query(self, scope=None, query=None):
+        """
+        Requête de liste filtrée par périmètre : None, "mine" ou "unassigned".
+        `query` remplace la requête de base (ex. sélection de colonnes).
+        """
         check_is_authenticated(self.current_user)
+        query = self._list_query() if query is None else query
 
-        if self.current_user.role != Role.SUPPORT:
-            raise PermissionError("Réservé au SUPPORT")
+        if scope == "mine":
+            if self.current_user.role != Role.SUPPORT:
+                raise PermissionError("Réservé au SUPPORT")
 
-        return self.db.query(Event).filter(
-            Event.support_contact_id == self.current_user.id
-        ).all()
+            return query.filter(
+                Event.support_contact_id == self.current_user.id
+            )
+        if scope == "unassigned":
+            return query.filter(
+                Event.support_contact_id == None
+            )
+        if scope is not None:
+            raise ValueError(f"Périmètre d'événements inconnu : {scope}")
+        return query
 
-    def get_unassigned_events(self):
-        check_is_authenticated(self.current_user)
+    def get_all_events(self):
+        return self._scoped_query().all()
 
-        return self.db.query(Event).filter(
-            Event.support_contact_id == None
-        ).all()
+    def get_my_events(self):
+        return self._scoped_query("mine").all()
+
+    def get_unassigned_events(self):
+        return self._scoped_query("unassigned").all()
+
+    def get_events_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE, scope=None):
+        """Retourne une page d'événements triés par ID, après le curseur `after_id`."""
+        return paginate(self._scoped_query(scope), Event.id, after_id, page_size)
+
+    def events_between_query(self, start, end, scope=None, support_id=None,
+                             client_id=None, location=None):
+        """
+        Requête des événements qui ont lieu pendant [start, end), y compris
+        ceux déjà en cours à `start` s'ils ont commencé moins de
+        AGENDA_LOOKBACK avant, triés par date de début. Une seule plage
+        d'index sur le début : (support, début) ou (client, début) avec un
+        filtre, sinon l'index sur le début ; la fin et le lieu filtrent.
+        """
+        if start >= end:
+            raise ValueError("La fin de la période doit suivre son début")
+        query = self._scoped_query(scope).filter(
+            Event.event_date_start >= start - AGENDA_LOOKBACK,
+            Event.event_date_start < end,
+            Event.event_date_end > start
+        )
+        if support_id is not None:
+            query = query.filter(Event.support_contact_id == support_id)
+        if client_id is not None:
+            query = query.filter(Event.client_id == client_id)
+        if location:
+            query = query.filter(Event.location.icontains(location, autoescape=True))
+        return query.order_by(Event.event_date_start, Event.id)
+
+    def get_events_between(self, start, end, **filters):
+        """Événements ayant lieu pendant [start, end) (voir events_between_query)."""
+        return self.events_between_query(start, end, **filters).all()
+
+    def get_upcoming_events(self, days=7, now=None, **filters):
+        """Événements des `days` prochains jours (voir get_events_between)."""
+        now = now or datetime.now()
+        return self.get_events_between(now, now + timedelta(days=days), **filters)
+
+    def export_query(self, scope=None):
+        """Colonnes des événements (et nom du client), pour un export en flux."""
+        columns = self.db.query(
+            Event.id, Event.contract_id, Event.client_id,
+            Client.full_name.label("client_name"), Event.support_contact_id,
+            Event.event_date_start, Event.event_date_end, Event.location,
+            Event.attendees, Event.notes
+        ).join(Client, Event.client_id == Client.id)
+        return self._scoped_query(scope, columns).order_by(Event.id)
 
     def create_event(self, contract_id, event_date_start,
                      event_date_end, location, attendees, notes=None):
 
         check_is_commercial(self.current_user)
 
-        contract = self.db.query(Contract).filter(
-            Contract.id == contract_id
-        ).first()
+        contract = self.db.get(Contract, contract_id)
 
         if contract is None:
             raise ValueError("Contrat non trouvé")
@@ -72,34 +176,67 @@ class EventController:
 
         return new_event
 
-    def assign_event(self, event_id, support_user_id):
+    def find_overlapping_events(self, support_user_id, start, end, exclude_event_id=None):
+        """
+        Événements du support qui chevauchent [start, end[, triés par début.
+        L'index (support, fin) limite la lecture aux événements qui finissent
+        après `start`, quel que soit l'historique du support.
+        """
+        event_start = Event.event_date_start
+        if self.db.get_bind().dialect.name == "sqlite":
+            # Sans statistiques, SQLite choisirait l'index (support, début) et
+            # relirait tout l'historique antérieur à `end` : `|| ''` l'écarte
+            event_start = event_start.op("||")("")
+        query = (
+            select(Event)
+            .where(
+                Event.support_contact_id == support_user_id,
+                Event.event_date_end > start,
+                event_start < end
+            )
+            .order_by(Event.event_date_start, Event.id)
+        )
+        if exclude_event_id is not None:
+            query = query.where(Event.id != exclude_event_id)
+        return self.db.scalars(query).all()
+
+    def assign_event(self, event_id, support_user_id, force=False):
+        """
+        Assigne un événement à un membre du SUPPORT (GESTION uniquement).
+        EventConflictError s'il est déjà pris sur la même période, sauf si `force`.
+        """
         check_is_gestion(self.current_user)
 
-        event = self.db.query(Event).filter(
-            Event.id == event_id
-        ).first()
+        event = self.db.get(Event, event_id)
 
         if event is None:
             raise ValueError("Événement non trouvé")
 
-        support_user = self.db.query(User).filter(
-            User.id == support_user_id
-        ).first()
+        support_user = self.db.get(User, support_user_id)
 
         if support_user is None or support_user.role != Role.SUPPORT:
             raise ValueError("L'utilisateur doit être SUPPORT")
 
+        if not force:
+            conflicts = self.find_overlapping_events(
+                support_user_id, event.event_date_start, event.event_date_end, event.id
+            )
+            if conflicts:
+                raise EventConflictError(support_user, conflicts)
+
         event.support_contact_id = support_user_id
-        self.db.commit()
+        commit_or_conflict(self.db, "L'événement", event_id)
 
         return event
 
     def update_event(self, event_id, location=None,
-                     attendees=None, notes=None):
+                     attendees=None, notes=None, expected_version=None):
+        """
+        Met à jour un événement. `expected_version` : version lue par l'appelant ;
+        ConcurrentModificationError si l'événement a changé depuis.
+        """
 
-        event = self.db.query(Event).filter(
-            Event.id == event_id
-        ).first()
+        event = self.db.get(Event, event_id)
 
         if event is None:
             raise ValueError("Événement non trouvé")
@@ -116,16 +253,170 @@ class EventController:
                 event,
                 "support_contact_id"
             )
+        check_version(event, expected_version, "L'événement")
+
         if location:
             event.location = location
         if attendees is not None:
             event.attendees = attendees
         if notes is not None:
             event.notes = notes
-        self.db.commit()
+        commit_or_conflict(self.db, "L'événement", event_id)
         return event
 
+    def get_conflicts_report(self, since=None):
+        """
+        Tous les chevauchements entre événements d'un même support (GESTION
+        uniquement), éventuellement limités aux événements finissant après
+        `since`. Balayage en O(n log n + k) : les événements arrivent triés
+        par (support, début) grâce à l'index ; un tas des fins d'événements
+        en cours donne ceux qui chevauchent le suivant.
+        """
+        check_is_gestion(self.current_user)
+        query = (
+            select(Event.support_contact_id, Event.id, Event.event_date_start, Event.event_date_end)
+            .where(Event.support_contact_id != None)
+            .order_by(Event.support_contact_id, Event.event_date_start, Event.id)
+            .execution_options(yield_per=1000)
+        )
+        if since is not None:
+            query = query.where(Event.event_date_end > since)
+
+        conflicts = []
+        current_support, active = None, []
+        for support_id, event_id, start, end in self.db.execute(query):
+            if support_id != current_support:
+                current_support, active = support_id, []
+            # Les événements terminés avant ce début ne chevauchent plus rien
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for other_end, other_id in sorted(active, key=lambda item: item[1]):
+                conflicts.append(Conflict(support_id, other_id, event_id, start, min(end, other_end)))
+            heapq.heappush(active, (end, event_id))
+        return conflicts
+
+    def plan_auto_assignment(self, since=None):
+        """
+        Propose une assignation des événements non assignés (commençant après
+        `since`) aux membres du SUPPORT, sans chevauchement et en équilibrant
+        la durée réservée de chacun (GESTION uniquement). Rien n'est modifié.
+
+        Glouton par date de début : chaque événement va au support le moins
+        chargé qui est libre, via un tas (charge, support). Un support est
+        libre si ses nouveaux événements finissent avant le début (ils sont
+        traités dans l'ordre) et si aucun de ses événements existants ne
+        chevauche : recherche dichotomique dans ses événements triés par début,
+        avec le maximum des fins de chaque préfixe.
+        """
+        check_is_gestion(self.current_user)
+        supports = dict(self.db.execute(
+            select(User.id, User.full_name).where(User.role == Role.SUPPORT).order_by(User.id)
+        ).all())
+
+        query = (
+            select(Event.id, Event.event_date_start, Event.event_date_end)
+            .where(Event.support_contact_id == None)
+            .order_by(Event.event_date_start, Event.id)
+        )
+        if since is not None:
+            query = query.where(Event.event_date_start >= since)
+        events = self.db.execute(query).all()
+        if not events or not supports:
+            return AssignmentPlan([], [event.id for event in events], supports,
+                                  {support_id: timedelta(0) for support_id in supports})
+
+        # Événements déjà assignés qui peuvent chevaucher la période à planifier
+        starts, max_ends = defaultdict(list), defaultdict(list)
+        loads = {support_id: timedelta(0) for support_id in supports}
+        existing = self.db.execute(
+            select(Event.support_contact_id, Event.event_date_start, Event.event_date_end)
+            .where(Event.support_contact_id.in_(list(supports)),
+                   Event.event_date_end > events[0].event_date_start)
+            .order_by(Event.support_contact_id, Event.event_date_start)
+        )
+        for support_id, start, end in existing:
+            ends = max_ends[support_id]
+            starts[support_id].append(start)
+            ends.append(max(end, ends[-1]) if ends else end)
+            loads[support_id] += end - start
+
+        # Fin du dernier événement assigné par ce plan, par support
+        busy_until = {}
+
+        def is_free(support_id, start, end):
+            until = busy_until.get(support_id)
+            if until is not None and until > start:
+                return False
+            # Événements existants commençant avant `end` : l'un finit-il après `start` ?
+            position = bisect_left(starts[support_id], end)
+            return position == 0 or max_ends[support_id][position - 1] <= start
+
+        heap = [(load, support_id) for support_id, load in loads.items()]
+        heapq.heapify(heap)
+        assignments, unassigned = [], []
+        for event_id, start, end in events:
+            busy = []
+            while heap and not is_free(heap[0][1], start, end):
+                busy.append(heapq.heappop(heap))
+            if heap:
+                load, support_id = heapq.heappop(heap)
+                assignments.append(Assignment(event_id, support_id, start, end))
+                busy_until[support_id] = end
+                loads[support_id] = load + (end - start)
+                heapq.heappush(heap, (loads[support_id], support_id))
+            else:
+                unassigned.append(event_id)
+            for entry in busy:
+                heapq.heappush(heap, entry)
+
+        return AssignmentPlan(assignments, unassigned, supports, loads)
+
+    def apply_auto_assignment(self, plan):
+        """
+        Applique un plan en une transaction : un UPDATE par lot, limité aux
+        événements encore non assignés. Si l'un d'eux a été assigné entre-temps,
+        rien n'est appliqué (ValueError) : recalculer le plan.
+        """
+        check_is_gestion(self.current_user)
+        if not plan.assignments:
+            return 0
+
+        table = Event.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("event_id"), table.c.support_contact_id == None)
+            .values(support_contact_id=bindparam("support_id"), version_id=table.c.version_id + 1)
+        )
+        rows = [
+            {"event_id": assignment.event_id, "support_id": assignment.support_contact_id}
+            for assignment in plan.assignments
+        ]
+        try:
+            if self.db.get_bind().dialect.supports_sane_multi_rowcount:
+                updated = self.db.execute(statement, rows).rowcount
+            else:
+                updated = sum(self.db.execute(statement, row).rowcount for row in rows)
+            if updated != len(rows):
+                raise ValueError(
+                    "Des événements ont été assignés entre-temps : recalculez le plan"
+                )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # L'UPDATE a contourné la session : expirer les événements déjà chargés
+        # (session longue du mode "run", sans expiration au commit)
+        for assignment in plan.assignments:
+            event = self.db.identity_map.get(identity_key(Event, assignment.event_id))
+            if event is not None:
+                self.db.expire(event)
+
+        log_event("events_auto_assigned", {
+            "assigned": len(rows),
+            "assigned_by": self.current_user.id
+        })
+        return len(rows)
+
     def get_event_by_id(self, event_id):
-        return self.db.query(Event).filter(
-            Event.id == event_id
-        ).first()
+        return self.db.get(Event, event_id)
@@ -0,0 +1,202 @@
+"""
+Rappels des événements à venir, envoyés aux membres du SUPPORT.
+
+Le rappel d'un événement est dû `lead` avant son début. Le planificateur ne
+garde en mémoire que les prochains rappels, dans un tas trié par échéance :
+
+- les événements assignés sont chargés par lots, dans l'ordre de l'index sur
+  la date de début, seulement quand le tas ne suffit plus à connaître le
+  prochain rappel ;
+- les modifications (assignation, déplacement) sont relues par une requête
+  "modifiés depuis" sur l'index de updated_at ;
+- les entrées périmées restent dans le tas et sont écartées à leur sortie
+  (leur version n'est plus celle de l'événement).
+"""
+import heapq
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, and_, or_
+
+from src.models.client import Client
+from src.models.event import Event
+from src.models.user import User
+from src.permissions.decorators import check_is_gestion
+from src.utils.logger import log_error
+
+Reminder = namedtuple("Reminder", [
+    "event_id", "version_id", "due_at", "event_date_start", "event_date_end",
+    "location", "client_name", "support_contact_id", "support_name", "support_email"
+])
+
+DEFAULT_LEAD = timedelta(hours=24)
+DEFAULT_RESYNC_INTERVAL = timedelta(seconds=60)
+LOAD_BATCH_SIZE = 500
+# Relecture des dernières modifications : une transaction validée après une
+# autre peut porter un updated_at antérieur
+RESYNC_OVERLAP = timedelta(seconds=30)
+RETRY_DELAY = timedelta(minutes=5)
+
+
+class ReminderController:
+
+    def __init__(self, db, current_user, sink, lead=DEFAULT_LEAD,
+                 resync_interval=DEFAULT_RESYNC_INTERVAL, batch_size=LOAD_BATCH_SIZE,
+                 catch_up=timedelta(0), clock=datetime.now):
+        check_is_gestion(current_user)
+        self.db = db
+        self.sink = sink
+        self.lead = lead
+        self.resync_interval = resync_interval
+        self.batch_size = batch_size
+        self.clock = clock
+
+        now = clock()
+        self._heap = []         # (échéance, id de l'événement, version)
+        self._pending = {}      # id -> Reminder en attente, à la version courante
+        self._sent = {}         # id -> (début, support) du rappel envoyé
+        # Événements chargés : tous ceux dont (début, id) <= curseur. Les
+        # rappels dus plus de `catch_up` avant le lancement ne sont envoyés
+        # que si l'événement est modifié ensuite.
+        self._cursor = (now - catch_up + lead, 0)
+        self._exhausted = False
+        self._changed_since = now
+        self.stats = {"loaded": 0, "changed": 0, "sent": 0, "skipped": 0, "failed": 0}
+
+    def _query(self):
+        return (
+            select(Event.id, Event.version_id, Event.event_date_start, Event.event_date_end,
+                   Event.location, Client.full_name, Event.support_contact_id,
+                   User.full_name, User.email, Event.updated_at)
+            .join(Client, Event.client_id == Client.id)
+            .outerjoin(User, Event.support_contact_id == User.id)
+        )
+
+    def _schedule(self, row, now):
+        """Met en attente le rappel d'un événement lu, ou retire celui qui n'a plus lieu d'être."""
+        event_id, version_id, start, end, location, client_name, support_id, support_name, email, _ = row
+        if support_id is None or start <= now or self._sent.get(event_id) == (start, support_id):
+            self._pending.pop(event_id, None)
+            return
+        current = self._pending.get(event_id)
+        if current is not None and current.version_id == version_id:
+            return
+        reminder = Reminder(event_id, version_id, start - self.lead, start, end,
+                            location, client_name, support_id, support_name, email)
+        self._pending[event_id] = reminder
+        heapq.heappush(self._heap, (reminder.due_at, event_id, version_id))
+
+    def _load_batch(self, now):
+        """Charge le lot suivant d'événements assignés, après le curseur (début, id)."""
+        start, event_id = self._cursor
+        query = self._query().where(
+            Event.support_contact_id != None,
+            Event.event_date_start >= start,
+            or_(Event.event_date_start > start,
+                and_(Event.event_date_start == start, Event.id > event_id))
+        ).order_by(Event.event_date_start, Event.id).limit(self.batch_size)
+        try:
+            rows = self.db.execute(query).all()
+        finally:
+            # Ne pas garder de transaction de lecture ouverte entre deux réveils
+            self.db.rollback()
+
+        for row in rows:
+            self._schedule(row, now)
+        self.stats["loaded"] += len(rows)
+        if rows:
+            self._cursor = (rows[-1][2], rows[-1][0])
+        self._exhausted = len(rows) < self.batch_size
+
+    def _fill(self, now):
+        """
+        Charge des lots jusqu'à ce que le premier rappel du tas précède tous
+        ceux des événements non chargés (qui commencent après le curseur).
+        """
+        while not self._exhausted and (
+                not self._heap or self._heap[0][0] >= self._cursor[0] - self.lead):
+            self._load_batch(now)
+
+    def resync(self, now=None):
+        """Relit les événements modifiés depuis la dernière resynchronisation."""
+        now = now or self.clock()
+        query = (
+            self._query()
+            .where(Event.updated_at >= self._changed_since - RESYNC_OVERLAP)
+            .order_by(Event.updated_at)
+        )
+        try:
+            rows = self.db.execute(query).all()
+        finally:
+            self.db.rollback()
+
+        for row in rows:
+            if (row[2], row[0]) <= self._cursor:
+                self._schedule(row, now)
+            else:
+                # Hors de la plage chargée : le prochain lot le lira
+                self._pending.pop(row[0], None)
+                self._exhausted = False
+            self._changed_since = max(self._changed_since, row[-1])
+        self.stats["changed"] += len(rows)
+
+        # Les événements commencés ne peuvent plus recevoir de rappel
+        self._sent = {
+            event_id: sent for event_id, sent in self._sent.items() if sent[0] > now
+        }
+        return len(rows)
+
+    def send_due(self, now=None):
+        """Envoie les rappels échus ; retourne le nombre d'envois."""
+        now = now or self.clock()
+        sent = 0
+        while True:
+            self._fill(now)
+            if not self._heap or self._heap[0][0] > now:
+                return sent
+
+            _, event_id, version_id = heapq.heappop(self._heap)
+            reminder = self._pending.get(event_id)
+            if reminder is None or reminder.version_id != version_id:
+                continue
+            del self._pending[event_id]
+            if reminder.event_date_start <= now:
+                self.stats["skipped"] += 1
+                continue
+
+            try:
+                self.sink.send(reminder)
+            except Exception as e:
+                log_error(e, {"event_id": event_id, "reminder": "send"})
+                self.stats["failed"] += 1
+                retry = reminder._replace(due_at=now + RETRY_DELAY)
+                self._pending[event_id] = retry
+                heapq.heappush(self._heap, (retry.due_at, event_id, version_id))
+                continue
+
+            self._sent[event_id] = (reminder.event_date_start, reminder.support_contact_id)
+            self.stats["sent"] += 1
+            sent += 1
+
+    def next_due(self):
+        """Échéance du prochain rappel en mémoire (None si aucun)."""
+        return self._heap[0][0] if self._heap else None
+
+    def run(self, sleep=time.sleep, should_stop=lambda: False):
+        """
+        Boucle du worker : resynchronise toutes les `resync_interval`, envoie
+        les rappels échus puis dort jusqu'à la prochaine échéance.
+        """
+        next_resync = self.clock()
+        while not should_stop():
+            now = self.clock()
+            if now >= next_resync:
+                self.resync(now)
+                next_resync = now + self.resync_interval
+            self.send_due(now)
+
+            wake = min(next_resync, self.next_due() or next_resync)
+            delay = (wake - self.clock()).total_seconds()
+            if delay > 0:
+                sleep(delay)
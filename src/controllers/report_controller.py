@@ -0,0 +1,98 @@
+from sqlalchemy import select, func, case, literal
+
+from src.models.user import User
+from src.models.client import Client
+from src.models.contract import Contract
+from src.permissions.decorators import check_is_gestion
+
+
+def month_bucket(column, dialect_name):
+    """Expression SQL "AAAA-MM" d'une date, selon le SGBD."""
+    if dialect_name == "postgresql":
+        return func.to_char(func.date_trunc("month", column), "YYYY-MM")
+    if dialect_name in ("mysql", "mariadb"):
+        return func.date_format(column, "%Y-%m")
+    return func.strftime("%Y-%m", column)
+
+
+def sum_if(condition, amount):
+    """Somme conditionnelle (0 si aucune ligne ne correspond)."""
+    return func.coalesce(func.sum(case((condition, amount), else_=literal(0))), 0)
+
+
+def count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class ReportController:
+    """
+    Rapports agrégés par la base (GROUP BY) : une requête par rapport,
+    des lignes légères (Row) plutôt que des objets Contract.
+    """
+
+    def __init__(self, db, current_user=None):
+        self.db = db
+        self.current_user = current_user
+
+    def _month(self, column):
+        return month_bucket(column, self.db.get_bind().dialect.name)
+
+    def get_pipeline_by_commercial(self):
+        """Contrats signés / non signés (nombre et montant) par commercial."""
+        check_is_gestion(self.current_user)
+        signed = Contract.is_signed == True
+        query = (
+            select(
+                User.id.label("commercial_id"),
+                User.full_name.label("commercial_name"),
+                func.count(Contract.id).label("contracts"),
+                count_if(signed).label("signed_contracts"),
+                sum_if(signed, Contract.total_amount).label("signed_amount"),
+                sum_if(~signed, Contract.total_amount).label("unsigned_amount"),
+            )
+            .join(Contract, Contract.commercial_contact_id == User.id)
+            .group_by(User.id, User.full_name)
+            .order_by(User.full_name)
+        )
+        return self.db.execute(query).all()
+
+    def get_receivables_by_client(self):
+        """Montant restant dû par client (contrats non soldés), du plus élevé au plus faible."""
+        check_is_gestion(self.current_user)
+        remaining = func.sum(Contract.remaining_amount)
+        query = (
+            select(
+                Client.id.label("client_id"),
+                Client.full_name.label("client_name"),
+                Client.commercial_contact_id.label("commercial_id"),
+                func.count(Contract.id).label("unpaid_contracts"),
+                remaining.label("remaining_amount"),
+            )
+            .join(Contract, Contract.client_id == Client.id)
+            .where(Contract.remaining_amount > 0)
+            .group_by(Client.id, Client.full_name, Client.commercial_contact_id)
+            .order_by(remaining.desc(), Client.id)
+        )
+        return self.db.execute(query).all()
+
+    def get_monthly_bookings(self, since=None, until=None):
+        """Contrats créés par mois (AAAA-MM) : nombre, montants total et signé."""
+        check_is_gestion(self.current_user)
+        month = self._month(Contract.created_at)
+        signed = Contract.is_signed == True
+        query = (
+            select(
+                month.label("month"),
+                func.count(Contract.id).label("contracts"),
+                count_if(signed).label("signed_contracts"),
+                func.sum(Contract.total_amount).label("total_amount"),
+                sum_if(signed, Contract.total_amount).label("signed_amount"),
+            )
+            .group_by(month)
+            .order_by(month)
+        )
+        if since is not None:
+            query = query.where(Contract.created_at >= since)
+        if until is not None:
+            query = query.where(Contract.created_at < until)
+        return self.db.execute(query).all()
@@ -0,0 +1,79 @@
+import re
+
+from sqlalchemy import select, func, literal_column, table, column
+from sqlalchemy.orm import joinedload
+
+from src.models.client import Client
+from src.models.event import Event
+from src.models.search import ensure_search_index
+from src.permissions.decorators import check_is_authenticated, check_is_gestion
+from src.utils.logger import log_event
+from src.utils.pagination import Page, DEFAULT_PAGE_SIZE
+
+
+def search_terms(text):
+    """Mots de la recherche ; chacun est cherché comme préfixe."""
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        raise ValueError("Recherche vide")
+    return terms
+
+
+class SearchController:
+    """Recherche plein texte classée (FTS5 sous SQLite, tsvector sous PostgreSQL)."""
+
+    def __init__(self, db, current_user=None):
+        self.db = db
+        self.current_user = current_user
+
+    def _search(self, query, model, text, offset, page_size):
+        terms = search_terms(text)
+        name = model.__tablename__
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect == "sqlite":
+            fts = table(f"{name}_fts", column("rowid"), column("rank"))
+            # Tous les mots, en préfixe : "dup"* "acme"*
+            match = " ".join(f'"{term}"*' for term in terms)
+            query = (
+                query.join(fts, fts.c.rowid == model.id)
+                .where(literal_column(f"{name}_fts").op("MATCH")(match))
+                .order_by(fts.c.rank, model.id)
+            )
+        elif dialect == "postgresql":
+            vector = literal_column(f"{name}.search_vector")
+            tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+            query = (
+                query.where(vector.op("@@")(tsquery))
+                .order_by(func.ts_rank(vector, tsquery).desc(), model.id)
+            )
+        else:
+            raise ValueError(f"Recherche non disponible pour {dialect}")
+
+        offset = offset or 0
+        items = self.db.scalars(query.offset(offset).limit(page_size + 1)).unique().all()
+        has_next = len(items) > page_size
+        return Page(items[:page_size], offset + page_size if has_next else None, has_next)
+
+    def search_clients(self, text, offset=None, page_size=DEFAULT_PAGE_SIZE):
+        """Clients dont le nom, l'email ou la société contient les mots cherchés."""
+        check_is_authenticated(self.current_user)
+        return self._search(select(Client), Client, text, offset, page_size)
+
+    def search_events(self, text, offset=None, page_size=DEFAULT_PAGE_SIZE):
+        """Événements dont le lieu ou les notes contiennent les mots cherchés."""
+        check_is_authenticated(self.current_user)
+        query = select(Event).options(
+            joinedload(Event.client),
+            joinedload(Event.support_contact)
+        )
+        return self._search(query, Event, text, offset, page_size)
+
+    def rebuild_index(self):
+        """Crée et reconstruit les index de recherche (GESTION uniquement)."""
+        check_is_gestion(self.current_user)
+        if not ensure_search_index(self.db.connection()):
+            raise ValueError("Recherche non disponible pour ce SGBD")
+        self.db.commit()
+
+        log_event("search_index_rebuilt", {"rebuilt_by": self.current_user.id})
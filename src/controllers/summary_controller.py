@@ -0,0 +1,92 @@
+from sqlalchemy import select, func, case, delete, insert
+
+from src.models.contract import Contract
+from src.models.summary import ClientSummary, CommercialSummary
+from src.permissions.decorators import check_is_authenticated, check_is_gestion
+from src.utils.logger import log_event
+
+# Résumé -> colonne de Contract qui sert de clé
+SUMMARY_KEYS = (
+    (ClientSummary, Contract.client_id),
+    (CommercialSummary, Contract.commercial_contact_id),
+)
+
+
+class SummaryController:
+    """Lecture, reconstruction et vérification des totaux par client et par commercial."""
+
+    def __init__(self, db, current_user=None):
+        self.db = db
+        self.current_user = current_user
+
+    def get_client_summary(self, client_id):
+        """Totaux des contrats d'un client (None s'il n'a aucun contrat)."""
+        check_is_authenticated(self.current_user)
+        return self.db.get(ClientSummary, client_id)
+
+    def get_commercial_summary(self, commercial_id):
+        """Totaux des contrats d'un commercial (None s'il n'a aucun contrat)."""
+        check_is_authenticated(self.current_user)
+        return self.db.get(CommercialSummary, commercial_id)
+
+    def _totals_query(self, key):
+        """Totaux recalculés depuis la table des contrats."""
+        return select(
+            key,
+            func.count(Contract.id),
+            func.coalesce(func.sum(case((Contract.is_signed == True, 1), else_=0)), 0),
+            func.coalesce(func.sum(Contract.total_amount), 0),
+            func.coalesce(func.sum(Contract.remaining_amount), 0),
+        ).group_by(key)
+
+    def rebuild(self):
+        """Recalcule entièrement les résumés (GESTION uniquement)."""
+        check_is_gestion(self.current_user)
+        counts = {}
+        for model, key in SUMMARY_KEYS:
+            table = model.__table__
+            self.db.execute(delete(table))
+            result = self.db.execute(
+                insert(table).from_select(
+                    [table.primary_key.columns.values()[0].name, "contract_count",
+                     "signed_count", "total_amount", "remaining_amount"],
+                    self._totals_query(key)
+                )
+            )
+            counts[table.name] = result.rowcount
+        self.db.commit()
+
+        log_event("summaries_rebuilt", {"rebuilt_by": self.current_user.id, **counts})
+        return counts
+
+    def check(self):
+        """
+        Compare les résumés aux totaux recalculés (GESTION uniquement).
+        Retourne la liste des écarts : (table, clé, attendu, enregistré).
+        """
+        check_is_gestion(self.current_user)
+        mismatches = []
+        for model, key in SUMMARY_KEYS:
+            table = model.__table__
+            key_column = table.primary_key.columns.values()[0]
+            expected = {
+                row[0]: self._normalize(row[1:])
+                for row in self.db.execute(self._totals_query(key))
+            }
+            stored = {
+                row[0]: self._normalize(row[1:])
+                for row in self.db.execute(select(
+                    key_column, table.c.contract_count, table.c.signed_count,
+                    table.c.total_amount, table.c.remaining_amount
+                ))
+            }
+            empty = self._normalize((0, 0, 0, 0))
+            for id_ in sorted(expected.keys() | stored.keys()):
+                if expected.get(id_, empty) != stored.get(id_, empty):
+                    mismatches.append((table.name, id_, expected.get(id_), stored.get(id_)))
+        return mismatches
+
+    @staticmethod
+    def _normalize(values):
+        count, signed, total, remaining = values
+        return (int(count), int(signed), round(float(total), 2), round(float(remaining), 2))
@@ -1,5 +1,10 @@
+import time
+from collections import Counter
+
+from sqlalchemy import insert, select
+
 from src.models.user import User, Role
-from src.utils.auth import hash_password
+from src.utils.auth import hash_password, hash_passwords
 from src.permissions.decorators import check_is_gestion
 from src.utils.logger import log_event, log_error
 
@@ -50,6 +55,69 @@ class UserController:
             log_error(e, {"action": "create_user", "email": email})
             raise
 
+    def bulk_create_users(self, rows, workers=None, batch_size=500):
+        """
+        Crée plusieurs utilisateurs en une transaction (GESTION uniquement).
+        `rows` : dictionnaires full_name, email, password, role.
+        Les mots de passe sont hachés en parallèle, les insertions faites par lots.
+        """
+        check_is_gestion(self.current_user)
+        rows = list(rows)
+        emails = [row["email"] for row in rows]
+
+        try:
+            duplicates = sorted(email for email, count in Counter(emails).items() if count > 1)
+            if duplicates:
+                raise ValueError(f"Emails en double dans l'import : {', '.join(duplicates)}")
+            for row in rows:
+                if row["role"].upper() not in Role.__members__:
+                    raise ValueError(f"Rôle invalide pour {row['email']} : {row['role']}")
+
+            # Une seule requête pour vérifier l'unicité de tous les emails
+            existing = self.db.scalars(select(User.email).where(User.email.in_(emails))).all()
+            if existing:
+                raise ValueError(f"Emails déjà utilisés : {', '.join(sorted(existing))}")
+
+            started = time.perf_counter()
+            hashes = hash_passwords([row["password"] for row in rows], workers)
+            hash_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            user_ids = []
+            for start in range(0, len(rows), batch_size):
+                batch = [
+                    {
+                        "full_name": row["full_name"],
+                        "email": row["email"],
+                        "password_hash": password_hash,
+                        "role": Role[row["role"].upper()],
+                    }
+                    for row, password_hash in zip(rows[start:start + batch_size],
+                                                  hashes[start:start + batch_size])
+                ]
+                user_ids += self.db.scalars(
+                    insert(User).returning(User.id, sort_by_parameter_order=True), batch
+                ).all()
+            self.db.commit()
+            insert_seconds = time.perf_counter() - started
+        except Exception as e:
+            self.db.rollback()
+            log_error(e, {"action": "bulk_create_users", "count": len(rows)})
+            raise
+
+        for user_id, row in zip(user_ids, rows):
+            log_event("user_created", {
+                "user_id": user_id,
+                "created_by": self.current_user.id,
+                "role": row["role"].lower()
+            })
+
+        return {
+            "user_ids": user_ids,
+            "hash_seconds": hash_seconds,
+            "insert_seconds": insert_seconds,
+        }
+
     def get_user_by_id(self, user_id):
         """Retourne un utilisateur par son ID."""
-        return self.db.query(User).filter(User.id == user_id).first()
+        return self.db.get(User, user_id)
@@ -1,13 +1,17 @@
 """Configuration de la base de données."""
 import os
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from datetime import datetime
+from sqlalchemy import create_engine, event, inspect, text, update
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from sqlalchemy.orm.exc import StaleDataError
+from src.exceptions import ConcurrentModificationError
+from src.database.pool_metrics import MeteredQueuePool, pool_metrics
+from src.utils.env import load_env
 
 
 # Charger les variables d'environnement
-load_dotenv()
+load_env()
 
 # Base pour les modèles
 Base = declarative_base()
@@ -15,20 +19,230 @@ Base = declarative_base()
 # URL de la base de données
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///epic_events.db")
 
+# Profil de réglage du moteur ("default" ou "production")
+DB_PROFILE = os.getenv("DB_PROFILE", "default")
+
+# PRAGMA SQLite appliqués à chaque connexion, par profil
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,     # 256 Mo
+        "cache_size": -65536,       # valeur négative = en Kio, soit 64 Mo
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,       # en millisecondes
+    },
+}
+
+
+def get_sqlite_pragmas(profile):
+    """
+    Retourne les PRAGMA du profil, surchargés par les variables
+    d'environnement SQLITE_<PRAGMA> (ex. SQLITE_MMAP_SIZE=0).
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Profil de base de données inconnu : {profile}")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in SQLITE_PROFILES["production"]:
+        value = os.getenv(f"SQLITE_{name.upper()}")
+        if value:
+            pragmas[name] = value
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Applique les PRAGMA à chaque nouvelle connexion du pool."""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def get_pool_options():
+    """
+    Options du pool pour les bases serveur (PostgreSQL, MySQL), lues dans
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+    et DB_POOL_TIMEOUT.
+    """
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+
+
+def create_db_engine(url=DATABASE_URL, profile=DB_PROFILE, metrics=None):
+    """Crée le moteur de base de données selon le profil demandé."""
+    is_sqlite = url.startswith("sqlite")
+
+    if is_sqlite:
+        options = {"connect_args": {"check_same_thread": False}}
+    else:
+        options = get_pool_options()
+
+    db_engine = create_engine(url, echo=False, **options)
+
+    if is_sqlite:
+        pragmas = get_sqlite_pragmas(profile)
+        if pragmas:
+            apply_sqlite_pragmas(db_engine, pragmas)
+
+    if metrics is not None:
+        metrics.attach(db_engine)
+
+    return db_engine
+
+
 # Créer le moteur de base de données
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = create_db_engine(metrics=pool_metrics)
+
+def partial_index_where(clause):
+    """
+    Options d'un index partiel pour le dialecte du moteur courant.
+
+    Les options sont limitées au dialecte utilisé : déclarer aussi
+    postgresql_where importerait le dialecte PostgreSQL à chaque démarrage.
+    Les dialectes sans index partiel (MySQL) obtiennent un index complet.
+    """
+    if engine.dialect.name in ("sqlite", "postgresql"):
+        return {f"{engine.dialect.name}_where": clause}
+    return {}
+
 
 # Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+class BatchSession(Session):
+    """
+    Session d'un script : les commit des contrôleurs se limitent à un flush,
+    le script entier est validé ou annulé en une seule transaction.
+    """
+
+    def commit(self):
+        self.flush()
+
+    def commit_batch(self):
+        super().commit()
+
+
+def check_version(entity, expected_version, label):
+    """Refuse une modification préparée à partir d'une version périmée."""
+    if expected_version is not None and entity.version_id != expected_version:
+        raise ConcurrentModificationError(label, entity.id, entity.version_id)
+
+
+def commit_or_conflict(db, label, entity_id):
+    """
+    Valide la transaction ; un UPDATE qui ne trouve plus la version lue
+    (StaleDataError) devient une ConcurrentModificationError.
+    """
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise ConcurrentModificationError(label, entity_id)
+
+
+# Mode de session de l'application interactive : "action" (une session par
+# action du menu) ou "run" (une session pour toute l'exécution)
+SESSION_MODE = os.getenv("DB_SESSION_MODE", "action")
+
+
+def expire_written_on_commit(session_factory):
+    """
+    Après chaque commit, n'expire que les objets insérés, modifiés ou
+    supprimés pendant la transaction ; les objets seulement lus restent
+    chargés dans l'identity map.
+    """
+
+    @event.listens_for(session_factory, "after_flush")
+    def track_written(session, flush_context):
+        written = session.info.setdefault("written", set())
+        written.update(session.new, session.dirty, session.deleted)
+
+    @event.listens_for(session_factory, "after_commit")
+    def expire_written(session):
+        for obj in session.info.pop("written", ()):
+            if obj in session:
+                session.expire(obj)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def forget_written(session):
+        session.info.pop("written", None)
+
+
+def create_run_session(bind):
+    """Crée la session longue (scoped) utilisée en mode "run"."""
+    factory = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=bind
+    )
+    expire_written_on_commit(factory)
+    return scoped_session(factory)
+
+
+RunSession = create_run_session(engine)
+
+
+# Colonnes ajoutées à des tables existantes (create_all ne modifie pas une
+# table déjà créée) : (table, colonne, définition SQL, valeur des lignes
+# existantes quand la définition ne peut pas la donner, ou None)
+ADDED_COLUMNS = [
+    ("clients", "version_id", "INTEGER NOT NULL DEFAULT 1", None),
+    ("contracts", "version_id", "INTEGER NOT NULL DEFAULT 1", None),
+    ("events", "version_id", "INTEGER NOT NULL DEFAULT 1", None),
+    # SQLite refuse un DEFAULT non constant en ALTER TABLE ; heure locale
+    # comme datetime.now des modèles
+    ("events", "updated_at", "DATETIME", datetime.now),
+]
+
+
+def upgrade_db(bind):
+    """
+    Met à niveau une base créée par une version précédente : tables,
+    colonnes (ADDED_COLUMNS) et index manquants. Sans effet sur une base à
+    jour ; retourne la liste des éléments ajoutés.
+    """
+    Base.metadata.create_all(bind=bind)
+    added = []
+    with bind.begin() as connection:
+        existing = {
+            table: {column["name"] for column in inspect(connection).get_columns(table)}
+            for table in {table for table, _, _, _ in ADDED_COLUMNS}
+        }
+        for table, column, definition, backfill in ADDED_COLUMNS:
+            if column not in existing[table]:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+                if backfill is not None:
+                    connection.execute(
+                        update(Base.metadata.tables[table]).values({column: backfill()})
+                    )
+                added.append(f"{table}.{column}")
+
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+                    added.append(index.name)
+    return added
+
 
 def init_db():
-    """Initialise la base de données (crée les tables)."""
-    Base.metadata.create_all(bind=engine)
+    """Initialise la base de données, ou met à niveau une base existante."""
+    for name in upgrade_db(engine):
+        print(f"Ajouté : {name}")
     print("Base de données initialisée avec succès !")
 
 
@@ -0,0 +1,95 @@
+"""Compteurs d'activité du pool de connexions."""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Compteurs thread-safe alimentés par les événements du pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Remet tous les compteurs à zéro."""
+        with self._lock:
+            self.checked_out = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.closes = 0
+            self.invalidations = 0
+            self.waits = 0
+            self.wait_time = 0.0
+
+    def _increment(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def record_wait(self, duration):
+        """Enregistre une attente de connexion sur un pool saturé."""
+        self._increment(waits=1, wait_time=duration)
+
+    def snapshot(self):
+        """Retourne une copie des compteurs."""
+        with self._lock:
+            return {
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "waits": self.waits,
+                "wait_time_ms": round(self.wait_time * 1000, 3),
+            }
+
+    def attach(self, engine):
+        """Branche les compteurs sur les événements du pool de `engine`."""
+        event.listen(engine, "connect", lambda *args: self._increment(connects=1))
+        event.listen(engine, "close", lambda *args: self._increment(closes=1))
+        event.listen(engine, "close_detached", lambda *args: self._increment(closes=1))
+        event.listen(engine, "invalidate", lambda *args: self._increment(invalidations=1))
+        event.listen(
+            engine, "checkout",
+            lambda *args: self._increment(checked_out=1, checkouts=1)
+        )
+        event.listen(
+            engine, "checkin",
+            lambda *args: self._increment(checked_out=-1, checkins=1)
+        )
+
+        if isinstance(engine.pool, MeteredQueuePool):
+            engine.pool.metrics = self
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool qui mesure le temps d'attente quand toutes les connexions sont prises."""
+
+    metrics = None
+
+    def _do_get(self):
+        saturated = (
+            self._max_overflow > -1
+            and self.checkedout() >= self.size() + self._max_overflow
+        )
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if saturated and self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() recrée le pool : conserver les compteurs
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+# Compteurs du moteur principal de l'application
+pool_metrics = PoolMetrics()
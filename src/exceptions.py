@@ -0,0 +1,50 @@
+"""Exceptions métier partagées par les contrôleurs, les vues et la CLI."""
+
+
+class ConcurrentModificationError(ValueError):
+    """
+    L'enregistrement a été modifié par quelqu'un d'autre depuis sa lecture
+    (verrouillage optimiste, colonne version_id).
+    """
+
+    def __init__(self, label, entity_id, current_version=None):
+        self.label = label
+        self.entity_id = entity_id
+        self.current_version = current_version
+        message = f"{label} {entity_id} a été modifié entre-temps par un autre utilisateur"
+        if current_version is not None:
+            message += f" (version actuelle : {current_version})"
+        super().__init__(message + ". Rechargez-le puis recommencez.")
+
+
+class DuplicateClientError(ValueError):
+    """
+    Le client à créer ressemble à des clients existants.
+    `candidates` : liste de (score, client), du plus proche au moins proche.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = candidates
+        listed = ", ".join(
+            f"{client.full_name} <{client.email}> (id {client.id}, {score:.0%})"
+            for score, client in candidates
+        )
+        super().__init__(f"Doublon possible : {listed}. Confirmez pour créer quand même.")
+
+
+class EventConflictError(ValueError):
+    """
+    Le membre du SUPPORT est déjà assigné à des événements qui chevauchent
+    celui-ci. `conflicts` : ces événements, triés par date de début.
+    """
+
+    def __init__(self, support_user, conflicts):
+        self.support_user = support_user
+        self.conflicts = conflicts
+        listed = ", ".join(
+            f"{event.id} ({event.event_date_start:%d/%m/%Y %H:%M} - {event.event_date_end:%d/%m/%Y %H:%M})"
+            for event in conflicts
+        )
+        super().__init__(
+            f"{support_user.full_name} est déjà assigné(e) sur la même période : {listed}."
+        )
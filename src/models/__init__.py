@@ -1,4 +1,8 @@
 from .user import User
 from .contract import Contract  
 from .event import Event 
-from .client import Client  
\ No newline at end of file
+from .client import Client
+from .payment import Payment
+from .summary import ClientSummary, CommercialSummary
+from .client_trigram import ClientTrigram
+from . import search
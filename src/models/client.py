@@ -11,19 +11,23 @@ class Client(Base):
 
     id = Column(Integer, primary_key=True)
     full_name = Column(String(255), nullable=False)
-    email = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
     phone = Column(String(30))
     company_name = Column(String(255))
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now)
+    # Verrouillage optimiste : incrémenté à chaque UPDATE
+    version_id = Column(Integer, nullable=False, default=1)
     
     # Clé étrangère vers l'utilisateur (commercial)
-    commercial_contact_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    commercial_contact_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Relations
     commercial_contact = relationship("User", back_populates="clients_as_commercial")
     contracts = relationship("Contract", back_populates="client", cascade="all, delete-orphan")
     events = relationship("Event", back_populates="client")
+
+    __mapper_args__ = {"version_id_col": version_id}
     
     def to_dict(self):
         return {
@@ -33,5 +37,6 @@ class Client(Base):
             "phone": self.phone,
             "company_name": self.company_name,
             "created_at": self.created_at,
-            "updated_at": self.updated_at
+            "updated_at": self.updated_at,
+            "version_id": self.version_id
         }
@@ -0,0 +1,137 @@
+"""
+Index des trigrammes des clients, pour la détection des doublons.
+
+Le nom, la société et la partie locale de l'email sont normalisés (minuscules,
+sans accents ni ponctuation : "ACME SA" et "Acme S.A." donnent "acme sa"), puis
+découpés en trigrammes mot par mot. Chaque trigramme est préfixé par son champ
+("n" nom, "c" société, "e" email) et stocké dans client_trigrams, tenue à jour
+à chaque flush.
+"""
+import re
+import unicodedata
+
+from sqlalchemy import Column, Integer, String, ForeignKey, event, inspect
+from sqlalchemy.orm import Session
+
+from src.database.config import Base
+from src.models.client import Client
+
+# Champ -> préfixe des trigrammes et poids dans le score de similarité
+FIELDS = {"full_name": "n", "company_name": "c", "email": "e"}
+WEIGHTS = {"n": 0.5, "e": 0.3, "c": 0.2}
+
+
+class ClientTrigram(Base):
+    """Un trigramme d'un champ d'un client."""
+
+    __tablename__ = "client_trigrams"
+    # Clé primaire groupée (trigramme, client) : une recherche lit une plage contiguë
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    gram = Column(String(4), primary_key=True)
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"),
+                       primary_key=True, index=True)
+
+
+def normalize(text):
+    """Minuscules, sans accents ; la ponctuation est supprimée sans séparer les mots."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    return " ".join(re.sub(r"[^\w\s]|_", "", text).split())
+
+
+def trigrams(text):
+    """Trigrammes des mots de `text` (déjà normalisé), bordés d'espaces."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def client_fields(full_name, email, company_name):
+    """Champs normalisés d'un client, par préfixe (les champs vides sont omis)."""
+    values = {"n": full_name, "c": company_name, "e": (email or "").split("@")[0]}
+    normalized = {tag: normalize(value) for tag, value in values.items()}
+    return {tag: value for tag, value in normalized.items() if value}
+
+
+def profile(full_name, email, company_name):
+    """Email en minuscules et trigrammes de chaque champ renseigné, pour similarity."""
+    return (
+        (email or "").strip().lower(),
+        {tag: trigrams(value) for tag, value in client_fields(full_name, email, company_name).items()}
+    )
+
+
+def client_grams(full_name, email, company_name):
+    """Trigrammes préfixés d'un client."""
+    return {
+        tag + gram
+        for tag, grams in profile(full_name, email, company_name)[1].items()
+        for gram in grams
+    }
+
+
+def similarity(a, b):
+    """
+    Score entre 0 et 1 de deux profils (voir profile) : moyenne pondérée de
+    l'indice de Jaccard des trigrammes de chaque champ renseigné des deux
+    côtés ; 1 si les emails sont identiques.
+    """
+    if a[0] and a[0] == b[0]:
+        return 1.0
+    score = weight = 0.0
+    for tag in a[1].keys() & b[1].keys():
+        grams_a, grams_b = a[1][tag], b[1][tag]
+        shared = len(grams_a & grams_b)
+        score += WEIGHTS[tag] * shared / (len(grams_a) + len(grams_b) - shared)
+        weight += WEIGHTS[tag]
+    return score / weight if weight else 0.0
+
+
+def index_clients(connection, clients):
+    """Indexe des clients donnés par (id, full_name, email, company_name)."""
+    rows = [
+        {"gram": gram, "client_id": client_id}
+        for client_id, full_name, email, company_name in clients
+        for gram in client_grams(full_name, email, company_name)
+    ]
+    if rows:
+        connection.execute(ClientTrigram.__table__.insert(), rows)
+
+
+def unindex_clients(connection, client_ids):
+    if client_ids:
+        table = ClientTrigram.__table__
+        connection.execute(table.delete().where(table.c.client_id.in_(client_ids)))
+
+
+@event.listens_for(Session, "after_flush")
+def update_client_trigrams(session, flush_context):
+    """
+    Répercute les clients ajoutés, modifiés (nom, email, société) ou supprimés
+    par ce flush. Les INSERT groupés (import) appellent index_clients eux-mêmes.
+    """
+    added, removed = [], []
+    for client in session.new:
+        if isinstance(client, Client):
+            added.append(client)
+    for client in session.dirty:
+        if isinstance(client, Client):
+            state = inspect(client)
+            if any(state.attrs[name].history.has_changes() for name in FIELDS):
+                removed.append(client.id)
+                added.append(client)
+    for client in session.deleted:
+        if isinstance(client, Client):
+            removed.append(inspect(client).identity[0])
+
+    connection = session.connection() if added or removed else None
+    if removed:
+        unindex_clients(connection, removed)
+    if added:
+        index_clients(connection, [
+            (client.id, client.full_name, client.email, client.company_name)
+            for client in added
+        ])
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, Numeric, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from src.database.config import Base
+from src.database.config import Base, partial_index_where
 
 # Classe contrat
 class Contract(Base):
@@ -10,17 +10,29 @@ class Contract(Base):
     __tablename__ = "contracts"
 
     id = Column(Integer, primary_key=True)
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
-    commercial_contact_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)
+    commercial_contact_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     total_amount = Column(Numeric(10, 2), nullable=False)
     remaining_amount = Column(Numeric(10, 2), nullable=False)
     created_at = Column(DateTime, default=datetime.now)
     is_signed = Column(Boolean, default=False)
+    # Verrouillage optimiste : incrémenté à chaque UPDATE
+    version_id = Column(Integer, nullable=False, default=1)
+
+    # Index partiels : seuls les contrats non signés / non soldés y figurent,
+    # triés par ID pour servir aussi la pagination des listes filtrées
+    __table_args__ = (
+        Index("ix_contracts_unsigned", "id", **partial_index_where(is_signed == False)),
+        Index("ix_contracts_unpaid", "id", **partial_index_where(remaining_amount > 0)),
+    )
 
     # Relations 
     client = relationship("Client", back_populates="contracts")
     commercial_contact = relationship("User", back_populates="contracts_as_commercial")
     event = relationship("Event", back_populates="contract", uselist=False, cascade="all, delete-orphan")
+    payments = relationship("Payment", back_populates="contract", cascade="all, delete-orphan")
+
+    __mapper_args__ = {"version_id_col": version_id}
     
     def to_dict(self):
         return {
@@ -30,5 +42,6 @@ class Contract(Base):
             "total_amount": float(self.total_amount),
             "remaining_amount": float(self.remaining_amount),
             "created_at": self.created_at,
-            "is_signed": self.is_signed
+            "is_signed": self.is_signed,
+            "version_id": self.version_id
         }
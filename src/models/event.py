@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from src.database.config import Base
+from src.database.config import Base, partial_index_where
 
 # Classe Event
 class Event(Base):
@@ -13,17 +13,34 @@ class Event(Base):
     contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False, unique=True)
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
     support_contact_id = Column(Integer, ForeignKey("users.id"))
-    event_date_start = Column(DateTime, nullable=False)
+    event_date_start = Column(DateTime, nullable=False, index=True)
     event_date_end = Column(DateTime, nullable=False)
     location = Column(String(500), nullable=False)
     attendees = Column(Integer, nullable=False)
     notes = Column(Text)
+    # Mis à jour à chaque UPDATE, y compris en Core : resynchronisation des rappels
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, index=True)
+    # Verrouillage optimiste : incrémenté à chaque UPDATE
+    version_id = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        # Planning d'un support : ses événements triés par date
+        Index("ix_events_support_start", "support_contact_id", "event_date_start"),
+        # Agenda d'un client : ses événements triés par date
+        Index("ix_events_client_start", "client_id", "event_date_start"),
+        # Chevauchements d'un support : événements qui finissent après une date
+        Index("ix_events_support_end", "support_contact_id", "event_date_end"),
+        # Événements non assignés, triés par ID
+        Index("ix_events_unassigned", "id", **partial_index_where(support_contact_id == None)),
+    )
 
     # Relations 
     contract = relationship("Contract", back_populates="event")
     client = relationship("Client", back_populates="events")
     support_contact = relationship("User", back_populates="events_as_support")
 
+    __mapper_args__ = {"version_id_col": version_id}
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -34,5 +51,7 @@ class Event(Base):
             "event_date_end": self.event_date_end,
             "location": self.location,
             "attendees": self.attendees,
-            "notes": self.notes
+            "notes": self.notes,
+            "updated_at": self.updated_at,
+            "version_id": self.version_id
         }
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from src.database.config import Base
+
+# Classe paiement
+class Payment(Base):
+    """Modèle pour les paiements reçus sur un contrat."""
+
+    __tablename__ = "payments"
+
+    id = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False, index=True)
+    amount = Column(Numeric(10, 2), nullable=False)
+    recorded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+    # Relations
+    contract = relationship("Contract", back_populates="payments")
+    recorded_by = relationship("User")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "contract_id": self.contract_id,
+            "amount": float(self.amount),
+            "recorded_by_id": self.recorded_by_id,
+            "created_at": self.created_at
+        }
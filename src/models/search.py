@@ -0,0 +1,69 @@
+"""
+Index de recherche plein texte, créés avec les tables :
+- SQLite : tables FTS5 à contenu externe (clients_fts, events_fts) tenues à
+  jour par des triggers ;
+- PostgreSQL : colonne tsvector générée (search_vector) et index GIN.
+"""
+from sqlalchemy import DDL, event
+
+from src.models.client import Client
+from src.models.event import Event
+
+# Table -> colonnes indexées
+SEARCH_COLUMNS = {
+    "clients": ("full_name", "email", "company_name"),
+    "events": ("location", "notes"),
+}
+
+
+def sqlite_statements(table, columns):
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{name}" for name in columns)
+    old_values = ", ".join(f"old.{name}" for name in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    delete_old = (f"INSERT INTO {fts}({fts}, rowid, {names}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        # Seules les colonnes indexées déclenchent la mise à jour (pas version_id)
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def postgresql_statements(table, columns):
+    document = " || ' ' || ".join(f"coalesce({name}, '')" for name in columns)
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING GIN (search_vector)",
+    ]
+
+
+STATEMENTS = {"sqlite": sqlite_statements, "postgresql": postgresql_statements}
+
+for _model in (Client, Event):
+    _table = _model.__table__
+    for _dialect, _statements in STATEMENTS.items():
+        for _statement in _statements(_table.name, SEARCH_COLUMNS[_table.name]):
+            event.listen(_table, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+def ensure_search_index(connection):
+    """
+    Crée les index manquants (base créée avant la recherche) et les
+    reconstruit depuis les tables. Retourne False si le SGBD n'est pas géré.
+    """
+    dialect = connection.dialect.name
+    if dialect not in STATEMENTS:
+        return False
+    for table, columns in SEARCH_COLUMNS.items():
+        for statement in STATEMENTS[dialect](table, columns):
+            connection.exec_driver_sql(statement)
+        if dialect == "sqlite":
+            connection.exec_driver_sql(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+    return True
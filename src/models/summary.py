@@ -0,0 +1,150 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, event, inspect
+from sqlalchemy.orm import Session
+
+from src.database.config import Base
+from src.models.contract import Contract
+
+# Colonnes de Contract qui modifient les totaux
+TRACKED = ("client_id", "commercial_contact_id", "is_signed", "total_amount", "remaining_amount")
+
+
+class SummaryColumns:
+    contract_count = Column(Integer, nullable=False, default=0)
+    signed_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    remaining_amount = Column(Numeric(12, 2), nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "contract_count": self.contract_count,
+            "signed_count": self.signed_count,
+            "total_amount": float(self.total_amount),
+            "remaining_amount": float(self.remaining_amount)
+        }
+
+
+class ClientSummary(SummaryColumns, Base):
+    """Totaux des contrats d'un client, tenus à jour à chaque flush."""
+
+    __tablename__ = "client_summaries"
+
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True)
+
+
+class CommercialSummary(SummaryColumns, Base):
+    """Totaux des contrats d'un commercial, tenus à jour à chaque flush."""
+
+    __tablename__ = "commercial_summaries"
+
+    commercial_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+
+def new_deltas():
+    """Écarts à appliquer, par (modèle de résumé, clé)."""
+    return defaultdict(lambda: [0, 0, Decimal(0), Decimal(0)])
+
+
+def add_contract(deltas, values, sign=1):
+    """Ajoute (sign=1) ou retire (sign=-1) un contrat décrit par `values` (TRACKED)."""
+    client_id, commercial_id, is_signed, total, remaining = values
+    for key in ((ClientSummary, client_id), (CommercialSummary, commercial_id)):
+        delta = deltas[key]
+        delta[0] += sign
+        delta[1] += sign if is_signed else 0
+        delta[2] += sign * Decimal(str(total or 0))
+        delta[3] += sign * Decimal(str(remaining or 0))
+
+
+def add_payment(deltas, client_id, commercial_id, amount):
+    """Un paiement ne change que le montant restant."""
+    for key in ((ClientSummary, client_id), (CommercialSummary, commercial_id)):
+        deltas[key][3] -= Decimal(str(amount))
+
+
+def apply_deltas(connection, deltas):
+    """Applique les écarts : UPDATE relatif, ou INSERT si la ligne n'existe pas."""
+    for (model, key), (count, signed, total, remaining) in deltas.items():
+        if not (count or signed or total or remaining):
+            continue
+        table = model.__table__
+        key_column = table.primary_key.columns.values()[0]
+        result = connection.execute(
+            table.update()
+            .where(key_column == key)
+            .values(
+                contract_count=table.c.contract_count + count,
+                signed_count=table.c.signed_count + signed,
+                total_amount=table.c.total_amount + total,
+                remaining_amount=table.c.remaining_amount + remaining,
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values({
+                key_column.name: key,
+                "contract_count": count,
+                "signed_count": signed,
+                "total_amount": total,
+                "remaining_amount": remaining,
+            }))
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Charger l'ancienne valeur avant une modification, même si l'attribut
+# était expiré : l'écart à retirer des résumés en dépend
+for _name in TRACKED:
+    event.listen(getattr(Contract, _name), "set", _keep_previous_value,
+                 retval=True, active_history=True)
+
+
+@event.listens_for(Session, "before_flush")
+def load_deleted_contracts(session, flush_context, instances):
+    """Un contrat supprimé doit être chargé : après le flush, sa ligne n'existe plus."""
+    for contract in session.deleted:
+        if isinstance(contract, Contract):
+            for name in TRACKED:
+                getattr(contract, name)
+
+
+def _values(state, old=False):
+    """Valeurs suivies d'un contrat, avant (`old`) ou après le flush."""
+    values = []
+    for name in TRACKED:
+        history = state.attrs[name].history
+        if old and history.deleted:
+            values.append(history.deleted[0])
+        elif old or not history.added:
+            values.append((history.unchanged or history.deleted or [None])[0])
+        else:
+            values.append(history.added[0])
+    return values
+
+
+@event.listens_for(Session, "after_flush")
+def update_summaries(session, flush_context):
+    """
+    Répercute les contrats ajoutés, modifiés ou supprimés par ce flush sur
+    les résumés, dans la même transaction. Les UPDATE/INSERT groupés
+    (session.execute(update(Contract)...)) ne passent pas par ici : ils
+    doivent appliquer leurs écarts avec apply_deltas.
+    """
+    deltas = new_deltas()
+    for contract in session.new:
+        if isinstance(contract, Contract):
+            add_contract(deltas, [getattr(contract, name) for name in TRACKED])
+    for contract in session.deleted:
+        if isinstance(contract, Contract):
+            add_contract(deltas, _values(inspect(contract), old=True), -1)
+    for contract in session.dirty:
+        if isinstance(contract, Contract):
+            state = inspect(contract)
+            if any(state.attrs[name].history.has_changes() for name in TRACKED):
+                add_contract(deltas, _values(state, old=True), -1)
+                add_contract(deltas, _values(state))
+    if deltas:
+        apply_deltas(session.connection(), deltas)
@@ -0,0 +1,288 @@
+"""
+Journal d'audit local, en ajout seul.
+
+Chaque segment `audit-NNNNNNNN.log` contient des enregistrements binaires :
+
+    en-tête (26 octets) : longueur du corps, CRC32, horodatage (ms),
+                          id de l'utilisateur (-1 si aucun), longueur du nom
+    corps               : nom de l'événement (UTF-8) + données en JSON
+
+Un enregistrement est écrit en un seul appel write() ; une fin de segment
+tronquée (arrêt brutal) est détectée par le CRC et coupée à la réouverture.
+
+À côté de chaque segment, un index creux `audit-NNNNNNNN.idx` associe un
+horodatage à une position tous les AUDIT_INDEX_INTERVAL octets : une requête
+`--since` saute les segments trop anciens puis se positionne directement
+dans le segment par recherche dichotomique, sans relire le début du fichier.
+"""
+import bisect
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+
+from src.utils.env import load_env
+
+try:
+    import fcntl
+except ImportError:  # Windows : un seul processus écrivain
+    fcntl = None
+
+load_env()
+
+AUDIT_DIR = os.getenv("AUDIT_DIR", "audit_log")
+AUDIT_SEGMENT_BYTES = int(os.getenv("AUDIT_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+AUDIT_INDEX_INTERVAL = int(os.getenv("AUDIT_INDEX_INTERVAL", str(64 * 1024)))
+AUDIT_FSYNC = os.getenv("AUDIT_FSYNC", "false").lower() in ("1", "true", "yes")
+
+# Clés des données qui désignent l'auteur de l'action
+ACTOR_KEYS = ("created_by", "updated_by", "signed_by", "assigned_by", "recorded_by", "user_id")
+
+HEADER = struct.Struct(">IIqqH")
+INDEX_ENTRY = struct.Struct(">qQ")
+SEGMENT_PATTERN = re.compile(r"^audit-(\d{8})\.log$")
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_actor(data):
+    """Retourne l'id de l'auteur de l'action, ou None."""
+    for key in ACTOR_KEYS:
+        value = (data or {}).get(key)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def encode_record(event_name, data, ts_ms, user_id):
+    """Construit un enregistrement (en-tête + corps)."""
+    name = event_name.encode("utf-8")
+    body = name + json.dumps(data or {}, default=str, ensure_ascii=False).encode("utf-8")
+    user = -1 if user_id is None else user_id
+    # Le CRC couvre l'horodatage, l'utilisateur et le corps
+    crc = zlib.crc32(struct.pack(">qqH", ts_ms, user, len(name)) + body)
+    return HEADER.pack(len(body), crc, ts_ms, user, len(name)) + body
+
+
+def read_record(f):
+    """
+    Lit l'enregistrement suivant de `f`.
+    Retourne (ts_ms, user_id, nom, données) ou None en fin de segment
+    (ou sur un enregistrement tronqué ou corrompu).
+    """
+    header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    length, crc, ts_ms, user, name_len = HEADER.unpack(header)
+    body = f.read(length)
+    if len(body) < length or zlib.crc32(header[8:] + body) != crc:
+        return None
+    name = body[:name_len].decode("utf-8")
+    data = json.loads(body[name_len:].decode("utf-8"))
+    return ts_ms, (None if user < 0 else user), name, data
+
+
+class AuditJournal:
+    """Écriture et lecture d'un répertoire de segments d'audit."""
+
+    def __init__(self, directory, segment_bytes=AUDIT_SEGMENT_BYTES,
+                 index_interval=AUDIT_INDEX_INTERVAL, fsync=AUDIT_FSYNC):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.index_interval = index_interval
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._fd = None
+        self._index_fd = None
+        self._sequence = None
+        self._last_indexed = 0
+
+    # ---------- Écriture ----------
+
+    def _path(self, sequence, ext):
+        return os.path.join(self.directory, f"audit-{sequence:08d}.{ext}")
+
+    def segments(self):
+        """Numéros des segments existants, du plus ancien au plus récent."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            int(match.group(1))
+            for match in map(SEGMENT_PATTERN.match, os.listdir(self.directory))
+            if match
+        )
+
+    def _open(self, sequence):
+        self._close_files()
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+        self._fd = os.open(self._path(sequence, "log"), flags, 0o644)
+        self._index_fd = os.open(self._path(sequence, "idx"), flags, 0o644)
+        self._sequence = sequence
+        index = self.read_index(sequence)
+        self._last_indexed = index[-1][1] if index else -1
+
+    def _recover(self, sequence):
+        """
+        Coupe la fin tronquée du dernier segment et les entrées d'index en
+        trop, sous le verrou des écrivains : un enregistrement en cours
+        d'écriture par un autre processus n'est pas pris pour une fin tronquée.
+        """
+        fd = os.open(self._path(sequence, "log"), os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            index = self.read_index(sequence)
+            with os.fdopen(fd, "rb", closefd=False) as f:
+                valid = index[-1][1] if index else 0
+                f.seek(valid)
+                while read_record(f) is not None:
+                    valid = f.tell()
+            if os.fstat(fd).st_size > valid:
+                os.ftruncate(fd, valid)
+            kept = [entry for entry in index if entry[1] < valid]
+            if len(kept) < len(index):
+                with open(self._path(sequence, "idx"), "wb") as f:
+                    f.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in kept))
+        finally:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _ensure_open(self):
+        if self._fd is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        existing = self.segments()
+        sequence = existing[-1] if existing else 1
+        if existing:
+            self._recover(sequence)
+        self._open(sequence)
+
+    def append(self, event_name, data=None, ts=None):
+        """Ajoute un événement au journal."""
+        ts_ms = int((time.time() if ts is None else ts) * 1000)
+        record = encode_record(event_name, data, ts_ms, get_actor(data))
+
+        with self._lock:
+            self._ensure_open()
+            if fcntl:
+                # Plusieurs processus (CLI, application) peuvent écrire en même temps
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                offset = os.fstat(self._fd).st_size
+                if offset and offset + len(record) > self.segment_bytes:
+                    self._open(self._sequence + 1)
+                    if fcntl:
+                        fcntl.flock(self._fd, fcntl.LOCK_EX)
+                    offset = os.fstat(self._fd).st_size
+
+                os.write(self._fd, record)
+                if self._last_indexed < 0 or offset - self._last_indexed >= self.index_interval:
+                    os.write(self._index_fd, INDEX_ENTRY.pack(ts_ms, offset))
+                    self._last_indexed = offset
+                if self.fsync:
+                    os.fsync(self._fd)
+            finally:
+                if fcntl:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _close_files(self):
+        for fd in (self._fd, self._index_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._index_fd = None
+
+    def close(self):
+        with self._lock:
+            self._close_files()
+
+    # ---------- Lecture ----------
+
+    def read_index(self, sequence):
+        """Entrées (horodatage ms, position) de l'index d'un segment."""
+        try:
+            with open(self._path(sequence, "idx"), "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+        usable = len(raw) - len(raw) % INDEX_ENTRY.size
+        return [entry for entry in INDEX_ENTRY.iter_unpack(raw[:usable])]
+
+    def _start_offset(self, index, since_ms):
+        """Position de la dernière entrée d'index strictement antérieure à `since_ms`."""
+        if since_ms is None or not index:
+            return 0
+        position = bisect.bisect_left([ts for ts, _ in index], since_ms)
+        return index[position - 1][1] if position else 0
+
+    def query(self, since=None, until=None, event=None, user_id=None):
+        """
+        Parcourt les événements correspondant aux filtres, du plus ancien au
+        plus récent. `since` et `until` sont des datetime (ou None).
+        """
+        since_ms = None if since is None else int(since.timestamp() * 1000)
+        until_ms = None if until is None else int(until.timestamp() * 1000)
+        event_bytes = None if event is None else event.encode("utf-8")
+
+        sequences = self.segments()
+        indexes = {sequence: self.read_index(sequence) for sequence in sequences}
+        for position, sequence in enumerate(sequences):
+            index = indexes[sequence]
+            # Segment entièrement antérieur à `since` : le suivant commence avant
+            if since_ms is not None and position + 1 < len(sequences):
+                next_index = indexes[sequences[position + 1]]
+                if next_index and next_index[0][0] < since_ms:
+                    continue
+            # Segment entièrement postérieur à `until`
+            if until_ms is not None and index and index[0][0] > until_ms:
+                break
+
+            yield from self._scan(sequence, self._start_offset(index, since_ms),
+                                  since_ms, until_ms, event_bytes, user_id)
+
+    def _scan(self, sequence, offset, since_ms, until_ms, event_bytes, user_id):
+        with open(self._path(sequence, "log"), "rb") as f:
+            f.seek(offset)
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    return
+                length, _, ts_ms, user, name_len = HEADER.unpack(header)
+                # Filtres sur l'en-tête : le corps est sauté sans être lu
+                if ((since_ms is not None and ts_ms < since_ms)
+                        or (until_ms is not None and ts_ms > until_ms)
+                        or (user_id is not None and user != user_id)
+                        or (event_bytes is not None and name_len != len(event_bytes))):
+                    f.seek(length, os.SEEK_CUR)
+                    continue
+
+                f.seek(-HEADER.size, os.SEEK_CUR)
+                record = read_record(f)
+                if record is None:
+                    return
+                ts_ms, user, name, data = record
+                if event_bytes is not None and name != event_bytes.decode("utf-8"):
+                    continue
+                yield {"ts": ts_ms / 1000, "event": name, "user_id": user, "data": data}
+
+
+def get_journal():
+    """Retourne le journal d'audit (None si AUDIT_DIR est vide)."""
+    global _journal
+    if not AUDIT_DIR:
+        return None
+    with _journal_lock:
+        if _journal is None:
+            _journal = AuditJournal(AUDIT_DIR)
+    return _journal
+
+
+def record_event(event_name, data=None):
+    """Ajoute un événement métier au journal d'audit."""
+    journal = get_journal()
+    if journal:
+        journal.append(event_name, data)
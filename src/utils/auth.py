@@ -1,40 +1,106 @@
 
 import os
-import bcrypt
-import jwt
 from datetime import datetime, timedelta, timezone
-from dotenv import load_dotenv
+from src.utils.env import load_env
 
-load_dotenv()
+load_env()
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 8
 
+# Coût bcrypt (2^rounds itérations) : voir la commande calibrate-bcrypt
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Fichier pour stocker le token de session (partagé par le menu et la CLI)
+TOKEN_FILE = ".current_token"
+
 
 def hash_password(password: str) -> str:
     """
     Hash un mot de passe avec bcrypt.
     """
-    salt = bcrypt.gensalt()
+    import bcrypt
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def hash_passwords(passwords, workers=None):
+    """
+    Hash une liste de mots de passe sur un pool de processus
+    (un par cœur par défaut) ; l'ordre est conservé.
+    """
+    passwords = list(passwords)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < 2:
+        return [hash_password(password) for password in passwords]
+
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(workers, len(passwords))
+    # Des lots de quelques mots de passe limitent les allers-retours entre processus
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hash_password, passwords, chunksize=chunksize))
+
+
 def verify_password(password: str, hashed_password: str) -> bool:
     """
     Vérifie un mot de passe contre son hash.
     """
+    import bcrypt
     return bcrypt.checkpw(
         password.encode('utf-8'),
         hashed_password.encode('utf-8')
     )
 
 
+def get_hash_rounds(hashed_password: str) -> int:
+    """
+    Retourne le coût d'un hash bcrypt ("$2b$12$..." -> 12).
+    """
+    return int(hashed_password.split("$")[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Indique si un hash a été calculé avec un autre coût que BCRYPT_ROUNDS.
+    """
+    return get_hash_rounds(hashed_password) != BCRYPT_ROUNDS
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> tuple:
+    """
+    Mesure bcrypt sur cette machine et retourne (rounds, durée en ms) :
+    le coût le plus élevé dont le hachage reste sous `target_ms`
+    (jamais moins que `min_rounds`).
+    """
+    import time
+    import bcrypt
+    rounds, elapsed_ms = min_rounds, None
+    for candidate in range(min_rounds, max_rounds + 1):
+        salt = bcrypt.gensalt(rounds=candidate)
+        # Meilleure de deux mesures pour écarter un pic de charge
+        durations = []
+        for _ in range(2):
+            started = time.perf_counter()
+            bcrypt.hashpw(b"calibration", salt)
+            durations.append((time.perf_counter() - started) * 1000)
+        duration = min(durations)
+        if duration > target_ms and candidate > min_rounds:
+            break
+        rounds, elapsed_ms = candidate, duration
+        # Chaque coût supplémentaire double la durée : inutile de mesurer plus loin
+        if duration * 2 > target_ms:
+            break
+    return rounds, elapsed_ms
+
+
 def create_access_token(user_id: int, role: str) -> str:
     """
     Crée un token JWT pour un utilisateur.
     """
+    import jwt
     now = datetime.now(timezone.utc)
     
     payload = {
@@ -51,6 +117,7 @@ def decode_access_token(token: str) -> dict:
     """
     Décode et vérifie un token JWT.
     """
+    import jwt
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         return payload
@@ -0,0 +1,11 @@
+"""Chargement unique du fichier .env."""
+_loaded = False
+
+
+def load_env():
+    """Charge le fichier .env une seule fois par processus."""
+    global _loaded
+    if not _loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _loaded = True
@@ -0,0 +1,66 @@
+"""Écriture en flux des exports (CSV, JSON Lines, éventuellement gzip)."""
+import csv
+import gzip
+import io
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def format_value(value):
+    """Valeur exportable : dates ISO 8601, montants exacts (Decimal -> texte)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+@contextmanager
+def open_output(path, compress=False):
+    """
+    Ouvre la sortie texte d'un export ("-" : sortie standard, laissée ouverte).
+    `compress` ou une extension .gz active la compression gzip.
+    """
+    compress = compress or path.endswith(".gz")
+    raw = sys.stdout.buffer if path == "-" else open(path, "wb")
+    # GzipFile n'écrit que la fin de flux à la fermeture, sans fermer `raw`
+    compressed = gzip.GzipFile(fileobj=raw, mode="wb") if compress else None
+    text = io.TextIOWrapper(compressed or raw, encoding="utf-8", newline="")
+    try:
+        yield text
+    finally:
+        text.flush()
+        text.detach()
+        if compressed:
+            compressed.close()
+        if path == "-":
+            raw.flush()
+        else:
+            raw.close()
+
+
+def write_rows(query, output, fmt="csv", batch_size=EXPORT_BATCH_SIZE):
+    """
+    Écrit les lignes d'une requête de colonnes, lues par lots de `batch_size`
+    (yield_per : curseur côté serveur quand le SGBD le permet).
+    Retourne le nombre de lignes écrites.
+    """
+    columns = [column["name"] for column in query.column_descriptions]
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(output)
+        writer.writerow(columns)
+        for row in query.yield_per(batch_size):
+            writer.writerow([format_value(value) for value in row])
+            count += 1
+    else:
+        for row in query.yield_per(batch_size):
+            record = {name: format_value(value) for name, value in zip(columns, row)}
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
@@ -1,20 +1,242 @@
+import atexit
 import os
-import sentry_sdk
-from dotenv import load_dotenv
+import queue
+import random
+import threading
+import time
+from src.utils import audit
+from src.utils.env import load_env
 
-load_dotenv()
+load_env()
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
+# Réglages de l'envoi asynchrone vers Sentry
+SENTRY_QUEUE_SIZE = int(os.getenv("SENTRY_QUEUE_SIZE", "1000"))
+SENTRY_BATCH_SIZE = int(os.getenv("SENTRY_BATCH_SIZE", "50"))
+SENTRY_FLUSH_TIMEOUT = float(os.getenv("SENTRY_FLUSH_TIMEOUT", "2"))
 
-def init_sentry():
-    """Initialise Sentry."""
-    if SENTRY_DSN:
+_sentry_initialized = False
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def parse_rates(value):
+    """Convertit "login_success=0.1,login_failed=5" en dictionnaire."""
+    rates = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def _get_sentry():
+    """
+    Importe et initialise Sentry au premier usage.
+    Retourne None si aucun DSN n'est configuré.
+    """
+    global _sentry_initialized
+    if not SENTRY_DSN:
+        return None
+
+    import sentry_sdk
+    if not _sentry_initialized:
         sentry_sdk.init(
             dsn=SENTRY_DSN,
             traces_sample_rate=0.0,
             profiles_sample_rate=0.0,
         )
+        _sentry_initialized = True
+    return sentry_sdk
+
+
+class SentryDispatcher:
+    """
+    Envoie les événements depuis un thread de fond.
+
+    Les appelants ne font qu'un échantillonnage, une limitation de débit par
+    nom d'événement et un put_nowait dans une file bornée : un événement qui
+    ne passe pas est compté puis abandonné, jamais attendu.
+    """
+
+    _STOP = object()
+
+    def __init__(self, send, max_queue=1000, batch_size=50,
+                 sample_rates=None, rate_limits=None):
+        self._send = send
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._sample_rates = sample_rates or {}
+        # Limites en événements par seconde, par nom d'événement
+        self._rate_limits = rate_limits or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {
+            "sent": 0,
+            "batches": 0,
+            "dropped_queue_full": 0,
+            "dropped_sampled": 0,
+            "dropped_rate_limited": 0,
+            "send_errors": 0,
+        }
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="sentry-dispatcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _allow(self, name):
+        """
+        Limitation par seau à jetons (capacité d'une seconde de débit, au
+        moins un jeton : un débit inférieur à 1/s laisse passer un événement
+        toutes les 1/rate secondes).
+        """
+        rate = self._rate_limits.get(name)
+        if rate is None:
+            return True
+
+        capacity = max(rate, 1)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(name, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens < 1:
+                self._buckets[name] = (tokens, now)
+                return False
+            self._buckets[name] = (tokens - 1, now)
+            return True
+
+    def submit(self, kind, name, payload, data):
+        """Met en file un événement ; retourne False s'il est abandonné."""
+        if random.random() >= self._sample_rates.get(name, 1.0):
+            self._count("dropped_sampled")
+            return False
+        if not self._allow(name):
+            self._count("dropped_rate_limited")
+            return False
+        try:
+            self._queue.put_nowait((kind, payload, data))
+        except queue.Full:
+            self._count("dropped_queue_full")
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            markers = []
+            # Regrouper ce qui est déjà en file, dans la limite d'un lot
+            while True:
+                # Marqueurs : demande de flush (Event) ou d'arrêt
+                if item is self._STOP or isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._send(batch)
+                    with self._lock:
+                        self.stats["sent"] += len(batch)
+                        self.stats["batches"] += 1
+                except Exception:
+                    self._count("send_errors")
+
+            for marker in markers:
+                if isinstance(marker, threading.Event):
+                    marker.set()
+            if self._STOP in markers:
+                return
+
+    def flush(self, timeout=SENTRY_FLUSH_TIMEOUT):
+        """Attend l'envoi de tout ce qui est en file (au plus `timeout` s)."""
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=SENTRY_FLUSH_TIMEOUT):
+        """Vide la file puis arrête le thread."""
+        self.flush(timeout)
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+
+def send_to_sentry(batch):
+    """Envoie un lot ; chaque événement a son propre scope (pas de scope global)."""
+    sentry_sdk = _get_sentry()
+    for kind, payload, data in batch:
+        with sentry_sdk.push_scope() as scope:
+            if kind == "message":
+                if data:
+                    scope.set_context("event_data", data)
+                sentry_sdk.capture_message(payload, level="info")
+            else:
+                if data:
+                    scope.set_context("error_context", data)
+                sentry_sdk.capture_exception(payload)
+
+
+def _flush_at_exit():
+    if _dispatcher is not None:
+        _dispatcher.close()
+    if _sentry_initialized:
+        import sentry_sdk
+        sentry_sdk.flush(timeout=SENTRY_FLUSH_TIMEOUT)
+
+
+def get_dispatcher():
+    """Retourne le dispatcher, créé au premier événement (None sans DSN)."""
+    global _dispatcher
+    if not SENTRY_DSN:
+        return None
+
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = SentryDispatcher(
+                send_to_sentry,
+                max_queue=SENTRY_QUEUE_SIZE,
+                batch_size=SENTRY_BATCH_SIZE,
+                sample_rates=parse_rates(os.getenv("SENTRY_SAMPLE_RATES")),
+                rate_limits=parse_rates(os.getenv("SENTRY_RATE_LIMITS")),
+            ).start()
+            atexit.register(_flush_at_exit)
+    return _dispatcher
+
+
+def get_dispatch_stats():
+    """Compteurs d'envoi (None si aucun événement n'a encore été journalisé)."""
+    if _dispatcher is None:
+        return None
+    return dict(_dispatcher.stats)
+
+
+def init_sentry():
+    """Initialise Sentry."""
+    if _get_sentry():
         print("✓ Sentry activé pour la journalisation")
     else:
         print("⚠ Sentry DSN non configuré - journalisation désactivée")
@@ -22,21 +244,24 @@ def init_sentry():
 
 def log_event(event_name, data=None):
     """
-    Journalise un événement métier.
+    Journalise un événement métier : écriture immédiate dans le journal
+    d'audit local, puis envoi en arrière-plan vers Sentry.
     """
-    if SENTRY_DSN:
-        with sentry_sdk.configure_scope() as scope:
-            if data:
-                scope.set_context("event_data", data)
-            sentry_sdk.capture_message(event_name, level="info")
+    try:
+        audit.record_event(event_name, data)
+    except OSError as e:
+        # L'action est déjà enregistrée en base : ne pas la faire échouer
+        log_error(e, {"audit_event": event_name})
+
+    dispatcher = get_dispatcher()
+    if dispatcher:
+        dispatcher.submit("message", event_name, event_name, data)
 
 
 def log_error(error, context=None):
     """
-    Journalise une erreur.
+    Journalise une erreur (envoi en arrière-plan).
     """
-    if SENTRY_DSN:
-        with sentry_sdk.configure_scope() as scope:
-            if context:
-                scope.set_context("error_context", context)
-            sentry_sdk.capture_exception(error)
\ No newline at end of file
+    dispatcher = get_dispatcher()
+    if dispatcher:
+        dispatcher.submit("exception", f"error:{type(error).__name__}", error, context)
@@ -0,0 +1,30 @@
+"""Pagination par curseur (keyset) des requêtes de liste."""
+from collections import namedtuple
+
+DEFAULT_PAGE_SIZE = 20
+
+# Une page de résultats et le curseur permettant d'obtenir la suivante
+Page = namedtuple("Page", ["items", "next_cursor", "has_next"])
+
+
+def paginate(query, column, after=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Retourne une page de `query` triée par `column`, après le curseur `after`.
+
+    La colonne doit être unique (typiquement la clé primaire) : la page est
+    obtenue par `WHERE column > :after ORDER BY column LIMIT n`, sans OFFSET,
+    le coût reste donc constant quelle que soit la position dans la table.
+    """
+    if page_size < 1:
+        raise ValueError("La taille de page doit être >= 1")
+
+    if after is not None:
+        query = query.filter(column > after)
+
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    rows = query.order_by(column).limit(page_size + 1).all()
+    has_next = len(rows) > page_size
+    items = rows[:page_size]
+    next_cursor = getattr(items[-1], column.key) if has_next else None
+
+    return Page(items, next_cursor, has_next)
@@ -0,0 +1,80 @@
+"""
+Destinations des rappels d'événements.
+
+Une destination est un objet avec une méthode send(reminder) ; make_sink
+construit celle décrite par REMINDER_SINK :
+
+    stdout                  affichage sur la sortie standard
+    file:CHEMIN             une ligne JSON par rappel, en ajout
+    smtp://HÔTE:PORT        un email par rappel (serveur SMTP local de test,
+                            ex. python -m aiosmtpd -n -l localhost:1025)
+"""
+import json
+import smtplib
+from email.message import EmailMessage
+from urllib.parse import urlsplit
+
+
+def format_reminder(reminder):
+    """Objet et corps du message d'un rappel."""
+    subject = (f"Rappel : événement {reminder.event_id} le "
+               f"{reminder.event_date_start:%d/%m/%Y à %H:%M}")
+    body = (f"Bonjour {reminder.support_name},\n\n"
+            f"Événement {reminder.event_id} pour {reminder.client_name}\n"
+            f"Lieu : {reminder.location}\n"
+            f"Du {reminder.event_date_start:%d/%m/%Y %H:%M} "
+            f"au {reminder.event_date_end:%d/%m/%Y %H:%M}\n")
+    return subject, body
+
+
+class StdoutSink:
+
+    def send(self, reminder):
+        subject, body = format_reminder(reminder)
+        print(f"[{reminder.support_email}] {subject}")
+        print(body)
+
+
+class FileSink:
+    """Ajoute une ligne JSON par rappel ; le fichier est rouvert à chaque envoi."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, reminder):
+        line = json.dumps(reminder._asdict(), default=str, ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class SmtpSink:
+
+    def __init__(self, host="localhost", port=1025, sender="rappels@epicevents.local"):
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    def send(self, reminder):
+        subject, body = format_reminder(reminder)
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = reminder.support_email
+        message["Subject"] = subject
+        message.set_content(body)
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(message)
+
+
+def make_sink(spec, sender=None):
+    """Destination décrite par `spec` (voir le docstring du module)."""
+    if spec == "stdout":
+        return StdoutSink()
+    if spec.startswith("file:") and len(spec) > 5:
+        return FileSink(spec[5:])
+    if spec.startswith("smtp://"):
+        url = urlsplit(spec)
+        sink = SmtpSink(url.hostname or "localhost", url.port or 1025)
+        if sender:
+            sink.sender = sender
+        return sink
+    raise ValueError(f"Destination de rappels inconnue : {spec}")
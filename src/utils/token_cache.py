@@ -0,0 +1,92 @@
+"""Cache en mémoire des tokens déjà vérifiés."""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from src.utils.env import load_env
+
+load_env()
+
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "60"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+
+# Copie figée de l'utilisateur : utilisable hors de toute session
+UserSnapshot = namedtuple("UserSnapshot", ["id", "email", "full_name", "role"])
+
+
+def snapshot_user(user):
+    return UserSnapshot(user.id, user.email, user.full_name, user.role)
+
+
+def token_digest(token):
+    """Le token lui-même n'est jamais conservé, seulement son empreinte."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    Associe l'empreinte d'un token à un UserSnapshot pendant au plus `ttl`
+    secondes (et jamais au-delà de l'expiration du token).
+    Les plus anciennes entrées sont écartées au-delà de `max_size`.
+    """
+
+    def __init__(self, ttl=TOKEN_CACHE_TTL, max_size=TOKEN_CACHE_SIZE, clock=time.time):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.clear()
+
+    def get(self, token):
+        """Retourne le UserSnapshot en cache, ou None."""
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > self._clock():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, token, user, expires_at=None):
+        """Met en cache l'utilisateur d'un token vérifié (`expires_at` : timestamp)."""
+        if self.ttl <= 0:
+            return
+        deadline = self._clock() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (user, deadline)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        """Retire toutes les entrées d'un utilisateur (modifié ou supprimé)."""
+        with self._lock:
+            keys = [key for key, (user, _) in self._entries.items() if user.id == user_id]
+            for key in keys:
+                del self._entries[key]
+            self.stats["invalidations"] += len(keys)
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def snapshot(self):
+        """Retourne une copie des compteurs."""
+        with self._lock:
+            return dict(self.stats, size=len(self._entries))
+
+
+# Cache du processus
+token_cache = TokenCache()
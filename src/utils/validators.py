@@ -1,12 +1,12 @@
 """Utilitaires de validation des données."""
 import re
-from email_validator import validate_email, EmailNotValidError
 
 
 def validate_email_format(email: str) -> bool:
     """
     Valide le format d'un email.
     """
+    from email_validator import validate_email, EmailNotValidError
     try:
         validate_email(email, check_deliverability=False)
         return True
@@ -15,10 +15,21 @@ class BaseView:
     def display_error(message):
         print(message)
 
+    @staticmethod
+    def display_conflict(message):
+        print("Conflit de modification :", message)
+
     @staticmethod
     def display_info(message):
         print(message)
 
+    @staticmethod
+    def display_stats(title, stats):
+        BaseView.display_title(title)
+
+        for name, value in stats.items():
+            print(f"{name} : {value}")
+
     @staticmethod
     def display_separator():
         print("-" * 50)
@@ -42,6 +53,18 @@ class BaseView:
         response = input(message + " (o/n) : ").lower()
         return response in ["o", "oui"]
 
+    @staticmethod
+    def prompt_page_navigation(has_previous, has_next):
+        choices = []
+        if has_previous:
+            choices.append("p - Page précédente")
+        if has_next:
+            choices.append("s - Page suivante")
+        choices.append("q - Quitter la liste")
+
+        print(" | ".join(choices))
+        return input("Votre choix : ").strip().lower()
+
     @staticmethod
     def display_menu(title, options):
         BaseView.display_title(title)
@@ -55,6 +55,34 @@ class ClientView(BaseView):
 
         return full_name, email, phone, company_name
 
+    def display_duplicates(self, candidates, title="Doublons possibles"):
+        """Clients proches, sous forme de (score, client)."""
+        self.display_title(title)
+        print()
+        print("Score | ID | Nom | Entreprise | Email")
+        print("-" * 70)
+        for score, client in candidates:
+            print(f"{score:.0%} | {client.id} | {client.full_name} | "
+                  f"{client.company_name or '-'} | {client.email}")
+        print()
+
+    def display_duplicates_report(self, report):
+        """Paires de clients en double, sous forme de (score, client_a, client_b)."""
+        self.display_title("Rapport des doublons")
+
+        if not report:
+            print("Aucun doublon trouvé.")
+            return
+
+        print()
+        print("Score | Client A | Client B")
+        print("-" * 70)
+        for score, first, second in report:
+            print(f"{score:.0%} | {first.id} {first.full_name} <{first.email}> | "
+                  f"{second.id} {second.full_name} <{second.email}>")
+        print()
+        print("Total :", len(report), "paire(s)")
+
     def display_client_created(self, client):
         self.display_success("Client créé")
 
@@ -48,4 +48,10 @@ class ContractView(BaseView):
         print("Montant restant :", float(contract.remaining_amount), "€")
 
     def display_contract_signed(self, contract):
-        self.display_success(f"Contrat {contract.id} signé")
\ No newline at end of file
+        self.display_success(f"Contrat {contract.id} signé")
+
+    def display_payment_recorded(self, payment):
+        self.display_success(f"Paiement de {float(payment.amount):.2f}€ enregistré")
+
+        print("Contrat :", payment.contract_id)
+        print("Montant restant :", float(payment.contract.remaining_amount), "€")
@@ -1,6 +1,10 @@
-from datetime import datetime
+import calendar
+from collections import defaultdict
+from datetime import datetime, timedelta
 from src.views.base_view import BaseView
 
+DAY_NAMES = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
 
 class EventView(BaseView):
     """Vue pour la gestion des événements."""
@@ -71,5 +75,101 @@ class EventView(BaseView):
             f"Événement {event.id} assigné à {support.full_name}"
         )
 
+    def display_overlapping_events(self, support, events):
+        """Événements du support qui chevauchent celui à assigner."""
+        self.display_title(f"Déjà assigné(e) à {support.full_name}")
+        for event in events:
+            print(f"{event.id} | {event.event_date_start:%d/%m/%Y %H:%M} - "
+                  f"{event.event_date_end:%d/%m/%Y %H:%M} | {event.location}")
+        print()
+
+    def display_conflicts(self, conflicts):
+        """Chevauchements entre événements d'un même support."""
+        self.display_title("Conflits de planning")
+
+        if not conflicts:
+            print("Aucun conflit.")
+            return
+
+        print()
+        print("Support | Événements | Période commune")
+        print("-" * 70)
+        for conflict in conflicts:
+            print(f"{conflict.support_contact_id} | {conflict.first_event_id} / "
+                  f"{conflict.second_event_id} | {conflict.overlap_start:%d/%m/%Y %H:%M} - "
+                  f"{conflict.overlap_end:%d/%m/%Y %H:%M}")
+        print()
+        print("Total :", len(conflicts), "conflit(s)")
+
+    def display_assignment_plan(self, plan):
+        """Plan d'assignation automatique, avant application."""
+        self.display_title("Plan d'assignation automatique")
+
+        if plan.assignments:
+            print()
+            print("Événement | Date | Support")
+            print("-" * 70)
+            for assignment in plan.assignments:
+                print(f"{assignment.event_id} | {assignment.event_date_start:%d/%m/%Y %H:%M} - "
+                      f"{assignment.event_date_end:%H:%M} | "
+                      f"{plan.supports[assignment.support_contact_id]}")
+
+        print()
+        print("Charge par support (heures réservées) :")
+        for support_id, load in sorted(plan.loads.items(), key=lambda item: item[1]):
+            print(f"  {plan.supports[support_id]} : {load.total_seconds() / 3600:.1f}")
+
+        print()
+        print("À assigner :", len(plan.assignments), "événement(s)")
+        if plan.unassigned:
+            print("Sans support disponible :", ", ".join(str(event_id) for event_id in plan.unassigned))
+
+    def _display_agenda_line(self, event, day):
+        client_name = event.client.full_name if event.client else "-"
+        support_name = event.support_contact.full_name if event.support_contact else "Non assigné"
+        # Date complète pour un début ou une fin hors du jour affiché
+        start, end = (
+            f"{date:%H:%M}" if date.date() == day else f"{date:%d/%m %H:%M}"
+            for date in (event.event_date_start, event.event_date_end)
+        )
+        print(f"  {start}-{end} #{event.id} {event.location} | {client_name} | {support_name}")
+
+    def display_agenda(self, events, start, end, view="week"):
+        """
+        Agenda des événements (triés par début) de la période [start, end) :
+        jour par jour en vue "week", grille du mois puis jours occupés en vue
+        "month". Un événement déjà en cours est affiché au premier jour.
+        """
+        # Dernier jour touché par la période (fin exclue, pas forcément à minuit)
+        last_day = (end - timedelta(microseconds=1)).date()
+        self.display_title(f"Agenda du {start:%d/%m/%Y} au {last_day:%d/%m/%Y}")
+        by_day = defaultdict(list)
+        for event in events:
+            by_day[max(event.event_date_start, start).date()].append(event)
+
+        if view == "month":
+            print()
+            print("  ".join(name[:2] for name in DAY_NAMES))
+            for week in calendar.monthcalendar(start.year, start.month):
+                cells = []
+                for day in week:
+                    count = len(by_day.get(start.date().replace(day=day), ())) if day else 0
+                    cells.append(f"{day or '':>2}" + ("*" if count else " "))
+                print(" ".join(cells))
+            days = sorted(by_day)
+        else:
+            days = [start.date() + timedelta(days=offset)
+                    for offset in range((last_day - start.date()).days + 1)]
+
+        for day in days:
+            print(f"\n{DAY_NAMES[day.weekday()]} {day:%d/%m}")
+            for event in by_day.get(day, ()):
+                self._display_agenda_line(event, day)
+            if not by_day.get(day):
+                print("  -")
+
+        print()
+        print("Total :", len(events), "événement(s)")
+
     def display_event_updated(self):
         self.display_success("Événement mis à jour")
\ No newline at end of file
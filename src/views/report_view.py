@@ -0,0 +1,53 @@
+from src.views.base_view import BaseView
+
+
+class ReportView(BaseView):
+    """Vue des rapports de gestion."""
+
+    def display_pipeline(self, rows, title="Pipeline par commercial"):
+        self.display_title(title)
+
+        if not rows:
+            print("Aucun contrat trouvé.")
+            return
+
+        print()
+        print("Commercial | Contrats | Signés | Montant signé | Montant non signé")
+        print("-" * 70)
+
+        for row in rows:
+            print(f"{row.commercial_name} | {row.contracts} | {row.signed_contracts} | "
+                  f"{float(row.signed_amount):.2f}€ | {float(row.unsigned_amount):.2f}€")
+
+    def display_receivables(self, rows, title="Montants restant dus par client"):
+        self.display_title(title)
+
+        if not rows:
+            print("Aucun montant restant dû.")
+            return
+
+        print()
+        print("ID | Client | Contrats non soldés | Restant dû")
+        print("-" * 70)
+
+        for row in rows:
+            print(f"{row.client_id} | {row.client_name} | {row.unpaid_contracts} | "
+                  f"{float(row.remaining_amount):.2f}€")
+
+        print()
+        print(f"Total restant dû : {sum(float(row.remaining_amount) for row in rows):.2f}€")
+
+    def display_monthly_bookings(self, rows, title="Contrats par mois"):
+        self.display_title(title)
+
+        if not rows:
+            print("Aucun contrat trouvé.")
+            return
+
+        print()
+        print("Mois | Contrats | Signés | Montant total | Montant signé")
+        print("-" * 70)
+
+        for row in rows:
+            print(f"{row.month} | {row.contracts} | {row.signed_contracts} | "
+                  f"{float(row.total_amount):.2f}€ | {float(row.signed_amount):.2f}€")
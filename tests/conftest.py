@@ -1,8 +1,11 @@
+import os
+# Coût bcrypt minimal : les tests n'ont pas besoin d'un hachage lent
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 import src.models
 import pytest
-import os
 import sys
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -12,6 +15,27 @@ from src.models.user import User, Role
 from src.models.client import Client
 from src.utils.auth import hash_password
 from src.models.contract import Contract
+from src.utils import audit
+from src.utils.token_cache import token_cache
+
+
+@pytest.fixture(autouse=True)
+def audit_dir(tmp_path, monkeypatch):
+    """Redirige le journal d'audit vers un répertoire temporaire."""
+    directory = tmp_path / "audit"
+    monkeypatch.setattr(audit, "AUDIT_DIR", str(directory))
+    monkeypatch.setattr(audit, "_journal", None)
+    yield directory
+    if audit._journal is not None:
+        audit._journal.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Chaque test repart d'un cache de tokens vide (les ids sont réutilisés)."""
+    token_cache.clear()
+    yield
+    token_cache.clear()
 
 @pytest.fixture
 def db():
@@ -27,6 +51,47 @@ def db():
     session.close()
 
 
+class QueryCounter:
+    """Compte les requêtes SQL exécutées sur un moteur."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture
+def query_counter(db):
+    """Compteur de requêtes lié à la base de test."""
+    return QueryCounter(db.get_bind())
+
+
+def bump_version(db, model, entity_id):
+    """Simule la modification concurrente d'une autre session (hors ORM)."""
+    table = model.__table__
+    db.execute(table.update().where(table.c.id == entity_id)
+               .values(version_id=table.c.version_id + 1))
+
+
+def invoke(db, user, args):
+    """Exécute une commande de la CLI avec l'utilisateur donné sur la base de test."""
+    from click.testing import CliRunner
+    from src.cli import cli, CliContext
+    context = CliContext(bind=db.get_bind())
+    context.current_user = user
+    return CliRunner().invoke(cli, args, obj=context)
+
+
 @pytest.fixture
 def admin_user(db):
     """Crée un utilisateur admin."""
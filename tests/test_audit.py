@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import pytest
+from datetime import datetime
+from src.utils.audit import AuditJournal, encode_record, fcntl
+from src.controllers.contract_controller import ContractController
+from tests.conftest import invoke
+
+BASE_TS = datetime(2026, 1, 1).timestamp()
+
+
+def fill(journal, count, step=60):
+    """Ajoute `count` événements espacés de `step` secondes."""
+    for i in range(count):
+        name = "contract_signed" if i % 3 == 0 else "client_updated"
+        journal.append(name, {"contract_id": i, "signed_by": i % 5}, ts=BASE_TS + i * step)
+
+
+def test_query_filters(tmp_path):
+    """Test les filtres par date, événement et utilisateur."""
+    journal = AuditJournal(str(tmp_path))
+    fill(journal, 30)
+
+    since = datetime.fromtimestamp(BASE_TS + 10 * 60)
+    records = list(journal.query(since=since, event="contract_signed", user_id=2))
+
+    assert [r["data"]["contract_id"] for r in records] == [12, 27]
+    assert all(r["event"] == "contract_signed" and r["user_id"] == 2 for r in records)
+
+
+def test_segments_rotate_and_index_skips(tmp_path):
+    """Test la rotation des segments et la recherche via l'index creux."""
+    journal = AuditJournal(str(tmp_path), segment_bytes=2000, index_interval=300)
+    fill(journal, 200)
+    journal.close()
+
+    assert len(journal.segments()) > 5
+    since = datetime.fromtimestamp(BASE_TS + 190 * 60)
+    records = list(journal.query(since=since))
+    assert [r["data"]["contract_id"] for r in records] == list(range(190, 200))
+
+    # La lecture commence près de `since`, pas au début du segment
+    last = journal.segments()[-1]
+    index = journal.read_index(last)
+    assert len(index) > 1
+    assert journal._start_offset(index, int(since.timestamp() * 1000)) > 0
+
+
+def test_truncated_tail_is_recovered(tmp_path):
+    """Test qu'un enregistrement tronqué (arrêt brutal) est coupé à la réouverture."""
+    journal = AuditJournal(str(tmp_path))
+    fill(journal, 5)
+    journal.close()
+    segment = tmp_path / "audit-00000001.log"
+    with open(segment, "ab") as f:
+        f.write(b"\x00\x00\x01\x00partial")
+
+    assert len(list(journal.query())) == 5
+
+    reopened = AuditJournal(str(tmp_path))
+    reopened.append("client_created", {"created_by": 1})
+    reopened.close()
+    assert [r["event"] for r in reopened.query()][-2:] == ["client_updated", "client_created"]
+    assert len(list(reopened.query())) == 6
+
+
+@pytest.mark.skipif(fcntl is None, reason="verrou de fichier POSIX")
+def test_recovery_waits_for_concurrent_writer(tmp_path):
+    """Test que la reprise n'ampute pas un enregistrement en cours d'écriture par un autre processus."""
+    journal = AuditJournal(str(tmp_path))
+    fill(journal, 3)
+    journal.close()
+
+    # Un autre écrivain tient le verrou et n'a écrit que la moitié d'un enregistrement
+    record = encode_record("client_created", {"created_by": 1}, int(BASE_TS * 1000), 1)
+    fd = os.open(tmp_path / "audit-00000001.log", os.O_WRONLY | os.O_APPEND)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    os.write(fd, record[:10])
+
+    reopened = AuditJournal(str(tmp_path))
+    opener = threading.Thread(target=reopened.append, args=("client_updated", None))
+    opener.start()
+    opener.join(0.2)
+    assert opener.is_alive()
+
+    os.write(fd, record[10:])
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+    opener.join(5)
+    reopened.close()
+
+    assert [r["event"] for r in reopened.query()][-2:] == ["client_created", "client_updated"]
+
+
+def test_log_event_writes_journal(db, admin_user, client, audit_dir):
+    """Test que les événements métier sont journalisés localement."""
+    controller = ContractController(db, admin_user)
+    contract = controller.create_contract(client.id, 1000)
+    controller.sign_contract(contract.id)
+
+    result = invoke(db, admin_user, ["audit", "query", "--event", "contract_signed",
+                                     "--user", str(admin_user.id), "--format", "jsonl"])
+
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [row["data"]["contract_id"] for row in rows] == [contract.id]
+    assert audit_dir.is_dir()
+
+
+def test_audit_query_requires_gestion(db, commercial_user):
+    """Test que la consultation du journal est réservée au rôle GESTION."""
+    result = invoke(db, commercial_user, ["audit", "query"])
+
+    assert result.exit_code == 1
+    assert "GESTION" in result.output
@@ -1,6 +1,9 @@
 import pytest
 from src.controllers.auth_controller import AuthController
+from src.models.user import Role
+from src.utils import auth
 from src.utils.auth import create_access_token
+from src.utils.token_cache import TokenCache, UserSnapshot, token_cache
 
 
 def test_login_success(db, admin_user):
@@ -58,4 +61,76 @@ def test_set_current_user(db, admin_user):
     user = controller.set_current_user(token)
     
     assert controller.current_user is not None
-    assert controller.current_user.id == admin_user.id
\ No newline at end of file
+    assert controller.current_user.id == admin_user.id
+
+def test_verify_token_uses_cache(db, admin_user, query_counter):
+    """Test qu'un token déjà vérifié ne déclenche plus de requête."""
+    controller = AuthController(db)
+    token = create_access_token(admin_user.id, admin_user.role.value)
+    controller.verify_token(token)
+    db.expire_all()
+
+    with query_counter:
+        user = controller.verify_token(token)
+
+    assert query_counter.count == 0
+    assert user.email == "admin@test.com"
+    assert token_cache.stats["hits"] == 1
+    assert token_cache.stats["misses"] == 1
+
+
+def test_verify_token_cache_invalidated_on_update(db, admin_user):
+    """Test qu'un changement de rôle invalide le cache."""
+    controller = AuthController(db)
+    token = create_access_token(admin_user.id, admin_user.role.value)
+    controller.verify_token(token)
+
+    admin_user.role = Role.SUPPORT
+    db.commit()
+
+    assert controller.verify_token(token).role == Role.SUPPORT
+    assert token_cache.stats["invalidations"] == 1
+
+
+def test_token_cache_ttl():
+    """Test l'expiration des entrées du cache."""
+    now = [1000.0]
+    cache = TokenCache(ttl=60, clock=lambda: now[0])
+    user = UserSnapshot(1, "a@test.com", "A", Role.GESTION)
+    cache.put("token-a", user)
+    cache.put("token-b", user, expires_at=1010)
+
+    now[0] = 1030
+    assert cache.get("token-a") == user
+    assert cache.get("token-b") is None
+
+    now[0] = 1061
+    assert cache.get("token-a") is None
+
+
+def test_login_rehashes_password_with_new_cost(db, admin_user, monkeypatch):
+    """Test que la connexion re-hache un mot de passe dont le coût a changé."""
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", auth.BCRYPT_ROUNDS + 1)
+    assert auth.needs_rehash(admin_user.password_hash)
+
+    AuthController(db).login("admin@test.com", "Admin123!")
+
+    assert auth.get_hash_rounds(admin_user.password_hash) == auth.BCRYPT_ROUNDS
+    assert not auth.needs_rehash(admin_user.password_hash)
+    assert auth.verify_password("Admin123!", admin_user.password_hash)
+
+
+def test_login_succeeds_when_rehash_fails(db, admin_user, monkeypatch):
+    """Test qu'un échec de l'enregistrement du nouveau hash n'empêche pas la connexion."""
+    from sqlalchemy.exc import OperationalError
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", auth.BCRYPT_ROUNDS + 1)
+    old_hash = admin_user.password_hash
+
+    def locked():
+        raise OperationalError("COMMIT", {}, Exception("database is locked"))
+    monkeypatch.setattr(db, "commit", locked)
+
+    result = AuthController(db).login("admin@test.com", "Admin123!")
+
+    assert result["token"]
+    assert result["user"].password_hash == old_hash
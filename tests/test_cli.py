@@ -0,0 +1,264 @@
+import json
+from click.testing import CliRunner
+from src.cli import cli
+from src.models.contract import Contract
+from src.models.user import User
+from tests.conftest import invoke
+
+
+def test_clients_list_jsonl(db, commercial_user, client):
+    """Test la sortie JSON Lines de la liste des clients."""
+    result = invoke(db, commercial_user, ["clients", "list", "--mine", "--format", "jsonl"])
+
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [row["email"] for row in rows] == ["client@test.com"]
+
+
+def test_clients_list_streams_all_pages(db, commercial_user, client):
+    """Test que la liste parcourt toutes les pages."""
+    for i in range(4):
+        invoke(db, commercial_user, ["clients", "create", "--full-name", f"C{i}",
+                                     "--email", f"c{i}@test.com", "--phone", "+33600000000"])
+
+    result = invoke(db, commercial_user, ["clients", "list", "--format", "jsonl",
+                                          "--page-size", "2"])
+
+    assert len(result.output.splitlines()) == 5
+
+
+def test_contracts_sign_several(db, admin_user, client):
+    """Test la signature de plusieurs contrats en une commande."""
+    for _ in range(2):
+        invoke(db, admin_user, ["contracts", "create", str(client.id), "1000"])
+
+    result = invoke(db, admin_user, ["contracts", "sign", "1", "2"])
+
+    assert result.exit_code == 0
+    assert db.query(Contract).filter(Contract.is_signed == True).count() == 2
+
+
+def test_permission_error_exit_code(db, commercial_user, client):
+    """Test qu'une erreur de permission termine la commande en erreur."""
+    result = invoke(db, commercial_user, ["contracts", "create", str(client.id), "1000"])
+
+    assert result.exit_code == 1
+    assert "GESTION" in result.output
+
+
+def test_run_script_single_transaction(db, admin_user, client, tmp_path):
+    """Test qu'un script est exécuté en une seule transaction."""
+    script = tmp_path / "ok.txt"
+    script.write_text(
+        "# contrats du jour\n"
+        f"contracts create {client.id} 1000\n"
+        f"contracts create {client.id} 2000 --remaining 500\n"
+        "contracts sign 1 2\n"
+    )
+
+    result = invoke(db, admin_user, ["run-script", str(script)])
+
+    assert result.exit_code == 0, result.output
+    assert db.query(Contract).filter(Contract.is_signed == True).count() == 2
+
+
+def test_run_script_rolls_back_on_error(db, admin_user, client, tmp_path):
+    """Test qu'une erreur annule tout le script."""
+    script = tmp_path / "ko.txt"
+    script.write_text(
+        f"contracts create {client.id} 1000\n"
+        "contracts sign 999\n"
+    )
+
+    result = invoke(db, admin_user, ["run-script", str(script)])
+
+    assert result.exit_code == 1
+    assert "Ligne 2" in result.output
+    assert db.query(Contract).count() == 0
+
+
+def test_run_script_rejects_nested_commands(db, admin_user, tmp_path):
+    """Test que les commandes de session sont refusées dans un script."""
+    script = tmp_path / "nested.txt"
+    script.write_text("login --email a@b.c --password x\n")
+
+    result = invoke(db, admin_user, ["run-script", str(script)])
+
+    assert result.exit_code == 1
+    assert "n'est pas autorisée" in result.output
+
+
+def test_users_import(db, admin_user, tmp_path):
+    """Test l'import d'utilisateurs depuis un CSV."""
+    csv_file = tmp_path / "staff.csv"
+    csv_file.write_text(
+        "full_name,email,role,password\n"
+        "Alice,alice@test.com,commercial,Alice123!\n"
+        "Bob,bob@test.com,support,Bob12345!\n"
+    )
+
+    result = invoke(db, admin_user, ["users", "import", str(csv_file), "--workers", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert "2 utilisateur(s) créé(s)" in result.output
+    assert db.query(User).filter(User.email == "bob@test.com").count() == 1
+
+
+def test_calibrate_bcrypt_writes_env(tmp_path):
+    """Test que la calibration enregistre BCRYPT_ROUNDS dans le fichier .env."""
+    env_file = tmp_path / ".env"
+    env_file.write_text("DATABASE_URL=sqlite:///epic_events.db\n")
+
+    result = CliRunner().invoke(cli, ["calibrate-bcrypt", "--target-ms", "10000",
+                                      "--min-rounds", "4", "--max-rounds", "5",
+                                      "--env-file", str(env_file)])
+
+    assert result.exit_code == 0, result.output
+    content = env_file.read_text()
+    assert "DATABASE_URL=sqlite:///epic_events.db" in content
+    assert "BCRYPT_ROUNDS=5" in content
+
+
+def test_clients_import_writes_rejects(db, commercial_user, tmp_path):
+    """Test l'import CSV et le fichier des lignes rejetées."""
+    csv_file = tmp_path / "clients.csv"
+    csv_file.write_text(
+        "full_name,email,phone,company_name\n"
+        "Alice,alice@test.com,+33600000000,ACME\n"
+        "Bob,bob-at-test,+33600000000,\n"
+    )
+
+    result = invoke(db, commercial_user, ["clients", "import", str(csv_file)])
+
+    assert result.exit_code == 0, result.output
+    assert "1 client(s) importé(s)" in result.output
+    rejects = (tmp_path / "clients.rejects.csv").read_text().splitlines()
+    assert rejects == ["full_name,email,phone,company_name,reason",
+                       "Bob,bob-at-test,+33600000000,,email invalide"]
+
+
+def test_clients_update_retries_on_conflict(db, commercial_user, client, monkeypatch):
+    """Test que la CLI rejoue une mise à jour en conflit sur la dernière version."""
+    from src.controllers.client_controller import ClientController
+    from src.exceptions import ConcurrentModificationError
+    original = ClientController.update_client
+    calls = []
+
+    def conflict_once(self, *args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise ConcurrentModificationError("Le client", client.id)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ClientController, "update_client", conflict_once)
+    result = invoke(db, commercial_user, ["clients", "update", str(client.id),
+                                          "--company", "Nouvelle société"])
+
+    assert result.exit_code == 0, result.output
+    assert len(calls) == 2
+
+
+def test_clients_update_expected_version_conflict(db, commercial_user, client):
+    """Test qu'une version attendue périmée est signalée sans nouvelle tentative."""
+    result = invoke(db, commercial_user, ["clients", "update", str(client.id),
+                                          "--company", "X", "--expected-version", "7"])
+
+    assert result.exit_code == 1
+    assert "version actuelle : 1" in result.output
+
+
+def test_search_clients(db, commercial_user, client):
+    """Test la recherche de clients en ligne de commande."""
+    result = invoke(db, commercial_user, ["search", "clients", "test comp", "--format", "jsonl"])
+
+    assert result.exit_code == 0
+    assert [json.loads(line)["id"] for line in result.output.splitlines()] == [client.id]
+
+
+def test_clients_create_duplicate(db, commercial_user, client):
+    """Test qu'un doublon possible est refusé sans --force."""
+    args = ["clients", "create", "--full-name", "CLIENT TEST", "--email", "client@test.fr",
+            "--phone", "+33600000000", "--company", "Test Company"]
+
+    result = invoke(db, commercial_user, args)
+    assert result.exit_code == 1
+    assert "--force" in result.output
+
+    result = invoke(db, commercial_user, args + ["--force"])
+    assert result.exit_code == 0
+
+
+def test_events_conflicts(db, admin_user):
+    """Test le rapport des conflits sans chevauchement."""
+    result = invoke(db, admin_user, ["events", "conflicts"])
+
+    assert result.exit_code == 0
+    assert "Aucun conflit" in result.output
+
+
+def test_events_agenda(db, support_user, contract):
+    """Test de l'agenda du mois et de la sortie JSON Lines d'une semaine."""
+    import json
+    from datetime import datetime
+    from src.models.event import Event
+    db.add(Event(contract_id=contract.id, client_id=contract.client_id,
+                 support_contact_id=support_user.id,
+                 event_date_start=datetime(2030, 1, 3, 10), event_date_end=datetime(2030, 1, 3, 12),
+                 location="Salle", attendees=10))
+    db.commit()
+
+    result = invoke(db, support_user, ["events", "agenda", "--view", "month",
+                                       "--date", "2030-01-20", "--scope", "mine"])
+    assert result.exit_code == 0
+    assert "Jeudi 03/01" in result.output
+    assert "10:00-12:00" in result.output
+
+    result = invoke(db, support_user, ["events", "agenda", "--date", "2030-01-10", "--format", "jsonl"])
+    assert result.exit_code == 0
+    assert result.output == ""
+    result = invoke(db, support_user, ["events", "agenda", "--date", "2030-01-01", "--format", "jsonl"])
+    assert json.loads(result.output)["location"] == "Salle"
+
+
+def test_reminders_run_once(db, admin_user, support_user, contract, tmp_path):
+    """Test de l'envoi des rappels échus vers un fichier (mode cron)."""
+    from datetime import datetime, timedelta
+    from src.models.event import Event
+    start = datetime.now() + timedelta(hours=23)
+    db.add(Event(contract_id=contract.id, client_id=contract.client_id,
+                 support_contact_id=support_user.id,
+                 event_date_start=start, event_date_end=start + timedelta(hours=2),
+                 location="Salle", attendees=10))
+    db.commit()
+    path = tmp_path / "rappels.jsonl"
+
+    result = invoke(db, admin_user, ["reminders", "run", "--once", "--sink", f"file:{path}"])
+    assert result.exit_code == 0
+    assert not path.exists()
+
+    result = invoke(db, admin_user, ["reminders", "run", "--once", "--sink", f"file:{path}",
+                                     "--catch-up-minutes", "120"])
+    assert result.exit_code == 0
+    assert "sent : 1" in result.output
+    assert json.loads(path.read_text(encoding="utf-8"))["support_email"] == support_user.email
+
+
+def test_events_auto_assign_dry_run(db, admin_user, support_user, contract):
+    """Test que --dry-run affiche le plan sans l'appliquer."""
+    from datetime import datetime
+    from src.models.event import Event
+    contract.is_signed = True
+    db.add(Event(contract_id=contract.id, client_id=contract.client_id,
+                 event_date_start=datetime(2030, 1, 1, 10), event_date_end=datetime(2030, 1, 1, 12),
+                 location="Salle", attendees=10))
+    db.commit()
+
+    result = invoke(db, admin_user, ["events", "auto-assign", "--dry-run"])
+    assert result.exit_code == 0
+    assert "Support Test" in result.output
+    assert db.query(Event).one().support_contact_id is None
+
+    result = invoke(db, admin_user, ["events", "auto-assign", "--yes"])
+    assert result.exit_code == 0
+    db.expire_all()
+    assert db.query(Event).one().support_contact_id == support_user.id
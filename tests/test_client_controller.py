@@ -1,5 +1,9 @@
 import pytest
 from src.controllers.client_controller import ClientController
+from src.models.client import Client
+from src.models.client_trigram import ClientTrigram, normalize
+from src.exceptions import ConcurrentModificationError, DuplicateClientError
+from tests.conftest import bump_version
 
 
 def test_get_all_clients(db, commercial_user, client):
@@ -33,4 +37,198 @@ def test_update_client(db, commercial_user, client):
         full_name="Nom Modifié"
     )
     
-    assert updated.full_name == "Nom Modifié"
\ No newline at end of file
+    assert updated.full_name == "Nom Modifié"
+
+def test_get_clients_page(db, commercial_user):
+    """Test le parcours des clients page par page."""
+    controller = ClientController(db, commercial_user)
+    for i in range(5):
+        controller.create_client(f"Client {i}", f"c{i}@test.com", "+33600000000")
+
+    first = controller.get_clients_page(page_size=2)
+    second = controller.get_clients_page(first.next_cursor, page_size=2)
+    last = controller.get_clients_page(second.next_cursor, page_size=2)
+
+    assert [c.full_name for c in first.items] == ["Client 0", "Client 1"]
+    assert [c.full_name for c in second.items] == ["Client 2", "Client 3"]
+    assert [c.full_name for c in last.items] == ["Client 4"]
+    assert first.has_next and second.has_next
+    assert not last.has_next and last.next_cursor is None
+
+
+def test_get_clients_page_mine(db, commercial_user, admin_user, client):
+    """Test qu'une page « mes clients » ne contient que ceux du commercial."""
+    controller = ClientController(db, commercial_user)
+
+    page = controller.get_clients_page(mine=True)
+
+    assert [c.id for c in page.items] == [client.id]
+    assert all(c.commercial_contact_id == commercial_user.id for c in page.items)
+
+
+def client_rows(count, prefix="import"):
+    return [
+        {"full_name": f"Client {i}", "email": f"{prefix}{i}@test.com",
+         "phone": "+33600000000", "company_name": ""}
+        for i in range(count)
+    ]
+
+
+def test_import_clients_in_chunks(db, commercial_user, client, query_counter):
+    """Test l'import par paquets avec dédoublonnage et rejets."""
+    rows = client_rows(5) + [
+        {"full_name": "Doublon", "email": "import1@test.com", "phone": "+33600000000"},
+        {"full_name": "Existant", "email": "client@test.com", "phone": "+33600000000"},
+        {"full_name": "Invalide", "email": "pas-un-email", "phone": "+33600000000"},
+    ]
+    rejects = []
+    controller = ClientController(db, commercial_user)
+
+    with query_counter:
+        stats = controller.import_clients(
+            rows, chunk_size=3, on_reject=lambda row, reason: rejects.append((row["full_name"], reason))
+        )
+
+    assert stats == {"imported": 5, "rejected": 3, "chunks": 3}
+    # Par paquet : dédoublonnage, insertion groupée, lecture des ids,
+    # index des trigrammes (le commit n'est pas une requête)
+    assert query_counter.count <= 3 * 4
+    assert sorted(name for name, _ in rejects) == ["Doublon", "Existant", "Invalide"]
+    imported = db.query(Client).filter(Client.email == "import4@test.com").one()
+    assert imported.commercial_contact_id == commercial_user.id
+
+
+def test_import_clients_as_gestion(db, admin_user, commercial_user):
+    """Test que la GESTION choisit le commercial de chaque ligne."""
+    rows = client_rows(2)
+    rows[0]["commercial_contact_id"] = str(commercial_user.id)
+    rows[1]["commercial_contact_id"] = str(admin_user.id)
+    rejects = []
+
+    stats = ClientController(db, admin_user).import_clients(
+        rows, on_reject=lambda row, reason: rejects.append(reason)
+    )
+
+    assert stats["imported"] == 1
+    assert rejects == ["commercial_contact_id inconnu"]
+
+
+def test_import_clients_as_support(db, support_user):
+    """Test qu'un membre du SUPPORT ne peut pas importer de clients."""
+    with pytest.raises(PermissionError):
+        ClientController(db, support_user).import_clients(client_rows(1))
+
+
+def test_update_client_concurrent_modification(db, commercial_user, client):
+    """Test qu'une modification concurrente est détectée au lieu d'être écrasée."""
+    controller = ClientController(db, commercial_user)
+    controller.get_client_by_id(client.id)
+    bump_version(db, Client, client.id)
+
+    with pytest.raises(ConcurrentModificationError):
+        controller.update_client(client.id, full_name="Écrasé")
+
+    db.expire_all()
+    assert db.get(Client, client.id).full_name == "Client Test"
+
+
+def test_update_client_expected_version(db, commercial_user, client):
+    """Test le refus d'une modification préparée sur une version périmée."""
+    controller = ClientController(db, commercial_user)
+
+    with pytest.raises(ConcurrentModificationError, match="version actuelle : 1"):
+        controller.update_client(client.id, full_name="Nouveau", expected_version=0)
+
+    updated = controller.update_client(client.id, full_name="Nouveau", expected_version=1)
+    assert updated.version_id == 2
+
+
+def test_normalize():
+    """Test la normalisation utilisée par l'index des doublons."""
+    assert normalize("ACME S.A.") == normalize("Acme SA") == "acme sa"
+    assert normalize("  Hélène   D'Arc ") == "helene darc"
+
+
+def test_create_client_duplicate(db, commercial_user):
+    """Test qu'un client proche d'un client existant est signalé."""
+    controller = ClientController(db, commercial_user)
+    existing = controller.create_client("ACME SA", "contact@acme.fr", "+33600000000", "ACME SA")
+
+    with pytest.raises(DuplicateClientError) as error:
+        controller.create_client("Acme S.A.", "commandes@acme.fr", "+33600000001", "Acme S.A.")
+
+    assert [client.id for _, client in error.value.candidates] == [existing.id]
+    assert db.query(Client).count() == 1
+
+
+def test_create_client_duplicate_forced(db, commercial_user):
+    """Test la création forcée malgré un doublon possible."""
+    controller = ClientController(db, commercial_user)
+    controller.create_client("Jean Dupont", "jean.dupont@acme.fr", "+33600000000")
+
+    controller.create_client("Jean Dupont", "j.dupont@globex.fr", "+33600000001", force=True)
+
+    assert db.query(Client).count() == 2
+
+
+def test_create_client_not_duplicate(db, commercial_user):
+    """Test que des clients différents de la même société ne sont pas signalés."""
+    controller = ClientController(db, commercial_user)
+    controller.create_client("Jean Dupont", "jean.dupont@acme.fr", "+33600000000", "Acme")
+
+    controller.create_client("Marie Curie", "marie.curie@acme.fr", "+33600000001", "Acme")
+
+    assert db.query(Client).count() == 2
+
+
+def test_duplicate_index_follows_changes(db, commercial_user, client):
+    """Test que l'index suit les modifications, suppressions et imports."""
+    controller = ClientController(db, commercial_user)
+    assert controller.find_possible_duplicates("Client Test", "x@y.fr", "Test Company")
+
+    controller.update_client(client.id, full_name="Zorglub", company_name="Zorg Corp",
+                             email="zorglub@zorg.fr")
+    assert controller.find_possible_duplicates("Client Test", "x@y.fr", "Test Company") == []
+    assert controller.find_possible_duplicates("Zorglub", "zorglub@zorg.com")
+
+    controller.import_clients(client_rows(1))
+    imported = db.query(Client).filter_by(email="import0@test.com").one()
+    assert [c.id for _, c in controller.find_possible_duplicates("Client 0", "import0@autre.fr")] \
+        == [imported.id]
+
+    db.delete(imported)
+    db.commit()
+    assert db.query(ClientTrigram).filter_by(client_id=imported.id).count() == 0
+
+
+def test_duplicates_report(db, admin_user, commercial_user):
+    """Test le rapport des doublons sur toute la table."""
+    controller = ClientController(db, commercial_user)
+    first = controller.create_client("ACME SA", "contact@acme.fr", "+33600000000", "ACME SA")
+    second = controller.create_client("Acme S.A.", "contact@acme.com", "+33600000001",
+                                      "Acme S.A.", force=True)
+    controller.create_client("Marie Curie", "marie@radium.fr", "+33600000002")
+
+    report = ClientController(db, admin_user).get_duplicates_report()
+
+    assert [(a.id, b.id) for _, a, b in report] == [(first.id, second.id)]
+    assert report[0][0] > 0.9
+
+
+def test_duplicates_report_as_commercial(db, commercial_user):
+    """Test que seule la GESTION peut lancer le rapport."""
+    with pytest.raises(PermissionError):
+        ClientController(db, commercial_user).get_duplicates_report()
+
+
+def test_rebuild_duplicate_index(db, admin_user, client):
+    """Test la reconstruction de l'index des doublons."""
+    db.query(ClientTrigram).delete()
+    db.commit()
+    controller = ClientController(db, admin_user)
+    assert controller.find_possible_duplicates("Client Test", "client@test.com") == []
+
+    assert controller.rebuild_duplicate_index() == 1
+
+    assert [c.id for _, c in controller.find_possible_duplicates("Client Test", "client@test.com")] \
+        == [client.id]
@@ -153,4 +153,34 @@ def test_get_contract_by_id_not_found(db):
     
     found = controller.get_contract_by_id(99999)
     
-    assert found is None
\ No newline at end of file
+    assert found is None
+
+@pytest.mark.parametrize("method", [
+    "get_all_contracts",
+    "get_unsigned_contracts",
+    "get_unpaid_contracts",
+])
+def test_contracts_list_is_single_query(db, commercial_user, client, contract,
+                                        query_counter, capsys, method):
+    """L'affichage d'une liste de contrats ne doit pas déclencher de N+1."""
+    from src.views.contract_view import ContractView
+
+    controller = ContractController(db, commercial_user)
+    db.expunge_all()
+
+    with query_counter:
+        ContractView().display_contracts_list(getattr(controller, method)())
+
+    assert query_counter.count == 1
+    assert "Client Test" in capsys.readouterr().out
+
+
+def test_get_contracts_page_unpaid(db, admin_user, client, contract):
+    """Test la page des contrats non payés."""
+    controller = ContractController(db, admin_user)
+    controller.create_contract(client.id, 500.00, remaining_amount=0)
+
+    page = controller.get_contracts_page(status="unpaid")
+
+    assert [c.id for c in page.items] == [contract.id]
+    assert not page.has_next
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import text
+from src.database.config import create_db_engine, get_sqlite_pragmas
+
+
+def read_pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    """Test que le profil par défaut ne modifie pas le journal."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'default.db'}", "default")
+
+    assert read_pragma(engine, "journal_mode") == "delete"
+
+
+def test_production_profile_applies_pragmas(tmp_path):
+    """Test que le profil production règle chaque connexion du pool."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'prod.db'}", "production")
+
+    assert read_pragma(engine, "journal_mode") == "wal"
+    assert read_pragma(engine, "synchronous") == 1   # NORMAL
+    assert read_pragma(engine, "temp_store") == 2    # MEMORY
+    assert read_pragma(engine, "cache_size") == -65536
+    assert read_pragma(engine, "busy_timeout") == 5000
+
+
+def test_pragma_env_override(monkeypatch):
+    """Test la surcharge d'un PRAGMA par variable d'environnement."""
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT", "12000")
+
+    assert get_sqlite_pragmas("production")["busy_timeout"] == "12000"
+
+
+def test_unknown_profile():
+    """Test qu'un profil inconnu est refusé."""
+    with pytest.raises(ValueError):
+        get_sqlite_pragmas("turbo")
+
+
+def test_upgrade_db_adds_missing_columns_and_indexes(tmp_path):
+    """Test la mise à niveau d'une base antérieure, puis qu'une seconde passe ne fait rien."""
+    import src.models  # noqa: F401 (enregistre les tables)
+    from sqlalchemy import create_engine
+    from src.database.config import Base, upgrade_db
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    # Schéma d'avant le verrouillage optimiste
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_events_support_end"))
+        for table in ("clients", "contracts", "events"):
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN version_id"))
+        conn.execute(text(
+            "INSERT INTO users (full_name, email, password_hash, role) "
+            "VALUES ('C', 'c@test.com', 'x', 'COMMERCIAL')"
+        ))
+        conn.execute(text(
+            "INSERT INTO clients (full_name, email, commercial_contact_id) VALUES ('Client', 'a@b.fr', 1)"
+        ))
+
+    added = upgrade_db(engine)
+
+    assert {"clients.version_id", "contracts.version_id", "events.version_id",
+            "ix_events_support_end"} <= set(added)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version_id FROM clients")).scalar() == 1
+    assert upgrade_db(engine) == []
+
+
+def test_upgrade_db_backfills_event_updated_at(tmp_path):
+    """Test l'ajout de updated_at (et de son index) aux événements existants."""
+    import src.models  # noqa: F401 (enregistre les tables)
+    from datetime import datetime
+    from sqlalchemy import create_engine, inspect
+    from src.database.config import Base, upgrade_db
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (full_name, email, password_hash, role) "
+                          "VALUES ('C', 'c@test.com', 'x', 'COMMERCIAL')"))
+        conn.execute(text("INSERT INTO clients (full_name, email, commercial_contact_id, version_id) "
+                          "VALUES ('Client', 'a@b.fr', 1, 1)"))
+        conn.execute(text("INSERT INTO contracts (client_id, commercial_contact_id, total_amount, "
+                          "remaining_amount, is_signed, version_id) VALUES (1, 1, 10, 0, 1, 1)"))
+        conn.execute(text("INSERT INTO events (contract_id, client_id, event_date_start, "
+                          "event_date_end, location, attendees, version_id) "
+                          "VALUES (1, 1, '2030-01-01 10:00:00', '2030-01-01 12:00:00', 'Salle', 5, 1)"))
+        conn.execute(text("DROP INDEX ix_events_updated_at"))
+        conn.execute(text("ALTER TABLE events DROP COLUMN updated_at"))
+    before = datetime.now()
+
+    added = upgrade_db(engine)
+
+    assert {"events.updated_at", "ix_events_updated_at"} <= set(added)
+    assert "ix_events_updated_at" in {index["name"] for index in inspect(engine).get_indexes("events")}
+    with engine.connect() as conn:
+        updated_at = conn.execute(Base.metadata.tables["events"].select()).one().updated_at
+    assert updated_at >= before.replace(microsecond=0)
@@ -0,0 +1,376 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from src.controllers.event_controller import EventController, agenda_period
+from src.models.client import Client
+from src.models.contract import Contract
+from src.models.event import Event
+from src.models.user import User, Role
+from src.exceptions import ConcurrentModificationError, EventConflictError
+from src.views.event_view import EventView
+from tests.conftest import bump_version
+
+
+@pytest.fixture
+def events(db, commercial_user, support_user):
+    """Crée plusieurs événements, dont un non assigné, sur des clients distincts."""
+    start = datetime(2030, 1, 1, 10, 0)
+    created = []
+    for i in range(5):
+        client = Client(
+            full_name=f"Client {i}",
+            email=f"client{i}@test.com",
+            commercial_contact_id=commercial_user.id
+        )
+        contract = Contract(
+            client=client,
+            commercial_contact_id=commercial_user.id,
+            total_amount=1000,
+            remaining_amount=0,
+            is_signed=True
+        )
+        event = Event(
+            contract=contract,
+            client=client,
+            support_contact_id=support_user.id if i % 2 == 0 else None,
+            event_date_start=start + timedelta(days=i),
+            event_date_end=start + timedelta(days=i, hours=4),
+            location=f"Salle {i}",
+            attendees=50
+        )
+        db.add(event)
+        created.append(event)
+    db.commit()
+    return created
+
+
+def test_get_all_events(db, admin_user, events):
+    """Test la récupération de tous les événements."""
+    controller = EventController(db, admin_user)
+
+    assert len(controller.get_all_events()) == 5
+
+
+def test_get_my_events(db, support_user, events):
+    """Test la récupération des événements du support connecté."""
+    controller = EventController(db, support_user)
+
+    my_events = controller.get_my_events()
+
+    assert len(my_events) == 3
+    assert all(e.support_contact_id == support_user.id for e in my_events)
+
+
+def test_get_unassigned_events(db, admin_user, events):
+    """Test la récupération des événements non assignés."""
+    controller = EventController(db, admin_user)
+
+    unassigned = controller.get_unassigned_events()
+
+    assert len(unassigned) == 2
+    assert all(e.support_contact_id is None for e in unassigned)
+
+
+@pytest.mark.parametrize("method, user_fixture", [
+    ("get_all_events", "admin_user"),
+    ("get_my_events", "support_user"),
+    ("get_unassigned_events", "admin_user"),
+])
+def test_events_list_is_single_query(db, events, query_counter, capsys,
+                                     request, method, user_fixture):
+    """L'affichage d'une liste d'événements ne doit pas déclencher de N+1."""
+    user = request.getfixturevalue(user_fixture)
+    db.refresh(user)
+    controller = EventController(db, user)
+    db.expunge_all()
+
+    with query_counter:
+        EventView().display_events_list(getattr(controller, method)())
+
+    assert query_counter.count == 1
+    assert "Client " in capsys.readouterr().out
+
+
+def test_get_events_page(db, admin_user, events):
+    """Test le parcours des événements non assignés page par page."""
+    controller = EventController(db, admin_user)
+
+    first = controller.get_events_page(page_size=1, scope="unassigned")
+    second = controller.get_events_page(first.next_cursor, page_size=1, scope="unassigned")
+
+    assert first.has_next
+    assert not second.has_next
+    assert first.items[0].id < second.items[0].id
+    assert all(e.support_contact_id is None for e in first.items + second.items)
+
+
+def test_get_events_page_unknown_scope(db, admin_user, events):
+    """Test qu'un périmètre inconnu est refusé."""
+    controller = EventController(db, admin_user)
+
+    with pytest.raises(ValueError):
+        controller.get_events_page(scope="autre")
+
+
+def test_update_event_concurrent_modification(db, support_user, events):
+    """Test qu'une mise à jour d'événement détecte une modification concurrente."""
+    controller = EventController(db, support_user)
+    controller.get_event_by_id(events[0].id)
+    bump_version(db, Event, events[0].id)
+
+    with pytest.raises(ConcurrentModificationError):
+        controller.update_event(events[0].id, notes="Écrasé")
+
+
+def test_record_payment_bumps_contract_version(db, admin_user, events):
+    """Test qu'un paiement invalide une modification préparée avant lui."""
+    from src.controllers.contract_controller import ContractController
+    contract = events[0].contract
+    contract.remaining_amount = 500
+    db.commit()
+    version = contract.version_id
+
+    ContractController(db, admin_user).record_payment(contract.id, 100)
+
+    db.expire_all()
+    assert db.get(Contract, contract.id).version_id == version + 1
+
+
+def move_event(db, event, start, hours=4):
+    event.event_date_start = start
+    event.event_date_end = start + timedelta(hours=hours)
+    db.commit()
+
+
+def test_assign_event_overlap(db, admin_user, support_user, events):
+    """Test qu'un support ne peut pas être assigné sur deux événements simultanés."""
+    move_event(db, events[1], events[0].event_date_start + timedelta(hours=2))
+    controller = EventController(db, admin_user)
+
+    with pytest.raises(EventConflictError) as error:
+        controller.assign_event(events[1].id, support_user.id)
+
+    assert error.value.conflicts == [events[0]]
+    assert events[1].support_contact_id is None
+
+    controller.assign_event(events[1].id, support_user.id, force=True)
+    assert events[1].support_contact_id == support_user.id
+
+
+def test_assign_event_back_to_back(db, admin_user, support_user, events):
+    """Test qu'un événement qui commence à la fin d'un autre n'est pas un conflit."""
+    move_event(db, events[1], events[0].event_date_end)
+
+    EventController(db, admin_user).assign_event(events[1].id, support_user.id)
+
+    assert events[1].support_contact_id == support_user.id
+
+
+def test_reassign_event_ignores_itself(db, admin_user, support_user, events):
+    """Test qu'un événement ne se chevauche pas lui-même."""
+    EventController(db, admin_user).assign_event(events[0].id, support_user.id)
+
+
+def test_conflicts_report(db, admin_user, support_user, events):
+    """Test le rapport des chevauchements."""
+    start = events[0].event_date_start
+    move_event(db, events[2], start + timedelta(hours=1), hours=1)
+    move_event(db, events[4], start + timedelta(hours=3), hours=5)
+    controller = EventController(db, admin_user)
+
+    conflicts = controller.get_conflicts_report()
+
+    assert [(c.first_event_id, c.second_event_id) for c in conflicts] == [
+        (events[0].id, events[2].id), (events[0].id, events[4].id)
+    ]
+    assert conflicts[1].overlap_start == start + timedelta(hours=3)
+    assert conflicts[1].overlap_end == events[0].event_date_end
+    assert controller.get_conflicts_report(since=start + timedelta(days=1)) == []
+
+
+def test_conflicts_report_as_support(db, support_user):
+    """Test que seule la GESTION peut lancer le rapport."""
+    with pytest.raises(PermissionError):
+        EventController(db, support_user).get_conflicts_report()
+
+
+@pytest.fixture
+def second_support(db):
+    user = User(full_name="Support Deux", email="support2@test.com",
+                password_hash="x", role=Role.SUPPORT)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_plan_auto_assignment_balances_load(db, admin_user, support_user, second_support, events):
+    """Test que le plan confie les événements au support le moins chargé, sans rien modifier."""
+    plan = EventController(db, admin_user).plan_auto_assignment()
+
+    assert [(a.event_id, a.support_contact_id) for a in plan.assignments] == [
+        (events[1].id, second_support.id), (events[3].id, second_support.id)
+    ]
+    assert plan.unassigned == []
+    # Seuls les événements qui finissent après le premier à planifier comptent
+    assert plan.loads == {support_user.id: timedelta(hours=8), second_support.id: timedelta(hours=8)}
+    assert events[1].support_contact_id is None
+
+
+def test_plan_auto_assignment_avoids_overlaps(db, admin_user, support_user, second_support, events):
+    """Test qu'aucun support n'est réservé deux fois sur la même période."""
+    # Trois événements en même temps que events[0], déjà assigné à support_user
+    move_event(db, events[1], events[0].event_date_start)
+    move_event(db, events[3], events[0].event_date_start + timedelta(hours=1))
+
+    plan = EventController(db, admin_user).plan_auto_assignment()
+
+    assert [(a.event_id, a.support_contact_id) for a in plan.assignments] == [
+        (events[1].id, second_support.id)
+    ]
+    assert plan.unassigned == [events[3].id]
+
+
+def test_plan_auto_assignment_since(db, admin_user, support_user, events):
+    """Test la limite sur la date de début."""
+    plan = EventController(db, admin_user).plan_auto_assignment(
+        since=events[2].event_date_start
+    )
+
+    assert [a.event_id for a in plan.assignments] == [events[3].id]
+
+
+def test_apply_auto_assignment(db, admin_user, support_user, second_support, events):
+    """Test l'application du plan en une transaction."""
+    controller = EventController(db, admin_user)
+    versions = [event.version_id for event in events]
+
+    assert controller.apply_auto_assignment(controller.plan_auto_assignment()) == 2
+
+    db.expire_all()
+    assert events[1].support_contact_id == events[3].support_contact_id == second_support.id
+    assert events[1].version_id == versions[1] + 1
+    assert controller.plan_auto_assignment().assignments == []
+
+
+def test_apply_auto_assignment_stale_plan(db, admin_user, support_user, second_support, events):
+    """Test qu'un plan dépassé n'est pas appliqué, même partiellement."""
+    controller = EventController(db, admin_user)
+    plan = controller.plan_auto_assignment()
+    controller.assign_event(events[3].id, support_user.id)
+
+    with pytest.raises(ValueError, match="recalculez"):
+        controller.apply_auto_assignment(plan)
+
+    db.expire_all()
+    assert events[1].support_contact_id is None
+
+
+def test_plan_auto_assignment_as_support(db, support_user):
+    """Test que seule la GESTION peut planifier."""
+    with pytest.raises(PermissionError):
+        EventController(db, support_user).plan_auto_assignment()
+
+
+def test_agenda_period():
+    """Test des bornes de la semaine (du lundi) et du mois contenant un jour."""
+    day = datetime(2030, 1, 2, 15, 30)
+    assert agenda_period("week", day) == (datetime(2029, 12, 31), datetime(2030, 1, 7))
+    assert agenda_period("month", day) == (datetime(2030, 1, 1), datetime(2030, 2, 1))
+    assert agenda_period("month", datetime(2030, 12, 31)) == (datetime(2030, 12, 1), datetime(2031, 1, 1))
+
+
+def test_get_events_between(db, admin_user, support_user, events):
+    """Test de la période [début, fin), triée par date de début, et des filtres."""
+    controller = EventController(db, admin_user)
+    move_event(db, events[4], datetime(2030, 1, 2, 8, 0))
+
+    found = controller.get_events_between(datetime(2030, 1, 2), datetime(2030, 1, 4))
+    assert [event.id for event in found] == [events[4].id, events[1].id, events[2].id]
+
+    assert [event.id for event in controller.get_events_between(
+        datetime(2030, 1, 1), datetime(2030, 1, 6), support_id=support_user.id
+    )] == [events[0].id, events[4].id, events[2].id]
+    assert [event.id for event in controller.get_events_between(
+        datetime(2030, 1, 1), datetime(2030, 1, 6), client_id=events[3].client_id
+    )] == [events[3].id]
+    assert [event.id for event in controller.get_events_between(
+        datetime(2030, 1, 1), datetime(2030, 1, 6), location="salle 1"
+    )] == [events[1].id]
+
+    with pytest.raises(ValueError):
+        controller.get_events_between(datetime(2030, 1, 4), datetime(2030, 1, 2))
+
+
+def test_get_events_between_includes_events_in_progress(db, admin_user, events, capsys):
+    """Test qu'un événement commencé avant la période et pas encore fini est inclus, au premier jour."""
+    controller = EventController(db, admin_user)
+    move_event(db, events[0], datetime(2030, 1, 1, 20, 0), hours=30)
+
+    found = controller.get_events_between(datetime(2030, 1, 2, 9, 0), datetime(2030, 1, 3))
+    assert [event.id for event in found] == [events[0].id, events[1].id]
+    # Terminé avant la période
+    assert events[0].id not in [
+        event.id for event in controller.get_events_between(datetime(2030, 1, 4), datetime(2030, 1, 5))
+    ]
+
+    start = datetime(2030, 1, 2, 9, 0)
+    EventView().display_agenda(found, start, start + timedelta(days=1))
+    output = capsys.readouterr().out
+    assert "Mercredi 02/01\n  01/01 20:00-03/01 02:00 #" in output
+
+
+def test_get_events_between_uses_start_index(db, admin_user, events):
+    """Test que chaque filtre lit une plage d'index sur la date de début, déjà triée."""
+    controller = EventController(db, admin_user)
+    for filters, index in (({}, "ix_events_event_date_start"),
+                           ({"support_id": 1}, "ix_events_support_start"),
+                           ({"client_id": 1}, "ix_events_client_start")):
+        statement = controller.events_between_query(
+            datetime(2030, 1, 1), datetime(2030, 1, 8), **filters
+        ).statement
+        compiled = statement.compile(db.bind, compile_kwargs={"literal_binds": True})
+        details = " ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+        assert index in details
+        assert "TEMP B-TREE" not in details
+
+
+def test_get_upcoming_events_as_support(db, support_user, events):
+    """Test des prochains jours du planning d'un support."""
+    found = EventController(db, support_user).get_upcoming_events(
+        days=3, now=datetime(2030, 1, 1, 9, 0), scope="mine"
+    )
+    assert [event.id for event in found] == [events[0].id, events[2].id]
+
+
+def test_display_agenda(db, admin_user, events, capsys):
+    """Test des vues semaine (tous les jours) et mois (grille et jours occupés)."""
+    controller = EventController(db, admin_user)
+    view = EventView()
+
+    start, end = agenda_period("week", datetime(2030, 1, 1))
+    view.display_agenda(controller.get_events_between(start, end), start, end, "week")
+    output = capsys.readouterr().out
+    assert "Agenda du 31/12/2029 au 06/01/2030" in output
+    assert "Lundi 31/12\n  -" in output
+    assert "10:00-14:00 #" in output and "Salle 3 | Client 3 | Non assigné" in output
+    assert "Total : 5 événement(s)" in output
+
+    start, end = agenda_period("month", datetime(2030, 1, 15))
+    view.display_agenda(controller.get_events_between(start, end), start, end, "month")
+    output = capsys.readouterr().out
+    assert " 1*  2*  3*  4*  5*  6 " in output
+    assert "Lundi 31/12" not in output and "Samedi 05/01" in output
+
+
+def test_display_upcoming_days_agenda(db, admin_user, events, capsys):
+    """Test que la vue des N prochains jours affiche le dernier jour, entamé, de la période."""
+    start = datetime(2029, 12, 29, 15, 0)
+    move_event(db, events[4], datetime(2030, 1, 5, 10, 0))
+    found = EventController(db, admin_user).get_upcoming_events(days=7, now=start)
+
+    EventView().display_agenda(found, start, start + timedelta(days=7))
+    output = capsys.readouterr().out
+
+    assert "Agenda du 29/12/2029 au 05/01/2030" in output
+    assert "Samedi 05/01\n  10:00-14:00 #" in output
+    assert output.count("#") == len(found) == 5
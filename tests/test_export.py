@@ -0,0 +1,76 @@
+import csv
+import gzip
+import json
+from src.controllers.client_controller import ClientController
+from src.controllers.contract_controller import ContractController
+from src.utils.export import write_rows
+from tests.conftest import invoke
+
+
+def test_export_query_loads_no_entities(db, admin_user, contract):
+    """Test que l'export ne charge que des colonnes, pas d'objets ORM."""
+    db.expunge_all()
+    query = ContractController(db, admin_user).export_query()
+
+    rows = list(query)
+
+    assert len(db.identity_map) == 0
+    assert rows[0].client_name == "Client Test"
+
+
+def test_export_contracts_csv(db, admin_user, contract, tmp_path):
+    """Test l'export CSV : montants exacts et dates ISO."""
+    output = tmp_path / "contracts.csv"
+
+    result = invoke(db, admin_user, ["export", "contracts", "-o", str(output)])
+
+    assert result.exit_code == 0, result.output
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["total_amount"] == "10000.00"
+    assert rows[0]["remaining_amount"] == "5000.00"
+    assert rows[0]["client_name"] == "Client Test"
+    assert "T" in rows[0]["created_at"]
+
+
+def test_export_clients_jsonl_gzip(db, commercial_user, client, tmp_path):
+    """Test l'export JSON Lines compressé."""
+    output = tmp_path / "clients.jsonl.gz"
+
+    result = invoke(db, commercial_user, ["export", "clients", "--mine",
+                                          "--format", "jsonl", "-o", str(output)])
+
+    assert result.exit_code == 0, result.output
+    with gzip.open(output, "rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["email"] for row in rows] == ["client@test.com"]
+
+
+def test_export_stdout(db, commercial_user, client):
+    """Test l'export vers la sortie standard."""
+    result = invoke(db, commercial_user, ["export", "clients", "--format", "jsonl"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.output)["full_name"] == client.full_name
+
+
+def test_export_respects_role_scoping(db, admin_user, client):
+    """Test que --mine reste réservé au COMMERCIAL."""
+    result = invoke(db, admin_user, ["export", "clients", "--mine"])
+
+    assert result.exit_code == 1
+    assert "COMMERCIAL" in result.output
+
+
+def test_write_rows_streams_in_batches(db, commercial_user, tmp_path):
+    """Test que les lignes sont lues par lots (yield_per)."""
+    controller = ClientController(db, commercial_user)
+    controller.import_clients(
+        {"full_name": f"C{i}", "email": f"c{i}@test.com", "phone": "+33600000000"}
+        for i in range(25)
+    )
+
+    with open(tmp_path / "out.csv", "w", newline="") as f:
+        count = write_rows(controller.export_query(), f, "csv", batch_size=10)
+
+    assert count == 25
@@ -0,0 +1,113 @@
+import threading
+from src.utils import logger
+from src.utils.logger import SentryDispatcher, parse_rates
+
+
+class FakeSender:
+    """Collecte les lots au lieu de les envoyer à Sentry."""
+
+    def __init__(self, block=None):
+        self.batches = []
+        self.block = block
+
+    def __call__(self, batch):
+        if self.block:
+            self.block.wait()
+        self.batches.append(batch)
+
+
+def test_events_are_sent_in_batches():
+    """Test l'envoi groupé et le flush."""
+    sender = FakeSender(block=threading.Event())
+    dispatcher = SentryDispatcher(sender, batch_size=4).start()
+
+    for i in range(10):
+        dispatcher.submit("message", "client_created", "client_created", {"i": i})
+    sender.block.set()
+    assert dispatcher.flush()
+    dispatcher.close()
+
+    assert sum(len(batch) for batch in sender.batches) == 10
+    assert all(len(batch) <= 4 for batch in sender.batches)
+    assert dispatcher.stats["sent"] == 10
+
+
+def test_sampling_drops_events():
+    """Test qu'un taux d'échantillonnage nul écarte l'événement."""
+    dispatcher = SentryDispatcher(FakeSender(), sample_rates={"login_success": 0})
+
+    assert not dispatcher.submit("message", "login_success", "login_success", None)
+    assert dispatcher.submit("message", "login_failed", "login_failed", None)
+    assert dispatcher.stats["dropped_sampled"] == 1
+
+
+def test_rate_limit_per_event_name():
+    """Test la limitation de débit par nom d'événement."""
+    dispatcher = SentryDispatcher(FakeSender(), rate_limits={"login_failed": 2})
+
+    accepted = [
+        dispatcher.submit("message", "login_failed", "login_failed", None)
+        for _ in range(5)
+    ]
+
+    assert accepted == [True, True, False, False, False]
+    assert dispatcher.stats["dropped_rate_limited"] == 3
+
+
+def test_fractional_rate_limit(monkeypatch):
+    """Test qu'un débit inférieur à 1/s laisse passer un événement toutes les 1/rate s."""
+    now = [1000.0]
+    monkeypatch.setattr(logger.time, "monotonic", lambda: now[0])
+    dispatcher = SentryDispatcher(FakeSender(), rate_limits={"login_failed": 0.5})
+
+    def submit():
+        return dispatcher.submit("message", "login_failed", "login_failed", None)
+
+    assert [submit(), submit()] == [True, False]
+    now[0] += 1
+    assert not submit()
+    now[0] += 1
+    assert [submit(), submit()] == [True, False]
+
+
+def test_full_queue_never_blocks():
+    """Test qu'une file pleine abandonne l'événement au lieu de bloquer."""
+    dispatcher = SentryDispatcher(FakeSender(), max_queue=2)
+
+    results = [dispatcher.submit("message", "e", "e", None) for _ in range(3)]
+
+    assert results == [True, True, False]
+    assert dispatcher.stats["dropped_queue_full"] == 1
+
+
+def test_send_error_is_counted():
+    """Test qu'une erreur d'envoi ne tue pas le thread."""
+    def failing(batch):
+        raise RuntimeError("réseau")
+
+    dispatcher = SentryDispatcher(failing).start()
+    dispatcher.submit("message", "e", "e", None)
+    dispatcher.flush()
+    dispatcher.submit("message", "e", "e", None)
+    assert dispatcher.flush()
+    dispatcher.close()
+
+    assert dispatcher.stats["send_errors"] == 2
+
+
+def test_log_event_without_dsn(monkeypatch):
+    """Test que sans DSN aucun dispatcher n'est créé."""
+    monkeypatch.setattr(logger, "SENTRY_DSN", None)
+
+    logger.log_event("client_created", {"client_id": 1})
+
+    assert logger.get_dispatcher() is None
+
+
+def test_parse_rates():
+    """Test la lecture des taux depuis l'environnement."""
+    assert parse_rates("login_success=0.1, login_failed=5") == {
+        "login_success": 0.1,
+        "login_failed": 5.0,
+    }
+    assert parse_rates(None) == {}
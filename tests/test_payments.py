@@ -0,0 +1,108 @@
+import threading
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from src.controllers.contract_controller import ContractController
+from src.controllers.summary_controller import SummaryController
+from src.database.config import Base
+from src.models.contract import Contract
+from src.models.payment import Payment
+from src.models.summary import ClientSummary
+from src.models.user import User, Role
+from src.models.client import Client
+
+
+@pytest.fixture
+def signed_contract(db, contract):
+    contract.is_signed = True
+    db.commit()
+    return contract
+
+
+def test_record_payment(db, commercial_user, admin_user, client, signed_contract):
+    """Test l'enregistrement d'un paiement et la mise à jour des totaux."""
+    payment = ContractController(db, commercial_user).record_payment(signed_contract.id, 1200.5)
+
+    assert payment.amount == Decimal("1200.50")
+    assert signed_contract.remaining_amount == Decimal("3799.50")
+    assert db.get(ClientSummary, client.id).remaining_amount == Decimal("3799.50")
+    assert SummaryController(db, admin_user).check() == []
+
+
+def test_record_payment_above_remaining(db, admin_user, signed_contract):
+    """Test qu'un paiement supérieur au restant dû est refusé sans rien enregistrer."""
+    with pytest.raises(ValueError, match="dépasse"):
+        ContractController(db, admin_user).record_payment(signed_contract.id, 5000.01)
+
+    assert db.query(Payment).count() == 0
+    assert signed_contract.remaining_amount == Decimal("5000.00")
+
+
+def test_record_payment_unsigned_contract(db, admin_user, contract):
+    """Test qu'un contrat non signé ne peut pas recevoir de paiement."""
+    with pytest.raises(ValueError, match="signé"):
+        ContractController(db, admin_user).record_payment(contract.id, 100)
+
+
+def test_record_payment_as_support(db, support_user, signed_contract):
+    """Test qu'un membre du SUPPORT ne peut pas enregistrer de paiement."""
+    with pytest.raises(PermissionError):
+        ContractController(db, support_user).record_payment(signed_contract.id, 100)
+
+
+def test_concurrent_payments_reconcile(tmp_path):
+    """
+    Plusieurs threads paient le même contrat en même temps, pour plus que le
+    restant dû : aucun paiement n'est perdu et le restant ne devient jamais négatif.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'stress.db'}",
+                           connect_args={"timeout": 30, "check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        admin = User(full_name="Admin", email="admin@test.com", password_hash="x",
+                     role=Role.GESTION)
+        db.add(admin)
+        db.flush()
+        client = Client(full_name="Client", email="client@test.com",
+                        commercial_contact_id=admin.id)
+        db.add(client)
+        db.flush()
+        contract = Contract(client_id=client.id, commercial_contact_id=admin.id,
+                            total_amount=150, remaining_amount=150, is_signed=True)
+        db.add(contract)
+        db.commit()
+        admin_id, contract_id = admin.id, contract.id
+
+    threads_count, payments_per_thread, amount = 8, 25, Decimal("1.00")
+    accepted, refused, errors = [], [], []
+
+    def pay():
+        with Session() as db:
+            controller = ContractController(db, db.get(User, admin_id))
+            for _ in range(payments_per_thread):
+                try:
+                    controller.record_payment(contract_id, amount)
+                    accepted.append(amount)
+                except ValueError:
+                    refused.append(amount)
+                except Exception as e:
+                    errors.append(e)
+
+    threads = [threading.Thread(target=pay) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    # 200 tentatives pour 150 € dus : exactement 150 paiements acceptés
+    assert len(accepted) == 150
+    assert len(refused) == threads_count * payments_per_thread - 150
+    with Session() as db:
+        assert db.get(Contract, contract_id).remaining_amount == 0
+        assert db.query(func.sum(Payment.amount)).scalar() == Decimal("150")
+        assert SummaryController(db, db.get(User, admin_id)).check() == []
+    engine.dispose()
@@ -0,0 +1,79 @@
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.database.config import get_pool_options
+from src.database.pool_metrics import PoolMetrics, MeteredQueuePool
+
+
+def test_metrics_count_checkouts_and_connects(tmp_path):
+    """Test le comptage des emprunts et des nouvelles connexions."""
+    metrics = PoolMetrics()
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    metrics.attach(engine)
+    Session = sessionmaker(bind=engine)
+
+    for _ in range(3):
+        session = Session()
+        session.execute(text("SELECT 1"))
+        session.close()
+
+    stats = metrics.snapshot()
+    assert stats["checkouts"] == 3
+    assert stats["checkins"] == 3
+    assert stats["checked_out"] == 0
+    # Le pool réutilise la même connexion
+    assert stats["connects"] == 1
+
+
+def test_metrics_record_waits_on_saturated_pool(tmp_path):
+    """Test qu'une attente de connexion est mesurée quand le pool est plein."""
+    metrics = PoolMetrics()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        connect_args={"check_same_thread": False}
+    )
+    metrics.attach(engine)
+
+    holder = engine.connect()
+
+    def release_later():
+        time.sleep(0.05)
+        holder.close()
+
+    threading.Thread(target=release_later).start()
+    with engine.connect():
+        pass
+
+    stats = metrics.snapshot()
+    assert stats["waits"] == 1
+    assert stats["wait_time_ms"] > 0
+
+
+def test_metrics_survive_dispose(tmp_path):
+    """Test que les compteurs restent branchés après engine.dispose()."""
+    metrics = PoolMetrics()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool
+    )
+    metrics.attach(engine)
+
+    engine.dispose()
+
+    assert engine.pool.metrics is metrics
+
+
+def test_pool_options_from_env(monkeypatch):
+    """Test la lecture des options du pool dans l'environnement."""
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    options = get_pool_options()
+
+    assert options["pool_size"] == 20
+    assert options["pool_pre_ping"] is False
+    assert options["poolclass"] is MeteredQueuePool
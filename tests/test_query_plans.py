@@ -0,0 +1,160 @@
+import re
+import pytest
+from datetime import datetime
+from sqlalchemy import event, text
+from src.controllers.auth_controller import AuthController
+from src.controllers.client_controller import ClientController
+from src.controllers.contract_controller import ContractController
+from src.controllers.event_controller import EventController
+from src.models.event import Event
+
+# « SCAN table » sans « USING ... INDEX » : parcours complet de la table
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def capture_selects(db, action):
+    """Exécute `action` et retourne les SELECT émis avec leurs paramètres."""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        action()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return statements
+
+
+def full_scans(db, statements):
+    """Retourne les étapes de plan qui parcourent une table entière."""
+    scans = []
+    for statement, parameters in statements:
+        plan = db.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        ).fetchall()
+        scans += [row[3] for row in plan if FULL_SCAN.match(row[3])]
+    return scans
+
+
+@pytest.fixture
+def event_record(db, contract, support_user):
+    """Crée un événement assigné sur le contrat de test."""
+    contract.is_signed = True
+    record = Event(
+        contract_id=contract.id,
+        client_id=contract.client_id,
+        support_contact_id=support_user.id,
+        event_date_start=datetime(2030, 6, 1, 14, 0),
+        event_date_end=datetime(2030, 6, 1, 23, 0),
+        location="Paris",
+        attendees=100
+    )
+    db.add(record)
+    db.commit()
+    return record
+
+
+QUERIES = [
+    pytest.param(
+        "commercial_user",
+        lambda db, u: ClientController(db, u).get_my_clients(),
+        id="get_my_clients"
+    ),
+    pytest.param(
+        "commercial_user",
+        lambda db, u: ClientController(db, u).get_clients_page(mine=True),
+        id="get_clients_page_mine"
+    ),
+    pytest.param(
+        "commercial_user",
+        lambda db, u: ClientController(db, u).get_clients_page(1, mine=True),
+        id="get_clients_page_mine_after"
+    ),
+    pytest.param(
+        "commercial_user",
+        lambda db, u: ClientController(db, u).get_clients_page(1),
+        id="get_clients_page_after"
+    ),
+    pytest.param(
+        "commercial_user",
+        lambda db, u: ClientController(db, u).get_client_by_id(1),
+        id="get_client_by_id"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: ContractController(db, u).get_unsigned_contracts(),
+        id="get_unsigned_contracts"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: ContractController(db, u).get_unpaid_contracts(),
+        id="get_unpaid_contracts"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: ContractController(db, u).get_contracts_page(status="unsigned"),
+        id="get_contracts_page_unsigned"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: ContractController(db, u).get_contracts_page(1, status="unpaid"),
+        id="get_contracts_page_unpaid_after"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: ContractController(db, u).get_contract_by_id(1),
+        id="get_contract_by_id"
+    ),
+    pytest.param(
+        "support_user",
+        lambda db, u: EventController(db, u).get_my_events(),
+        id="get_my_events"
+    ),
+    pytest.param(
+        "support_user",
+        lambda db, u: EventController(db, u).get_events_page(1, scope="mine"),
+        id="get_events_page_mine_after"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: EventController(db, u).get_unassigned_events(),
+        id="get_unassigned_events"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: EventController(db, u).get_events_page(scope="unassigned"),
+        id="get_events_page_unassigned"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: EventController(db, u).get_event_by_id(1),
+        id="get_event_by_id"
+    ),
+    pytest.param(
+        "admin_user",
+        lambda db, u: AuthController(db).login("admin@test.com", "Admin123!"),
+        id="login"
+    ),
+]
+
+
+@pytest.mark.parametrize("user_fixture, query", QUERIES)
+def test_controller_query_uses_index(db, request, event_record, user_fixture, query):
+    """Aucune requête de contrôleur filtrée ne doit parcourir une table entière."""
+    user = request.getfixturevalue(user_fixture)
+
+    statements = capture_selects(db, lambda: query(db, user))
+
+    assert statements
+    assert full_scans(db, statements) == []
+
+
+def test_full_scan_is_detected(db, event_record):
+    """Vérifie que le détecteur signale bien un parcours complet."""
+    statements = [(str(text("SELECT * FROM events WHERE attendees > 10")), ())]
+
+    assert full_scans(db, statements) == ["SCAN events"]
@@ -0,0 +1,210 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from src.controllers.reminder_controller import ReminderController
+from src.models.client import Client
+from src.models.contract import Contract
+from src.models.event import Event
+from src.utils import reminder_sinks
+from src.utils.reminder_sinks import FileSink, SmtpSink, StdoutSink, make_sink
+
+LEAD = timedelta(hours=24)
+
+
+class ListSink:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    def send(self, reminder):
+        if self.fail:
+            raise OSError("serveur indisponible")
+        self.sent.append(reminder)
+
+
+class Clock:
+    """Horloge manuelle, partant de l'heure réelle (updated_at est écrit par datetime.now)."""
+
+    def __init__(self):
+        self.now = datetime.now().replace(microsecond=0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **delta):
+        self.now += timedelta(**delta)
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def make_event(db, commercial_user):
+    """Crée un événement (et son client et contrat) commençant `hours` après `start`."""
+    def make(start, hours, support=None, location="Salle"):
+        client = Client(full_name=f"Client {location}", email=f"{location}@{hours}.fr",
+                        commercial_contact_id=commercial_user.id)
+        contract = Contract(client=client, commercial_contact_id=commercial_user.id,
+                            total_amount=1000, remaining_amount=0, is_signed=True)
+        event = Event(contract=contract, client=client,
+                      support_contact_id=support.id if support else None,
+                      event_date_start=start + timedelta(hours=hours),
+                      event_date_end=start + timedelta(hours=hours + 2),
+                      location=location, attendees=10)
+        db.add(event)
+        db.commit()
+        return event
+    return make
+
+
+def test_reminders_sent_when_due(db, admin_user, support_user, clock, make_event):
+    """Test qu'un rappel part `lead` avant l'événement, une seule fois, et jamais sans support."""
+    first = make_event(clock.now, 25, support_user, "Salle A")
+    second = make_event(clock.now, 30, support_user, "Salle B")
+    make_event(clock.now, 26, None, "Salle C")
+    sink = ListSink()
+    controller = ReminderController(db, admin_user, sink, lead=LEAD, clock=clock)
+
+    assert controller.send_due() == 0
+    assert controller.next_due() == first.event_date_start - LEAD
+
+    clock.advance(hours=1)
+    assert controller.send_due() == 1
+    assert sink.sent[0].event_id == first.id
+    assert sink.sent[0].support_email == support_user.email
+    assert sink.sent[0].client_name == "Client Salle A"
+
+    clock.advance(hours=10)
+    controller.resync()
+    assert controller.send_due() == 1
+    assert [reminder.event_id for reminder in sink.sent] == [first.id, second.id]
+    assert controller.next_due() is None
+
+
+def test_reminders_loaded_in_batches(db, admin_user, support_user, clock, make_event):
+    """Test que seuls les premiers lots sont chargés, pas toute la table."""
+    events = [make_event(clock.now, 30 + i, support_user, f"Salle {i}") for i in range(10)]
+    sink = ListSink()
+    controller = ReminderController(db, admin_user, sink, lead=LEAD, batch_size=2, clock=clock)
+
+    controller.send_due()
+    assert controller.stats["loaded"] == 2
+
+    clock.advance(hours=8, minutes=30)
+    assert controller.send_due() == 3
+    assert controller.stats["loaded"] <= 6
+    assert [reminder.event_id for reminder in sink.sent] == [event.id for event in events[:3]]
+
+
+def test_reminders_resync(db, admin_user, support_user, clock, make_event):
+    """Test que les événements déplacés ou assignés après le lancement sont repris."""
+    moved = make_event(clock.now, 40, support_user, "Salle A")
+    assigned = make_event(clock.now, 30, None, "Salle B")
+    postponed = make_event(clock.now, 26, support_user, "Salle C")
+    sink = ListSink()
+    controller = ReminderController(db, admin_user, sink, lead=LEAD, batch_size=1, clock=clock)
+    controller.send_due()
+
+    # Avancé à demain matin : le rappel est déjà dû
+    moved.event_date_start = clock.now + timedelta(hours=12)
+    moved.event_date_end = clock.now + timedelta(hours=14)
+    assigned.support_contact_id = support_user.id
+    # Repoussé au-delà des lots chargés
+    postponed.event_date_start = clock.now + timedelta(hours=50)
+    postponed.event_date_end = clock.now + timedelta(hours=52)
+    db.commit()
+
+    clock.advance(minutes=1)
+    assert controller.resync() == 3
+    assert controller.send_due() == 1
+    assert sink.sent[0].event_date_start == moved.event_date_start
+
+    clock.advance(hours=6)
+    controller.send_due()
+    assert [reminder.event_id for reminder in sink.sent] == [moved.id, assigned.id]
+
+    clock.advance(hours=20)
+    controller.send_due()
+    assert [reminder.event_id for reminder in sink.sent] == [moved.id, assigned.id, postponed.id]
+
+
+def test_core_update_bumps_updated_at(db, support_user, clock, make_event):
+    """Test qu'un UPDATE Core (assignation automatique) est vu par la resynchronisation."""
+    event = make_event(clock.now, 30)
+    before = event.updated_at
+    db.execute(update(Event).where(Event.id == event.id).values(support_contact_id=support_user.id))
+    db.commit()
+    db.refresh(event)
+    assert event.updated_at > before
+
+
+def test_reminders_catch_up_and_failures(db, admin_user, support_user, clock, make_event):
+    """Test de la reprise des rappels échus et du nouvel essai après un échec d'envoi."""
+    event = make_event(clock.now, 23, support_user)
+    sink = ListSink(fail=True)
+    controller = ReminderController(db, admin_user, sink, lead=LEAD,
+                                    catch_up=timedelta(hours=2), clock=clock)
+
+    assert controller.send_due() == 0
+    assert controller.stats["failed"] == 1
+
+    sink.fail = False
+    clock.advance(minutes=5)
+    assert controller.send_due() == 1
+    assert sink.sent[0].event_id == event.id
+
+
+def test_reminders_as_support(db, support_user):
+    """Test que seule la GESTION peut lancer le worker."""
+    with pytest.raises(PermissionError):
+        ReminderController(db, support_user, ListSink())
+
+
+def test_sinks(db, admin_user, support_user, clock, make_event, tmp_path, capsys, monkeypatch):
+    """Test des destinations fichier, sortie standard et SMTP."""
+    make_event(clock.now, 10, support_user, "Salle A")
+    reminder = None
+
+    class Capture:
+        def send(self, sent):
+            nonlocal reminder
+            reminder = sent
+    ReminderController(db, admin_user, Capture(), lead=LEAD, catch_up=LEAD, clock=clock).send_due()
+
+    path = tmp_path / "rappels.jsonl"
+    FileSink(str(path)).send(reminder)
+    FileSink(str(path)).send(reminder)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2 and json.loads(lines[0])["location"] == "Salle A"
+
+    StdoutSink().send(reminder)
+    assert f"[{support_user.email}] Rappel : événement {reminder.event_id}" in capsys.readouterr().out
+
+    messages = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout):
+            assert (host, port) == ("localhost", 2525)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def send_message(self, message):
+            messages.append(message)
+
+    monkeypatch.setattr(reminder_sinks.smtplib, "SMTP", FakeSMTP)
+    make_sink("smtp://localhost:2525", sender="crm@test.fr").send(reminder)
+    assert messages[0]["To"] == support_user.email
+    assert messages[0]["From"] == "crm@test.fr"
+
+    assert isinstance(make_sink("stdout"), StdoutSink)
+    assert isinstance(make_sink("smtp://localhost"), SmtpSink)
+    with pytest.raises(ValueError):
+        make_sink("pigeon")
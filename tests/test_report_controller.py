@@ -0,0 +1,89 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.sql import column
+from src.controllers.report_controller import ReportController, month_bucket
+from src.models.contract import Contract
+from src.models.client import Client
+from tests.conftest import invoke
+
+
+@pytest.fixture
+def contracts(db, client, commercial_user):
+    """Trois contrats sur deux mois, dont un signé et un soldé."""
+    rows = [
+        (1000, 400, True, datetime(2026, 1, 10)),
+        (500, 500, False, datetime(2026, 1, 20)),
+        (300, 0, False, datetime(2026, 2, 5)),
+    ]
+    for total, remaining, signed, created_at in rows:
+        db.add(Contract(client_id=client.id, commercial_contact_id=commercial_user.id,
+                        total_amount=total, remaining_amount=remaining,
+                        is_signed=signed, created_at=created_at))
+    db.commit()
+
+
+def test_pipeline_by_commercial(db, admin_user, commercial_user, contracts, query_counter):
+    """Test le pipeline signé / non signé, en une requête."""
+    db.refresh(admin_user)
+    with query_counter:
+        rows = ReportController(db, admin_user).get_pipeline_by_commercial()
+
+    assert query_counter.count == 1
+    assert len(rows) == 1
+    row = rows[0]
+    assert row.commercial_id == commercial_user.id
+    assert (row.contracts, row.signed_contracts) == (3, 1)
+    assert row.signed_amount == Decimal("1000")
+    assert row.unsigned_amount == Decimal("800")
+
+
+def test_receivables_by_client(db, admin_user, client, contracts, commercial_user):
+    """Test le restant dû par client, trié par montant décroissant."""
+    other = Client(full_name="Autre", email="autre@test.com",
+                   commercial_contact_id=commercial_user.id)
+    db.add(other)
+    db.flush()
+    db.add(Contract(client_id=other.id, commercial_contact_id=commercial_user.id,
+                    total_amount=2000, remaining_amount=2000))
+    db.commit()
+
+    rows = ReportController(db, admin_user).get_receivables_by_client()
+
+    assert [(row.client_name, row.unpaid_contracts, row.remaining_amount) for row in rows] == [
+        ("Autre", 1, Decimal("2000")),
+        ("Client Test", 2, Decimal("900")),
+    ]
+
+
+def test_monthly_bookings(db, admin_user, contracts):
+    """Test le regroupement par mois de création."""
+    rows = ReportController(db, admin_user).get_monthly_bookings()
+
+    assert [(row.month, row.contracts, row.total_amount, row.signed_amount) for row in rows] == [
+        ("2026-01", 2, Decimal("1500"), Decimal("1000")),
+        ("2026-02", 1, Decimal("300"), Decimal("0")),
+    ]
+
+    rows = ReportController(db, admin_user).get_monthly_bookings(since=datetime(2026, 2, 1))
+    assert [row.month for row in rows] == ["2026-02"]
+
+
+def test_month_bucket_per_dialect():
+    """Test l'expression de regroupement mensuel selon le SGBD."""
+    assert "date_trunc" in str(month_bucket(column("created_at"), "postgresql"))
+    assert "strftime" in str(month_bucket(column("created_at"), "sqlite"))
+
+
+def test_reports_require_gestion(db, commercial_user):
+    """Test que les rapports sont réservés à la GESTION."""
+    with pytest.raises(PermissionError):
+        ReportController(db, commercial_user).get_pipeline_by_commercial()
+
+
+def test_reports_cli_jsonl(db, admin_user, contracts):
+    """Test la sortie JSON Lines des rapports."""
+    result = invoke(db, admin_user, ["reports", "receivables", "--format", "jsonl"])
+
+    assert result.exit_code == 0, result.output
+    assert '"remaining_amount": "900.00"' in result.output
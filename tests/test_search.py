@@ -0,0 +1,120 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+from src.controllers.search_controller import SearchController
+from src.models.client import Client
+from src.models.contract import Contract
+from src.models.event import Event
+
+
+@pytest.fixture
+def clients(db, commercial_user):
+    """Crée des clients aux noms proches pour tester le classement."""
+    rows = [
+        ("Hélène Dupont", "helene@acme.fr", "Acme"),
+        ("Jean Martin", "jean.dupont@globex.fr", "Globex"),
+        ("Paul Durand", "paul@dupont-dupont.fr", "Dupont et Dupont"),
+        ("Marie Curie", "marie@radium.fr", None),
+    ]
+    created = [
+        Client(full_name=name, email=email, company_name=company,
+               commercial_contact_id=commercial_user.id)
+        for name, email, company in rows
+    ]
+    db.add_all(created)
+    db.commit()
+    return created
+
+
+def test_search_clients(db, commercial_user, clients):
+    """Test la recherche sur le nom, l'email et la société."""
+    page = SearchController(db, commercial_user).search_clients("dupont")
+
+    names = [client.full_name for client in page.items]
+    assert set(names) == {"Hélène Dupont", "Jean Martin", "Paul Durand"}
+    # "Dupont" apparaît quatre fois pour Paul Durand : il est classé en premier
+    assert names[0] == "Paul Durand"
+
+
+def test_search_clients_prefix_and_accents(db, commercial_user, clients):
+    """Test la recherche par préfixe, sans tenir compte des accents."""
+    controller = SearchController(db, commercial_user)
+
+    assert [c.full_name for c in controller.search_clients("helen").items] == ["Hélène Dupont"]
+    # Tous les mots doivent être présents
+    assert [c.full_name for c in controller.search_clients("dup acme").items] == ["Hélène Dupont"]
+    assert controller.search_clients("inconnu").items == []
+
+
+def test_search_clients_pagination(db, commercial_user, clients):
+    """Test la pagination des résultats."""
+    controller = SearchController(db, commercial_user)
+
+    first = controller.search_clients("fr", page_size=3)
+    second = controller.search_clients("fr", offset=first.next_cursor, page_size=3)
+
+    assert first.has_next and len(first.items) == 3
+    assert not second.has_next and len(second.items) == 1
+    assert {c.id for c in first.items + second.items} == {c.id for c in clients}
+
+
+def test_search_index_follows_updates(db, commercial_user, clients):
+    """Test que l'index suit les modifications et suppressions."""
+    controller = SearchController(db, commercial_user)
+    clients[3].company_name = "Institut du Radium"
+    db.commit()
+    assert [c.full_name for c in controller.search_clients("institut").items] == ["Marie Curie"]
+
+    db.delete(clients[3])
+    db.commit()
+    assert controller.search_clients("institut").items == []
+    assert controller.search_clients("marie").items == []
+
+
+def test_search_empty_query(db, commercial_user, clients):
+    """Test qu'une recherche sans mot est refusée."""
+    with pytest.raises(ValueError, match="vide"):
+        SearchController(db, commercial_user).search_clients(' "*: ')
+
+
+def test_search_requires_authentication(db, clients):
+    """Test que la recherche demande un utilisateur connecté."""
+    with pytest.raises(PermissionError):
+        SearchController(db, None).search_clients("dupont")
+
+
+def test_search_events(db, support_user, commercial_user, client):
+    """Test la recherche sur le lieu et les notes des événements."""
+    for location, notes in (("Salle Pleyel", "Prévoir un traiteur"),
+                            ("Château de Versailles", "Accès traiteur par la cour")):
+        contract = Contract(client_id=client.id, commercial_contact_id=commercial_user.id,
+                            total_amount=1000, remaining_amount=0, is_signed=True)
+        db.add(Event(contract=contract, client_id=client.id,
+                     event_date_start=datetime(2030, 1, 1, 10),
+                     event_date_end=datetime(2030, 1, 1, 18),
+                     location=location, attendees=100, notes=notes))
+    db.commit()
+    controller = SearchController(db, support_user)
+
+    assert len(controller.search_events("traiteur").items) == 2
+    page = controller.search_events("chateau")
+    assert [event.location for event in page.items] == ["Château de Versailles"]
+    assert page.items[0].client.full_name == "Client Test"
+
+
+def test_rebuild_index(db, admin_user, clients):
+    """Test la reconstruction de l'index depuis la table des clients."""
+    db.execute(text("INSERT INTO clients_fts(clients_fts) VALUES ('delete-all')"))
+    db.commit()
+    controller = SearchController(db, admin_user)
+    assert controller.search_clients("curie").items == []
+
+    controller.rebuild_index()
+
+    assert [c.full_name for c in controller.search_clients("curie").items] == ["Marie Curie"]
+
+
+def test_rebuild_index_as_commercial(db, commercial_user):
+    """Test que seule la GESTION peut reconstruire l'index."""
+    with pytest.raises(PermissionError):
+        SearchController(db, commercial_user).rebuild_index()
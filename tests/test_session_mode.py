@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import create_engine, inspect
+from src.database.config import Base, create_run_session
+from src.controllers.client_controller import ClientController
+from src.models.user import User, Role
+from src.models.client import Client
+from tests.conftest import QueryCounter
+
+
+@pytest.fixture
+def run_session():
+    """Session longue liée à une base en mémoire."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    RunSession = create_run_session(engine)
+
+    yield RunSession()
+
+    RunSession.remove()
+
+
+@pytest.fixture
+def seeded(run_session):
+    """Un commercial et un de ses clients."""
+    user = User(full_name="Commercial", email="c@test.com",
+                password_hash="x", role=Role.COMMERCIAL)
+    run_session.add(user)
+    run_session.commit()
+    client = Client(full_name="Client", email="client@test.com",
+                    commercial_contact_id=user.id)
+    run_session.add(client)
+    run_session.commit()
+    return user, client
+
+
+def test_only_written_objects_expire_on_commit(run_session, seeded):
+    """Test qu'un commit n'expire que les objets écrits."""
+    user, client = seeded
+    run_session.refresh(user)
+    run_session.refresh(client)
+
+    client.full_name = "Nouveau"
+    run_session.commit()
+
+    assert inspect(client).expired
+    assert not inspect(user).expired
+
+
+def test_read_objects_need_no_query_after_action(run_session, seeded):
+    """Test que l'utilisateur courant reste chargé après une action d'écriture."""
+    user, client = seeded
+    run_session.refresh(user)
+    counter = QueryCounter(run_session.get_bind())
+
+    ClientController(run_session, user).create_client("Autre", "autre@test.com", "+33600000000")
+    with counter:
+        assert user.full_name == "Commercial"
+
+    assert counter.count == 0
+
+
+def test_hot_objects_served_from_identity_map(run_session, seeded):
+    """Test que les recherches par ID ne refont pas de requête."""
+    user, client = seeded
+    counter = QueryCounter(run_session.get_bind())
+    run_session.refresh(client)
+
+    with counter:
+        found = ClientController(run_session, user).get_client_by_id(client.id)
+
+    assert found is client
+    assert counter.count == 0
+
+
+def test_payment_refreshes_contract_in_run_session(run_session, seeded):
+    """Test qu'après un paiement la session longue voit le restant dû et la version à jour."""
+    from src.controllers.contract_controller import ContractController
+    from src.models.contract import Contract
+    user, client = seeded
+    contract = Contract(client_id=client.id, commercial_contact_id=user.id,
+                        total_amount=100, remaining_amount=100, is_signed=True)
+    run_session.add(contract)
+    run_session.commit()
+    controller = ContractController(run_session, user)
+
+    controller.record_payment(contract.id, 40)
+
+    assert contract.remaining_amount == 60
+    assert contract.version_id == 2
+    # Une modification ORM du même contrat ne doit pas se heurter au paiement
+    contract.total_amount = 150
+    run_session.commit()
+    assert contract.version_id == 3
+
+
+def test_auto_assignment_refreshes_events_in_run_session(run_session, seeded):
+    """Test qu'après une assignation automatique la session longue voit le support et la version."""
+    from datetime import datetime
+    from src.controllers.event_controller import EventController
+    from src.models.contract import Contract
+    from src.models.event import Event
+    user, client = seeded
+    admin = User(full_name="Gestion", email="g@test.com", password_hash="x", role=Role.GESTION)
+    support = User(full_name="Support", email="s@test.com", password_hash="x", role=Role.SUPPORT)
+    contract = Contract(client_id=client.id, commercial_contact_id=user.id,
+                        total_amount=100, remaining_amount=0, is_signed=True)
+    run_session.add_all([admin, support, contract])
+    run_session.commit()
+    run_session.add(Event(contract_id=contract.id, client_id=client.id,
+                          event_date_start=datetime(2030, 1, 1, 10),
+                          event_date_end=datetime(2030, 1, 1, 12),
+                          location="Salle", attendees=10))
+    run_session.commit()
+    controller = EventController(run_session, admin)
+    event = controller.get_all_events()[0]
+
+    controller.apply_auto_assignment(controller.plan_auto_assignment())
+
+    assert controller.get_all_events()[0].support_contact_id == support.id
+    assert event.version_id == 2
+    controller.update_event(event.id, location="Autre salle")
+    assert event.location == "Autre salle"
@@ -0,0 +1,13 @@
+import pytest
+from benchmarks.startup import COMMANDS, HEAVY_MODULES, BUDGET_SCALE, best_of
+
+
+@pytest.mark.parametrize("label", list(COMMANDS))
+def test_command_import_budget(label):
+    """Chaque commande reste sous son budget d'import sans modules lourds."""
+    statement, budget = COMMANDS[label]
+
+    total, modules = best_of(statement, runs=3)
+
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+    assert total <= budget * BUDGET_SCALE
@@ -0,0 +1,80 @@
+import pytest
+from decimal import Decimal
+from src.controllers.contract_controller import ContractController
+from src.controllers.summary_controller import SummaryController
+from src.models.contract import Contract
+from src.models.summary import ClientSummary, CommercialSummary
+from tests.conftest import invoke
+
+
+def totals(summary):
+    return (summary.contract_count, summary.signed_count,
+            summary.total_amount, summary.remaining_amount)
+
+
+def test_summaries_follow_create_and_sign(db, admin_user, client, commercial_user):
+    """Test que création et signature mettent à jour les totaux dans la transaction."""
+    controller = ContractController(db, admin_user)
+    first = controller.create_contract(client.id, 1000, 400)
+    controller.create_contract(client.id, 500)
+    controller.sign_contract(first.id)
+
+    summaries = SummaryController(db, admin_user)
+    expected = (2, 1, Decimal("1500"), Decimal("900"))
+    assert totals(summaries.get_client_summary(client.id)) == expected
+    assert totals(summaries.get_commercial_summary(commercial_user.id)) == expected
+    assert summaries.check() == []
+
+
+def test_summaries_follow_updates_and_deletes(db, admin_user, client, contract, support_user):
+    """Test le changement de montant, de commercial et la suppression."""
+    contract.remaining_amount = 0
+    db.commit()
+    assert db.get(ClientSummary, client.id).remaining_amount == 0
+
+    db.expire_all()
+    contract.commercial_contact_id = support_user.id
+    db.commit()
+    assert db.get(CommercialSummary, support_user.id).contract_count == 1
+
+    db.delete(db.get(Contract, contract.id))
+    db.commit()
+    assert totals(db.get(ClientSummary, client.id)) == (0, 0, 0, 0)
+    assert SummaryController(db, admin_user).check() == []
+
+
+def test_summaries_rollback(db, admin_user, client):
+    """Test qu'une transaction annulée n'altère pas les totaux."""
+    db.add(Contract(client_id=client.id, commercial_contact_id=admin_user.id,
+                    total_amount=100, remaining_amount=100))
+    db.flush()
+    db.rollback()
+
+    assert db.get(ClientSummary, client.id) is None
+
+
+def test_check_and_rebuild(db, admin_user, client, contract):
+    """Test la détection d'un écart puis la reconstruction."""
+    summaries = SummaryController(db, admin_user)
+    db.get(ClientSummary, client.id).remaining_amount = 1
+    db.commit()
+
+    mismatches = summaries.check()
+    assert [(table, key) for table, key, _, _ in mismatches] == [("client_summaries", client.id)]
+
+    assert summaries.rebuild() == {"client_summaries": 1, "commercial_summaries": 1}
+    assert summaries.check() == []
+
+
+def test_rebuild_requires_gestion(db, commercial_user):
+    """Test que la reconstruction est réservée à la GESTION."""
+    with pytest.raises(PermissionError):
+        SummaryController(db, commercial_user).rebuild()
+
+
+def test_summaries_check_cli(db, admin_user, contract):
+    """Test la commande de vérification."""
+    result = invoke(db, admin_user, ["summaries", "check"])
+
+    assert result.exit_code == 0, result.output
+    assert "Totaux cohérents" in result.output
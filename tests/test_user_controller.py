@@ -1,5 +1,7 @@
 import pytest
 from src.controllers.user_controller import UserController
+from src.models.user import User, Role
+from src.utils.auth import verify_password
 
 
 def test_get_all_users_as_admin(db, admin_user):
@@ -30,4 +32,44 @@ def test_create_user(db, admin_user):
     )
     
     assert new_user.id is not None
-    assert new_user.email == "nouveau@test.com"
\ No newline at end of file
+    assert new_user.email == "nouveau@test.com"
+
+def staff(count, prefix="staff"):
+    return [
+        {"full_name": f"Staff {i}", "email": f"{prefix}{i}@test.com",
+         "password": "Staff123!", "role": "support"}
+        for i in range(count)
+    ]
+
+
+def test_bulk_create_users(db, admin_user):
+    """Test la création groupée avec hachage parallèle."""
+    controller = UserController(db, admin_user)
+
+    result = controller.bulk_create_users(staff(4), workers=2, batch_size=3)
+
+    assert len(result["user_ids"]) == 4
+    created = db.get(User, result["user_ids"][2])
+    assert created.email == "staff2@test.com"
+    assert created.role == Role.SUPPORT
+    assert verify_password("Staff123!", created.password_hash)
+
+
+def test_bulk_create_users_rejects_existing_emails(db, admin_user, query_counter):
+    """Test que les emails déjà utilisés sont détectés en une requête, sans insertion."""
+    controller = UserController(db, admin_user)
+    rows = staff(2) + [{"full_name": "Admin", "email": "admin@test.com",
+                        "password": "Admin123!", "role": "gestion"}]
+
+    with query_counter:
+        with pytest.raises(ValueError, match="admin@test.com"):
+            controller.bulk_create_users(rows, workers=1)
+
+    assert query_counter.count == 1
+    assert db.query(User).count() == 1
+
+
+def test_bulk_create_users_as_commercial(db, commercial_user):
+    """Test qu'un commercial ne peut pas importer d'utilisateurs."""
+    with pytest.raises(PermissionError):
+        UserController(db, commercial_user).bulk_create_users(staff(1))